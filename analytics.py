@@ -0,0 +1,266 @@
+"""
+Rural Healthcare System - Appointment analytics
+Daily rollups per doctor and per district, bumped inside the booking and
+cancel transactions and rebuilt from the appointments table by reconcile()
+"""
+
+from datetime import date, timedelta
+
+from sqlalchemy import and_, case, func, insert, literal, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+MAX_ANALYTICS_DAYS = 366
+
+
+def _upsert(session, table, source, keys):
+    """
+    INSERT the (keys..., booked, cancelled) rows of select `source`, adding
+    the counts to rows whose keys already exist.
+    """
+    columns = [*keys, "booked", "cancelled"]
+    dialect = session.get_bind(clause=table.insert()).dialect.name
+    if dialect == "mysql":
+        stmt = mysql.insert(table).from_select(columns, source)
+        stmt = stmt.on_duplicate_key_update(
+            booked=table.c.booked + stmt.inserted.booked,
+            cancelled=table.c.cancelled + stmt.inserted.cancelled,
+        )
+    elif dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = dialect_insert(table).from_select(columns, source)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={
+                "booked": table.c.booked + stmt.excluded.booked,
+                "cancelled": table.c.cancelled + stmt.excluded.cancelled,
+            },
+        )
+    else:
+        _upsert_portable(session, table, source, keys)
+        return
+    session.execute(stmt)
+
+
+def _upsert_portable(session, table, source, keys):
+    """
+    _upsert for backends without an upsert statement: UPDATE each row,
+    INSERT it when missing, and UPDATE again if a concurrent transaction
+    inserted it first.
+    """
+    for *key_values, booked, cancelled in session.execute(source).all():
+        match = and_(*(table.c[k] == v for k, v in zip(keys, key_values)))
+        bump = (
+            update(table)
+            .where(match)
+            .values(
+                booked=table.c.booked + booked,
+                cancelled=table.c.cancelled + cancelled,
+            )
+        )
+        if session.execute(bump).rowcount:
+            continue
+        try:
+            # savepoint, so a lost race does not roll back the booking
+            with session.begin_nested():
+                session.execute(
+                    insert(table).values(
+                        **dict(zip(keys, key_values)),
+                        booked=booked,
+                        cancelled=cancelled,
+                    )
+                )
+        except IntegrityError:
+            session.execute(bump)
+
+
+def record(session, hospital_id, doctor_id, day, booked=0, cancelled=0):
+    """
+    Add to the counters of one appointment date, in the caller's
+    transaction. Booking is booked=1; cancelling is booked=-1, cancelled=1.
+    """
+    from models import AppointmentDailyStat, DistrictDailyStat, Hospital
+
+    _upsert(
+        session,
+        AppointmentDailyStat.__table__,
+        select(
+            literal(int(hospital_id)),
+            literal(int(doctor_id)),
+            literal(day),
+            literal(booked),
+            literal(cancelled),
+        ),
+        ["hospital_id", "doctor_id", "day"],
+    )
+    _upsert(
+        session,
+        DistrictDailyStat.__table__,
+        select(
+            Hospital.district, literal(day), literal(booked), literal(cancelled)
+        ).where(Hospital.id == int(hospital_id)),
+        ["district", "day"],
+    )
+
+
+def reconcile(session, first=None, last=None):
+    """
+    Recompute both rollups for appointment dates in [first, last] (None
+    means unbounded) from the appointments table, in the caller's
+    transaction. Returns the number of doctor-day rows written.
+    """
+    from models import (
+        Appointment,
+        AppointmentDailyStat,
+        DistrictDailyStat,
+        Hospital,
+    )
+
+    def in_range(column):
+        conditions = []
+        if first is not None:
+            conditions.append(column >= first)
+        if last is not None:
+            conditions.append(column <= last)
+        return conditions
+
+    cancelled = case((Appointment.status == "cancelled", 1), else_=0)
+    counts = (func.count() - func.sum(cancelled), func.sum(cancelled))
+
+    for model in (AppointmentDailyStat, DistrictDailyStat):
+        session.execute(model.__table__.delete().where(*in_range(model.day)))
+
+    doctor_days = session.execute(
+        insert(AppointmentDailyStat).from_select(
+            ["hospital_id", "doctor_id", "day", "booked", "cancelled"],
+            select(
+                Appointment.hospital_id,
+                Appointment.doctor_id,
+                Appointment.appointment_date,
+                *counts,
+            )
+            .where(*in_range(Appointment.appointment_date))
+            .group_by(
+                Appointment.hospital_id,
+                Appointment.doctor_id,
+                Appointment.appointment_date,
+            ),
+        )
+    ).rowcount
+    session.execute(
+        insert(DistrictDailyStat).from_select(
+            ["district", "day", "booked", "cancelled"],
+            select(Hospital.district, Appointment.appointment_date, *counts)
+            .join(Hospital, Hospital.id == Appointment.hospital_id)
+            .where(*in_range(Appointment.appointment_date))
+            .group_by(Hospital.district, Appointment.appointment_date),
+        )
+    )
+    return doctor_days
+
+
+def parse_range(args, today, max_days=MAX_ANALYTICS_DAYS):
+    """
+    (first, last) dates from `from` / `to` request args, defaulting to the
+    30 days ending today. Raises ValueError.
+    """
+    last = date.fromisoformat(args["to"]) if args.get("to") else today
+    first = (
+        date.fromisoformat(args["from"])
+        if args.get("from")
+        else last - timedelta(days=29)
+    )
+    if last < first:
+        raise ValueError("to must not be before from")
+    if (last - first).days >= max_days:
+        raise ValueError(f"At most {max_days} days")
+    return first, last
+
+
+def rate(booked, cancelled):
+    """Share of a period's appointments that were cancelled."""
+    total = booked + cancelled
+    return round(cancelled / total, 4) if total else None
+
+
+def hospital_dashboard(session, hospital_id, first, last):
+    """Per-day totals and per-doctor load of one hospital."""
+    from models import AppointmentDailyStat as Stat, Doctor
+
+    in_range = (Stat.hospital_id == hospital_id, Stat.day.between(first, last))
+    days = session.execute(
+        select(Stat.day, func.sum(Stat.booked), func.sum(Stat.cancelled))
+        .where(*in_range)
+        .group_by(Stat.day)
+        .order_by(Stat.day)
+    ).all()
+    doctors = session.execute(
+        select(
+            Stat.doctor_id,
+            Doctor.name,
+            Doctor.specialization,
+            func.sum(Stat.booked),
+            func.sum(Stat.cancelled),
+        )
+        .join(Doctor, Doctor.id == Stat.doctor_id, isouter=True)
+        .where(*in_range)
+        .group_by(Stat.doctor_id, Doctor.name, Doctor.specialization)
+        .order_by(func.sum(Stat.booked).desc(), Stat.doctor_id)
+    ).all()
+
+    booked = sum(int(b) for _, b, _ in days)
+    cancelled = sum(int(c) for _, _, c in days)
+    return {
+        "hospital_id": hospital_id,
+        "from": first.isoformat(),
+        "to": last.isoformat(),
+        "booked": booked,
+        "cancelled": cancelled,
+        "cancellation_rate": rate(booked, cancelled),
+        "days": [
+            {
+                "date": day.isoformat(),
+                "booked": int(b),
+                "cancelled": int(c),
+                "cancellation_rate": rate(int(b), int(c)),
+            }
+            for day, b, c in days
+        ],
+        "doctors": [
+            {
+                "doctor_id": doctor_id,
+                "name": name,
+                "specialization": specialization,
+                "booked": int(b),
+                "cancelled": int(c),
+                "cancellation_rate": rate(int(b), int(c)),
+                "booked_per_day": round(int(b) / ((last - first).days + 1), 2),
+            }
+            for doctor_id, name, specialization, b, c in doctors
+        ],
+    }
+
+
+def district_dashboard(session, first, last):
+    """Demand and cancellations per district over the period."""
+    from models import DistrictDailyStat as Stat
+
+    rows = session.execute(
+        select(Stat.district, func.sum(Stat.booked), func.sum(Stat.cancelled))
+        .where(Stat.day.between(first, last))
+        .group_by(Stat.district)
+        .order_by(func.sum(Stat.booked).desc(), Stat.district)
+    ).all()
+    return {
+        "from": first.isoformat(),
+        "to": last.isoformat(),
+        "districts": [
+            {
+                "district": district,
+                "booked": int(b),
+                "cancelled": int(c),
+                "cancellation_rate": rate(int(b), int(c)),
+            }
+            for district, b, c in rows
+        ],
+    }
@@ -0,0 +1,89 @@
+"""
+Rural Healthcare System - Authorization
+Role-checking route decorator and a cache of account status consulted on
+every authenticated request
+"""
+
+from collections import OrderedDict
+import functools
+import threading
+import time
+
+from flask import jsonify
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+
+def roles(*allowed, error=None):
+    """
+    jwt_required() plus a 403 unless the token's role is one of `allowed`.
+    The view reads the identity with get_jwt_identity() as before.
+    """
+    error = error or f"Only {' and '.join(r + 's' for r in allowed)} allowed"
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            identity = get_jwt_identity() or {}
+            if identity.get("role") not in allowed:
+                return jsonify({"error": error}), 403
+            return view(*args, **kwargs)
+
+        return jwt_required()(wrapper)
+
+    return decorator
+
+
+class AccountStatus:
+    """
+    Whether the account behind a token may still act, keyed by (role, id).
+    Tokens are valid for weeks, so a deactivated patient or a hospital that
+    lost its approval is refused here instead of by a lookup in every view.
+
+    Answers, including refusals, are kept `ttl` seconds and for at most
+    `max_entries` accounts (least recently used go). invalidate() drops
+    the accounts this process changed right away; changes made by other
+    workers take effect once the entry expires.
+    """
+
+    def __init__(self, ttl=5, max_entries=100_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def active(self, role, account_id, load):
+        """
+        Cached answer for the account, calling load(role, account_id) ->
+        bool on a miss or once the entry expired.
+        """
+        key = (role, account_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        active = bool(load(role, account_id))
+        with self._lock:
+            self._entries[key] = (active, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return active
+
+    def invalidate(self, keys=None):
+        """Forget the given (role, id) keys, or every account."""
+        with self._lock:
+            if keys is None:
+                self._entries.clear()
+                return
+            for key in keys:
+                self._entries.pop(key, None)
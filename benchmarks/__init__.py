@@ -0,0 +1,4 @@
+"""
+Rural Healthcare System - Benchmarks
+Run individual scripts with `python -m benchmarks.<name>` from the repo root
+"""
@@ -0,0 +1,103 @@
+"""
+Dashboards: GROUP BY over appointments vs the incrementally kept rollups
+
+    python -m benchmarks.bench_analytics [--sizes 10000,100000,500000]
+
+For each history size, times a 30-day hospital dashboard and a 30-day
+district demand report computed straight from the appointments table, and
+the same reports read from the rollups (after a full reconcile). Also
+reports the full reconcile itself.
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from benchmarks.common import (
+    make_app,
+    seed_history,
+    seed_hospitals,
+    seed_patient,
+    timeit,
+)
+
+
+def from_appointments(hospital_id, first, last):
+    """Both reports aggregated from the raw appointments table."""
+    from sqlalchemy import case, func
+
+    from app import db
+    from models import Appointment, Hospital
+
+    cancelled = case((Appointment.status == "cancelled", 1), else_=0)
+    in_range = Appointment.appointment_date.between(first, last)
+    hospital = (
+        db.session.query(
+            Appointment.appointment_date,
+            Appointment.doctor_id,
+            func.count(),
+            func.sum(cancelled),
+        )
+        .filter(Appointment.hospital_id == hospital_id, in_range)
+        .group_by(Appointment.appointment_date, Appointment.doctor_id)
+        .all()
+    )
+    districts = (
+        db.session.query(Hospital.district, func.count(), func.sum(cancelled))
+        .join(Hospital, Hospital.id == Appointment.hospital_id)
+        .filter(in_range)
+        .group_by(Hospital.district)
+        .all()
+    )
+    return hospital, districts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,500000")
+    parser.add_argument("--hospitals", type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        f"{'appointments':>12} {'hospital: scan':>15} {'rollup':>8}"
+        f" {'districts: scan':>16} {'rollup':>8} {'reconcile':>10}   (ms)"
+    )
+    for size in [int(s) for s in args.sizes.split(",")]:
+        app = make_app()
+        with app.app_context():
+            import analytics
+            from app import db
+
+            seed_hospitals(args.hospitals, doctors_per_hospital=5)
+            patient_id, _ = seed_patient()
+            seed_history(patient_id, size)
+            reconcile_ms = timeit(lambda: analytics.reconcile(db.session), 1)
+            db.session.commit()
+
+            # seed_history spreads appointments forward from today
+            first = date.today() + timedelta(days=size // (args.hospitals * 10))
+            last = first + timedelta(days=29)
+            hospital_id = 1
+
+            scan_h = timeit(lambda: from_appointments(hospital_id, first, last)[0])
+            scan_d = timeit(lambda: from_appointments(hospital_id, first, last)[1])
+            roll_h = timeit(
+                lambda: analytics.hospital_dashboard(
+                    db.session, hospital_id, first, last
+                )
+            )
+            roll_d = timeit(
+                lambda: analytics.district_dashboard(db.session, first, last)
+            )
+            report = analytics.district_dashboard(db.session, first, last)
+            scanned = from_appointments(hospital_id, first, last)[1]
+            assert sum(d["booked"] + d["cancelled"] for d in report["districts"]) == (
+                sum(count for _, count, _ in scanned)
+            ), "rollup and scan disagree"
+        print(
+            f"{size:>12,} {scan_h:>15.1f} {roll_h:>8.1f}"
+            f" {scan_d:>16.1f} {roll_d:>8.1f} {reconcile_ms:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Account status check on authenticated requests: looked up every time vs cached
+
+    python -m benchmarks.bench_auth [--patients 200] [--requests 2000] [--latency-ms 2]
+
+Many patients poll /api/prescriptions/my round-robin. 'lookup every request'
+(AUTH_CACHE_TTL=0) is what honoring User.is_active would cost without the
+cache: one extra SELECT per request. Each statement sleeps --latency-ms to
+stand in for the round trip to MySQL.
+"""
+
+import argparse
+import os
+import time
+
+from sqlalchemy import event
+
+from benchmarks.common import count_statements, make_app
+
+
+def run(ttl, patients, requests, latency):
+    os.environ["AUTH_CACHE_TTL"] = str(ttl)
+    app = make_app()
+    from flask_jwt_extended import create_access_token
+
+    from app import db
+    from models import User
+
+    with app.app_context():
+        db.session.execute(
+            db.insert(User),
+            [
+                {"name": f"P{i}", "phone": f"9{i:09d}", "password_hash": "x"}
+                for i in range(patients)
+            ],
+        )
+        db.session.commit()
+        ids = db.session.execute(db.select(User.id)).scalars().all()
+        headers = [
+            {
+                "Authorization": "Bearer "
+                + create_access_token(identity={"id": i, "role": "patient"})
+            }
+            for i in ids
+        ]
+        engine = db.engine
+
+    def round_trip(conn, cursor, statement, parameters, context, executemany):
+        time.sleep(latency)
+
+    client = app.test_client()
+    event.listen(engine, "before_cursor_execute", round_trip)
+    try:
+        with count_statements(engine) as statements:
+            start = time.perf_counter()
+            for n in range(requests):
+                resp = client.get(
+                    "/api/prescriptions/my", headers=headers[n % len(headers)]
+                )
+                assert resp.status_code == 200, resp.get_json()
+            elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", round_trip)
+    return elapsed, len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(
+        f"{args.requests} requests by {args.patients} patients, "
+        f"{args.latency_ms} ms per statement"
+    )
+    print(f"{'mode':<22} {'req/s':>8} {'ms/req':>7} {'stmts/req':>10}")
+    for name, ttl in (("lookup every request", 0), ("cached (5 s)", 5)):
+        elapsed, statements = run(
+            ttl, args.patients, args.requests, args.latency_ms / 1000
+        )
+        print(
+            f"{name:<22} {args.requests / elapsed:>8.1f} "
+            f"{1000 * elapsed / args.requests:>7.2f} "
+            f"{statements / args.requests:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Batch nearby search: NumPy CoordinateIndex vs looping calculate_distance
+
+    python -m benchmarks.bench_batch [--hospitals 10000] [--points 100,1000,5000]
+"""
+
+import argparse
+import random
+
+from benchmarks.common import TN_LAT, TN_LON, make_app, seed_hospitals, timeit
+from geo import CoordinateIndex, calculate_distance
+
+
+def scalar_nearest(points, rows, radius, k):
+    result = []
+    for lat, lon in points:
+        matches = []
+        for hid, hlat, hlon in rows:
+            d = calculate_distance(lat, lon, hlat, hlon)
+            if d <= radius:
+                matches.append((d, hid))
+        matches.sort()
+        result.append([(hid, d) for d, hid in matches[:k]])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hospitals", type=int, default=10000)
+    parser.add_argument("--points", default="100,1000,5000")
+    parser.add_argument("--radius", type=float, default=50)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    rnd = random.Random(3)
+    rows = [
+        (i + 1, rnd.uniform(*TN_LAT), rnd.uniform(*TN_LON))
+        for i in range(args.hospitals)
+    ]
+    index = CoordinateIndex(rows)
+
+    app = make_app()
+    with app.app_context():
+        seed_hospitals(args.hospitals, approved_ratio=1.0)
+    client = app.test_client()
+
+    print(f"{args.hospitals} hospitals, radius {args.radius} km, top {args.limit}")
+    print(
+        f"{'points':>8} {'scalar loop ms':>15} {'numpy ms':>10}"
+        f" {'speedup':>8} {'endpoint ms':>12}"
+    )
+    for n in [int(p) for p in args.points.split(",")]:
+        points = [(rnd.uniform(*TN_LAT), rnd.uniform(*TN_LON)) for _ in range(n)]
+
+        # the scalar loop is slow; time and verify it on a sample and scale up
+        sample = points[: min(n, 200)]
+        expected = scalar_nearest(sample, rows, args.radius, args.limit)
+        got = index.nearest(sample, args.radius, args.limit)
+        assert got == expected, "batch results differ from scalar loop"
+
+        scalar_ms = timeit(
+            lambda: scalar_nearest(sample, rows, args.radius, args.limit), repeat=1
+        ) * (n / len(sample))
+        numpy_ms = timeit(lambda: index.nearest(points, args.radius, args.limit))
+        body = {"points": points, "radius": args.radius, "limit": args.limit}
+        endpoint_ms = timeit(
+            lambda: client.post("/api/hospitals/nearby/batch", json=body), repeat=3
+        )
+        print(
+            f"{n:>8} {scalar_ms:>15.1f} {numpy_ms:>10.1f}"
+            f" {scalar_ms / numpy_ms:>7.1f}x {endpoint_ms:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
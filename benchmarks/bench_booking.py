@@ -0,0 +1,87 @@
+"""
+Booking under surge load: many threads booking a small pool of slots at once
+
+    python -m benchmarks.bench_booking [--threads 16] [--requests 2000] [--slots 200]
+
+Reports throughput and the status mix; fails if any request ends in a 5xx
+or if the number of 201s differs from the appointments actually stored.
+"""
+
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import random
+import sys
+import threading
+import time
+
+from benchmarks.common import make_app, seed_hospitals, seed_patient
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--slots", type=int, default=200)
+    parser.add_argument("--patients", type=int, default=50)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        from app import db
+        from models import Appointment, Doctor
+
+        seed_hospitals(2, doctors_per_hospital=5, approved_ratio=1.0)
+        doctors = db.session.execute(db.select(Doctor.id, Doctor.hospital_id)).all()
+        headers = [seed_patient(f"7{i:09d}")[1] for i in range(args.patients)]
+
+    day = date.today() + timedelta(days=1)
+    times = [f"{9 + m // 60:02d}:{m % 60:02d}" for m in range(0, 8 * 60, 10)]
+    slots = [(d, t) for d in doctors for t in times][: args.slots]
+
+    rnd = random.Random(11)
+    jobs = [(rnd.choice(headers), rnd.choice(slots)) for _ in range(args.requests)]
+    local = threading.local()
+
+    def book(job):
+        hdrs, ((doctor_id, hospital_id), time_str) = job
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        resp = client.post(
+            "/api/appointments/book",
+            headers=hdrs,
+            json={
+                "doctor_id": doctor_id,
+                "hospital_id": hospital_id,
+                "appointment_date": day.isoformat(),
+                "appointment_time": time_str,
+                "reason": "Vaccination",
+            },
+        )
+        return resp.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.threads) as pool:
+        statuses = Counter(pool.map(book, jobs))
+    elapsed = time.perf_counter() - start
+
+    with app.app_context():
+        stored = Appointment.query.count()
+
+    print(
+        f"{args.requests} requests, {args.threads} threads,"
+        f" {len(slots)} contended slots"
+    )
+    print(f"throughput: {args.requests / elapsed:.0f} req/s ({elapsed:.2f} s)")
+    for status, count in sorted(statuses.items()):
+        print(f"  HTTP {status}: {count} ({100 * count / args.requests:.1f}%)")
+    print(f"appointments stored: {stored}")
+
+    ok = statuses[201] == stored and not any(s >= 500 for s in statuses)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
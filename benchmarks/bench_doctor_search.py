@@ -0,0 +1,120 @@
+"""
+Doctor search: per-request SQL + Python filter vs the in-memory DoctorIndex
+
+    python -m benchmarks.bench_doctor_search [--hospitals 20000 --doctors-per-hospital 5]
+
+'query' is the pre-index implementation of /api/doctors/nearby (approved
+hospitals in the bounding box, their doctors, exact specialization match);
+'index' is DoctorIndex.search() on a warm index. Also reports the cost of a
+full index load.
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.common import TN_LAT, TN_LON, make_app, seed_hospitals, timeit
+
+
+def query_search(lat, lon, radius, specialization):
+    """The pre-index /api/doctors/nearby lookup, ids and distances only."""
+    from app import db
+    from geo import bounding_box, calculate_distance
+    from models import Doctor, Hospital
+
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius)
+    hospitals = Hospital.query.filter(
+        Hospital.registration_status == "approved",
+        Hospital.latitude.between(min_lat, max_lat),
+        Hospital.longitude.between(min_lon, max_lon),
+    ).all()
+    distances = {}
+    for h in hospitals:
+        d = calculate_distance(lat, lon, h.latitude, h.longitude)
+        if d <= radius:
+            distances[h.id] = d
+    query = Doctor.query.filter(Doctor.hospital_id.in_(list(distances)))
+    if specialization:
+        query = query.filter(
+            db.func.lower(Doctor.specialization) == specialization.lower()
+        )
+    found = [(doc.id, distances[doc.hospital_id]) for doc in query]
+    found.sort(key=lambda x: x[1])
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hospitals", type=int, default=20_000)
+    parser.add_argument("--doctors-per-hospital", type=int, default=5)
+    parser.add_argument("--radius", type=float, default=50)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        seed_hospitals(args.hospitals, doctors_per_hospital=args.doctors_per_hospital)
+        from app import db
+        from doctor_search import DOCTOR_FIELDS, DoctorIndex
+        from models import Doctor, Hospital
+
+        start = time.perf_counter()
+        index = DoctorIndex()
+        index.load(
+            db.session.query(
+                Hospital.id, Hospital.name, Hospital.latitude, Hospital.longitude
+            )
+            .filter(Hospital.registration_status == "approved")
+            .all(),
+            (
+                row._asdict()
+                for row in db.session.query(
+                    *(getattr(Doctor, f) for f in DOCTOR_FIELDS)
+                )
+            ),
+        )
+        load_ms = (time.perf_counter() - start) * 1000
+
+        rnd = random.Random(7)
+        points = [
+            (rnd.uniform(*TN_LAT), rnd.uniform(*TN_LON)) for _ in range(args.queries)
+        ]
+        print(
+            f"{len(index):,} searchable doctors, radius {args.radius:g} km,"
+            f" full load {load_ms:,.0f} ms"
+        )
+        print(f"{'specialization':<16} {'query ms':>10} {'index ms':>10} {'rows':>7}")
+        for spec in (None, "Pediatrics"):
+            rows = sum(
+                len(index.search(lat, lon, args.radius, spec)) for lat, lon in points
+            )
+            for lat, lon in points:
+                assert sorted(
+                    (doc["id"], d)
+                    for doc, d in index.search(lat, lon, args.radius, spec)
+                ) == sorted(query_search(lat, lon, args.radius, spec))
+            old = timeit(
+                lambda: [
+                    query_search(lat, lon, args.radius, spec) for lat, lon in points
+                ]
+            )
+            new = timeit(
+                lambda: [
+                    index.search(lat, lon, args.radius, spec) for lat, lon in points
+                ]
+            )
+            print(
+                f"{spec or '(any)':<16} {old / len(points):>10.2f}"
+                f" {new / len(points):>10.3f} {rows // len(points):>7}"
+            )
+        for spec in ("cardio", "heart"):
+            new = timeit(
+                lambda: [
+                    index.search(lat, lon, args.radius, spec) for lat, lon in points
+                ]
+            )
+            print(f"{spec:<16} {'-':>10} {new / len(points):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Bulk import throughput: medicine stock file through the import pipeline
+
+    python -m benchmarks.bench_import [--rows 1000000] [--format csv]
+
+Writes a synthetic stock file for `--hospitals` hospitals, then imports it
+at a few chunk sizes through the BulkImporter that `flask import-data`
+uses. The 'per-row' line is one ORM add + commit per row (how
+/api/auth/register writes), measured on a small sample and extrapolated.
+"""
+
+import argparse
+import csv
+from datetime import date, timedelta
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import make_app, seed_hospitals
+from benchmarks.datagen import MEDICINES
+
+FIELDS = [
+    "hospital_id",
+    "name",
+    "generic_name",
+    "quantity",
+    "unit",
+    "expiry_date",
+    "cost",
+]
+
+
+def write_file(path, rows, hospitals, fmt, seed=7):
+    rnd = random.Random(seed)
+    today = date.today()
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, FIELDS) if fmt == "csv" else None
+        if writer:
+            writer.writeheader()
+        for i in range(rows):
+            name, generic, unit = MEDICINES[i % len(MEDICINES)]
+            row = {
+                "hospital_id": 1 + i % hospitals,
+                "name": f"{name} #{i}",
+                "generic_name": generic,
+                "quantity": rnd.choice([0, 5, 20, 100, 500]),
+                "unit": unit,
+                "expiry_date": (
+                    today + timedelta(days=rnd.randint(-30, 700))
+                ).isoformat(),
+                "cost": rnd.choice([2, 5, 10]),
+            }
+            if i % 10_000 == 9_999:
+                row["quantity"] = "n/a"  # a sprinkling of bad rows
+            if writer:
+                writer.writerow(row)
+            else:
+                f.write(json.dumps(row) + "\n")
+
+
+def run(path, fmt, chunk, hospitals):
+    app = make_app()
+    from app import db
+    from importer import BulkImporter, read_records, text_stream
+
+    with app.app_context():
+        seed_hospitals(hospitals, approved_ratio=1)
+        # medicines need no password hashing
+        importer = BulkImporter(db, hasher=None, chunk_size=chunk)
+        with open(path, "rb") as f:
+            return importer.run("medicines", read_records(text_stream(f), fmt))
+
+
+def per_row(sample, hospitals):
+    app = make_app()
+    from app import db
+    from inventory import parse_stock_item
+    from models import Medicine
+
+    today = date.today()
+    with app.app_context():
+        seed_hospitals(hospitals, approved_ratio=1)
+        start = time.perf_counter()
+        for i in range(sample):
+            row = parse_stock_item(
+                {"name": f"Med {i}", "quantity": 10, "expiry_date": today.isoformat()}
+            )
+            db.session.add(Medicine(hospital_id=1 + i % hospitals, **row))
+            db.session.commit()
+        return sample / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--hospitals", type=int, default=2_000)
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--chunks", default="1000,5000")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"stock.{args.format}")
+        start = time.perf_counter()
+        write_file(path, args.rows, args.hospitals, args.format)
+        size = os.path.getsize(path) / 1e6
+        print(
+            f"wrote {args.rows:,} rows ({size:.0f} MB) in"
+            f" {time.perf_counter() - start:.1f}s"
+        )
+
+        rate = per_row(2_000, args.hospitals)
+        print(
+            f"{'per-row commits':<20} {rate:>10,.0f} rows/s"
+            f"  (~{args.rows / rate:,.0f}s for the file)"
+        )
+        for chunk in map(int, args.chunks.split(",")):
+            report = run(path, args.format, chunk, args.hospitals)
+            print(
+                f"{f'chunk {chunk}':<20}"
+                f" {report['rows'] / report['seconds']:>10,.0f} rows/s"
+                f"  {report['seconds']:>7.1f}s  inserted {report['inserted']:,}"
+                f"  failed {report['failed']:,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
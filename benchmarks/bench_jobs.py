@@ -0,0 +1,90 @@
+"""
+Throughput of the reminder and no-show jobs behind `flask run-jobs --once`
+
+    python -m benchmarks.bench_jobs [--appointments 20000] [--workers 4]
+
+Seeds confirmed appointments spread over yesterday, today and tomorrow,
+then plans and drains the jobs once, reporting appointments handled per
+second and SQL statements per batch of JOB_BATCH_SIZE appointments.
+"""
+
+import argparse
+from datetime import date, timedelta
+import time
+
+from benchmarks.common import count_statements, make_app, seed_hospitals, seed_patient
+
+
+def seed_appointments(n):
+    from app import db
+    from models import Appointment, Doctor
+
+    doctors = db.session.execute(db.select(Doctor.id, Doctor.hospital_id)).all()
+    patient_id, _ = seed_patient()
+    days = [date.today() + timedelta(days=d) for d in (-1, 0, 1)]
+    rows = []
+    for i in range(n):
+        doctor = doctors[i % len(doctors)]
+        slot = i // len(doctors)
+        rows.append(
+            {
+                "patient_id": patient_id,
+                "doctor_id": doctor.id,
+                "hospital_id": doctor.hospital_id,
+                "appointment_date": days[slot % 3],
+                "appointment_time": f"{slot // 3:05d}",
+                "reason": "Checkup",
+                "status": "confirmed",
+            }
+        )
+    db.session.execute(db.insert(Appointment), rows)
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--appointments", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    app = make_app()
+    app.config["NOTIFY_SINK"] = "file:/dev/null"
+    with app.app_context():
+        from app import db
+        from models import Appointment
+
+        seed_hospitals(50, doctors_per_hospital=4, approved_ratio=1)
+        seed_appointments(args.appointments)
+        engine = db.engine
+
+    runner = app.test_cli_runner()
+    with count_statements(engine) as statements:
+        start = time.perf_counter()
+        result = runner.invoke(
+            args=["run-jobs", "--once", "--workers", str(args.workers)]
+        )
+        seconds = time.perf_counter() - start
+    assert result.exit_code == 0, result.output
+    print(result.output.strip())
+
+    with app.app_context():
+        counts = dict(
+            db.session.execute(
+                db.select(Appointment.status, db.func.count()).group_by(
+                    Appointment.status
+                )
+            ).all()
+        )
+        reminded = db.session.scalar(
+            db.select(db.func.count()).where(Appointment.reminded_at.is_not(None))
+        )
+    batches = -(-args.appointments // app.config["JOB_BATCH_SIZE"])
+    print(f"appointments {args.appointments:,}: {counts}, reminded {reminded:,}")
+    print(
+        f"{seconds:.2f}s ({args.appointments / seconds:,.0f} appointments/s), "
+        f"{len(statements) / batches:.1f} statements per batch"
+    )
+
+
+if __name__ == "__main__":
+    main()
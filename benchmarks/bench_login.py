@@ -0,0 +1,82 @@
+"""
+Login storm: inline password hashing vs the bounded hashing process pool
+
+    python -m benchmarks.bench_login [--logins 64] [--threads 8]
+
+'inline' (PASSWORD_HASH_WORKERS=0) is how login hashed before the pool was
+introduced. The 'pool + small queue' run shows backpressure: excess logins
+get a fast 503 with Retry-After instead of queueing behind the hasher.
+"""
+
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+
+from werkzeug.security import generate_password_hash
+
+from benchmarks.common import make_app
+
+
+def storm(workers, queue, logins, threads, pwhash):
+    os.environ["PASSWORD_HASH_WORKERS"] = str(workers)
+    os.environ["PASSWORD_HASH_QUEUE"] = str(queue)
+    app = make_app()
+    with app.app_context():
+        from app import db
+        from models import User
+
+        db.session.execute(
+            db.insert(User),
+            [
+                {"name": f"P{i}", "phone": f"9{i:09d}", "password_hash": pwhash}
+                for i in range(logins)
+            ],
+        )
+        db.session.commit()
+
+    local = threading.local()
+
+    def login(i):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        resp = client.post(
+            "/api/auth/login", json={"phone": f"9{i:09d}", "password": "demo123"}
+        )
+        return resp.status_code
+
+    # warm up the pool so process start-up is not billed to the first logins
+    login(0)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        statuses = Counter(pool.map(login, range(logins)))
+    return time.perf_counter() - start, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    pwhash = generate_password_hash("demo123", "pbkdf2:sha256:600000")
+    runs = [
+        ("inline", 0, args.threads),
+        ("pool", cores, 4 * cores + args.threads),
+        ("pool + small queue", cores, max(1, cores // 2)),
+    ]
+    print(f"{args.logins} logins, {args.threads} client threads, {cores} core(s)")
+    print(f"{'mode':<20} {'logins/s':>9} {'per core':>9}  statuses")
+    for name, workers, queue in runs:
+        elapsed, statuses = storm(workers, queue, args.logins, args.threads, pwhash)
+        rate = statuses[200] / elapsed
+        mix = ", ".join(f"{k}: {v}" for k, v in sorted(statuses.items()))
+        print(f"{name:<20} {rate:>9.1f} {rate / cores:>9.1f}  {mix}")
+
+
+if __name__ == "__main__":
+    main()
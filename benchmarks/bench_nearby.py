@@ -0,0 +1,78 @@
+"""
+Nearby-hospital search: full-table Haversine scan vs bounding-box prefilter
+
+    python -m benchmarks.bench_nearby [--sizes 1000,10000,100000]
+"""
+
+import argparse
+import random
+
+from benchmarks.common import TN_LAT, TN_LON, make_app, seed_hospitals, timeit
+
+
+def full_scan(lat, lon, radius):
+    """The pre-index implementation of /api/hospitals/nearby (ids only)."""
+    from geo import calculate_distance
+    from models import Hospital
+
+    # idx_hosp_status hands rows back in primary-key order; pin that here so
+    # SQLite's choice of the new location index does not reorder ties
+    hospitals = (
+        Hospital.query.filter_by(registration_status="approved")
+        .order_by(Hospital.id)
+        .all()
+    )
+    result = []
+    for h in hospitals:
+        d = calculate_distance(lat, lon, h.latitude, h.longitude)
+        if d <= radius:
+            result.append((d, h.id))
+    result.sort(key=lambda x: x[0])
+    return [hid for _, hid in result]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--radius", type=float, default=50)
+    parser.add_argument("--queries", type=int, default=5)
+    args = parser.parse_args()
+
+    rnd = random.Random(7)
+    points = [
+        (rnd.uniform(*TN_LAT), rnd.uniform(*TN_LON)) for _ in range(args.queries)
+    ]
+
+    print(f"{'hospitals':>10} {'full scan ms':>14} {'prefilter ms':>14} {'speedup':>8}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        app = make_app()
+        with app.app_context():
+            seed_hospitals(size)
+        client = app.test_client()
+
+        def endpoint():
+            for lat, lon in points:
+                client.post(
+                    "/api/hospitals/nearby",
+                    json={"latitude": lat, "longitude": lon, "radius": args.radius},
+                )
+
+        with app.app_context():
+            for lat, lon in points:
+                expected = full_scan(lat, lon, args.radius)
+                got = client.post(
+                    "/api/hospitals/nearby",
+                    json={"latitude": lat, "longitude": lon, "radius": args.radius},
+                ).get_json()
+                assert [h["id"] for h in got] == expected, "results differ"
+
+            scan_ms = timeit(
+                lambda: [full_scan(lat, lon, args.radius) for lat, lon in points],
+                repeat=3,
+            ) / len(points)
+        new_ms = timeit(endpoint, repeat=3) / len(points)
+        print(f"{size:>10} {scan_ms:>14.2f} {new_ms:>14.2f} {scan_ms / new_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
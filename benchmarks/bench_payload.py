@@ -0,0 +1,108 @@
+"""
+Bytes on the wire for list endpoints: full rows vs sparse fieldsets, each
+uncompressed, gzip and (when brotli is installed) br
+
+    python -m benchmarks.bench_payload [--hospitals 2000] [--articles 200]
+
+Also times the request, so the CPU cost of compressing per request can be
+weighed against the bytes a 2G/3G link no longer has to carry. Catalog
+responses are compressed once per cache entry, so their repeat requests
+cost no compression time.
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.common import make_app, seed_hospitals, seed_patient, seed_history
+from compression import ENCODINGS
+
+SCENARIOS = (
+    ("hospitals_nearby", "post", "/api/hospitals/nearby", None),
+    (
+        "  fields=name,phone,distance",
+        "post",
+        "/api/hospitals/nearby",
+        "name,phone,distance",
+    ),
+    ("doctors_nearby", "post", "/api/doctors/nearby", None),
+    (
+        "  fields=name,specialization,distance",
+        "post",
+        "/api/doctors/nearby",
+        "name,specialization,distance",
+    ),
+    ("awareness_all", "get", "/api/awareness/all", None),
+    ("  fields=title,category", "get", "/api/awareness/all", "title,category"),
+    ("appointments_my", "get", "/api/appointments/my", None),
+    (
+        "  fields=appointment_date,status",
+        "get",
+        "/api/appointments/my",
+        "appointment_date,status",
+    ),
+)
+NEARBY = {"latitude": 10.79, "longitude": 78.70, "radius": 100}
+
+
+def seed_articles(n, seed=42):
+    from app import db
+    from models import AwarenessContent
+
+    rnd = random.Random(seed)
+    words = "fever water clean hands vaccine child mother sugar rest doctor".split()
+    db.session.execute(
+        db.insert(AwarenessContent),
+        [
+            {
+                "title": f"Article {i}",
+                "content": " ".join(rnd.choice(words) for _ in range(400)),
+                "category": rnd.choice(["hygiene", "nutrition", "maternal"]),
+                "language": "EN",
+            }
+            for i in range(n)
+        ],
+    )
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hospitals", type=int, default=2000)
+    parser.add_argument("--articles", type=int, default=200)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        seed_hospitals(args.hospitals, doctors_per_hospital=3)
+        patient_id, headers = seed_patient()
+        seed_history(patient_id, 500)
+        seed_articles(args.articles)
+    client = app.test_client()
+
+    def request(method, path, fields, encoding):
+        hdrs = {**headers, "Accept-Encoding": encoding or "identity"}
+        if method == "post":
+            body = {**NEARBY, **({"fields": fields} if fields else {})}
+            return client.post(path, json=body, headers=hdrs)
+        query = {"fields": fields} if fields else {}
+        return client.get(path, query_string=query, headers=hdrs)
+
+    encodings = (None, *reversed(ENCODINGS))
+    names = [e or "identity" for e in encodings]
+    print(f"{'endpoint':<40}" + "".join(f"{n:>18}" for n in names))
+    for label, method, path, fields in SCENARIOS:
+        cells = []
+        for encoding in encodings:
+            request(method, path, fields, encoding)  # warm caches and indexes
+            start = time.perf_counter()
+            resp = request(method, path, fields, encoding)
+            ms = (time.perf_counter() - start) * 1000
+            assert resp.status_code == 200, resp.status_code
+            assert resp.headers.get("Content-Encoding") == encoding, resp.headers
+            cells.append(f"{len(resp.data):>9,} B {ms:>5.1f}ms")
+        print(f"{label:<40}" + "".join(f"{c:>18}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
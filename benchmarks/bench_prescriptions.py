@@ -0,0 +1,117 @@
+"""
+Bulk prescription issuance: rows/second by batch size
+
+    python -m benchmarks.bench_prescriptions [--sizes 1,10,100,1000] [--rows 2000]
+
+A hospital issues --rows prescriptions to its patients through
+POST /api/prescriptions/batch, --size rows per request. Each request checks
+every doctor, patient and medicine of the batch in one query per kind and
+writes the rows with one bulk INSERT, so the statement count per request
+stays flat as batches grow. Batch size 1 is a doctor saving prescriptions
+one by one.
+"""
+
+import argparse
+from datetime import date, timedelta
+import time
+
+from benchmarks.common import count_statements, make_app, seed_hospitals
+
+MEDICINES = 50
+PATIENTS = 200
+DOCTORS = 5
+
+
+def setup():
+    app = make_app()
+    from flask_jwt_extended import create_access_token
+
+    from app import db
+    from models import Appointment, Doctor, Hospital, Medicine, User
+
+    with app.app_context():
+        seed_hospitals(1, doctors_per_hospital=DOCTORS, approved_ratio=1)
+        hid = db.session.scalars(db.select(Hospital.id)).one()
+        db.session.execute(
+            db.insert(User),
+            [
+                {"name": f"P{i}", "phone": f"7{i:09d}", "password_hash": "x"}
+                for i in range(PATIENTS)
+            ],
+        )
+        doctors = db.session.scalars(db.select(Doctor.id)).all()
+        patients = db.session.scalars(db.select(User.id)).all()
+        db.session.execute(
+            db.insert(Appointment),
+            [
+                {
+                    "patient_id": p,
+                    "doctor_id": doctors[i % len(doctors)],
+                    "hospital_id": hid,
+                    "appointment_date": date.today() - timedelta(days=i),
+                    "appointment_time": "10:00",
+                    "reason": "Checkup",
+                }
+                for i, p in enumerate(patients)
+            ],
+        )
+        expiry = date.today() + timedelta(days=365)
+        for i in range(MEDICINES):
+            db.session.add(
+                Medicine(
+                    hospital_id=hid,
+                    name=f"Medicine {i} 500mg",
+                    quantity=1000,
+                    expiry_date=expiry,
+                )
+            )
+        db.session.commit()
+        token = create_access_token(identity={"id": hid, "role": "hospital"})
+    return app, doctors, patients, {"Authorization": f"Bearer {token}"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1,10,100,1000")
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    app, doctors, patients, headers = setup()
+    from app import db
+
+    client = app.test_client()
+    print(f"{'batch':>6} {'requests':>9} {'rows/s':>9} {'ms/req':>8} {'stmts/req':>10}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        requests = max(1, args.rows // size)
+        batches = [
+            [
+                {
+                    "patient_id": patients[(r * size + i) % len(patients)],
+                    "doctor_id": doctors[i % len(doctors)],
+                    "medicine_name": f"Medicine {i % MEDICINES} 500mg",
+                    "dosage": "1-0-1",
+                    "duration": "5 days",
+                }
+                for i in range(size)
+            ]
+            for r in range(requests)
+        ]
+        with app.app_context(), count_statements(db.engine) as statements:
+            start = time.perf_counter()
+            for batch in batches:
+                resp = client.post(
+                    "/api/prescriptions/batch",
+                    headers=headers,
+                    json={"prescriptions": batch},
+                )
+                body = resp.get_json()
+                assert resp.status_code == 200 and body["issued"] == size, body
+            elapsed = time.perf_counter() - start
+        print(
+            f"{size:>6} {requests:>9} {requests * size / elapsed:>9.0f} "
+            f"{1000 * elapsed / requests:>8.2f} {len(statements) / requests:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Catalog search: SQL LIKE scan vs the in-memory CatalogIndex
+
+    python -m benchmarks.bench_search [--articles 20000]
+
+Fills awareness_content with synthetic English and Tamil articles (common
+health words plus a long Zipf-distributed tail), then times queries
+through LIKE '%word%' over title/category/content, both stopping at the
+first 20 rows and fetching every match (what ranking them would need),
+and through CatalogIndex.search() for the 20 best. Also reports the full
+index build.
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.common import make_app, timeit
+
+ENGLISH = (
+    "vaccination fever diabetes sugar blood pressure heart child mother"
+    " pregnancy nutrition diet water hygiene malaria dengue tuberculosis"
+    " cough cold exercise sleep insurance hospital medicine tablet clinic"
+    " village doctor nurse checkup screening cancer eye dental skin"
+).split()
+TAMIL = "நீரிழிவு காய்ச்சல் தடுப்பூசி இரத்தம் குழந்தை தாய் உணவு மருத்துவமனை".split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=20_000)
+    parser.add_argument("--words", type=int, default=80)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        from app import db
+        from models import AwarenessContent
+        from text_search import CatalogIndex
+
+        rnd = random.Random(3)
+        tail = [f"word{n}" for n in range(5000)]
+        zipf = [1 / (rank + 1) for rank in range(len(tail))]
+        rows = []
+        for i in range(args.articles):
+            tamil = i % 5 == 0
+            vocab = TAMIL if tamil else ENGLISH
+
+            def text(k):
+                words = rnd.choices(vocab, k=k // 4)
+                words += rnd.choices(tail, weights=zipf, k=k - len(words))
+                rnd.shuffle(words)
+                return " ".join(words)
+
+            rows.append(
+                {
+                    "title": text(4),
+                    "content": text(args.words),
+                    "category": rnd.choice(vocab),
+                    "language": "TA" if tamil else "EN",
+                }
+            )
+        db.session.execute(db.insert(AwarenessContent), rows)
+        db.session.commit()
+
+        def documents():
+            for a in AwarenessContent.list_query():
+                yield (
+                    ("awareness", a.id),
+                    {"title": a.title},
+                    {
+                        "title": (a.title, 3),
+                        "category": (a.category, 2),
+                        "content": (a.content, 1),
+                    },
+                )
+
+        index = CatalogIndex()
+        start = time.perf_counter()
+        index.load(documents())
+        build_ms = (time.perf_counter() - start) * 1000
+
+        def like(query, limit):
+            conditions = []
+            for word in query.split():
+                pattern = f"%{word}%"
+                conditions.append(
+                    db.or_(
+                        AwarenessContent.title.like(pattern),
+                        AwarenessContent.category.like(pattern),
+                        AwarenessContent.content.like(pattern),
+                    )
+                )
+            query = AwarenessContent.list_query().filter(db.or_(*conditions))
+            return query.limit(limit).all()
+
+        print(f"{args.articles:,} articles, index build {build_ms:,.0f} ms")
+        print(
+            f"{'query':<20} {'matches':>8} {'LIKE 20 ms':>11}"
+            f" {'LIKE all ms':>12} {'index ms':>9}"
+        )
+        for query in (
+            "malaria",
+            "diabetes screening",
+            "vaccin",
+            "நீரிழிவு",
+            "word4000",
+        ):
+            first = timeit(lambda: like(query, 20))
+            every = timeit(lambda: like(query, None))
+            new = timeit(lambda: index.search(query, 20))
+            matches = len(like(query, None))
+            print(
+                f"{query:<20} {matches:>8,} {first:>11.2f}"
+                f" {every:>12.2f} {new:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Serialization: ORM objects + to_dict + stdlib json vs projected rows + orjson
+
+    python -m benchmarks.bench_serialize [--appointments 10000]
+
+Times each stage of listing one patient's appointments: loading rows,
+turning them into dicts and encoding the body. 'old' is the pre-projection
+path (joinedload, to_dict, Flask's stdlib encoder); 'new' loads through
+Appointment.list_query() and is encoded with stdlib json, orjson and
+MessagePack. The last two lines are the whole endpoint through the test
+client.
+"""
+
+import argparse
+import json
+
+from benchmarks.common import (
+    make_app,
+    seed_history,
+    seed_hospitals,
+    seed_patient,
+    timeit,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--appointments", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = make_app()
+    from flask.json.provider import DefaultJSONProvider
+
+    from app import db
+    from models import Appointment
+    from serialization import _default, msgpack, orjson
+
+    with app.app_context():
+        seed_hospitals(200, doctors_per_hospital=5)
+        patient_id, headers = seed_patient()
+        seed_history(patient_id, args.appointments)
+    stdlib = DefaultJSONProvider(app)
+
+    def load_orm():
+        db.session.expunge_all()
+        return (
+            Appointment.query.filter_by(patient_id=patient_id)
+            .options(
+                db.joinedload(Appointment.patient),
+                db.joinedload(Appointment.doctor),
+                db.joinedload(Appointment.hospital),
+            )
+            .all()
+        )
+
+    def load_rows():
+        query = Appointment.list_query()
+        return query.filter(Appointment.patient_id == patient_id).all()
+
+    lines = []
+
+    def stage(label, fn, minus=0.0):
+        lines.append((label, timeit(fn, args.repeat) - minus))
+        return lines[-1][1]
+
+    with app.app_context():
+        old = [a.to_dict() for a in load_orm()]
+        new = [r._asdict() for r in load_rows()]
+        assert json.loads(stdlib.dumps(old)) == json.loads(app.json.dumps(new)), (
+            "results differ"
+        )
+
+        stage("old: orm + to_dict + json", lambda: stdlib.dumps(
+            [a.to_dict() for a in load_orm()]
+        ))
+        loaded = stage("  load orm objects", load_orm)
+        stage("  to_dict", lambda: [a.to_dict() for a in load_orm()], loaded)
+        stage("  stdlib json", lambda: stdlib.dumps(old))
+
+        loaded = stage("new: load projected rows", load_rows)
+        stage("  _asdict", lambda: [r._asdict() for r in load_rows()], loaded)
+        stage("  stdlib json", lambda: json.dumps(new, default=_default))
+        if orjson is not None:
+            stage("  orjson", lambda: orjson.dumps(new, default=_default))
+        if msgpack is not None:
+            stage("  msgpack", lambda: msgpack.packb(
+                new, default=_default, datetime=False
+            ))
+
+    client = app.test_client()
+    for accept in ("application/json", "application/msgpack"):
+        request_headers = {**headers, "Accept": accept}
+        size = len(client.get("/api/appointments/my", headers=request_headers).data)
+        stage(
+            f"endpoint {accept.split('/')[1]} ({size // 1024:,} KiB)",
+            lambda: client.get("/api/appointments/my", headers=request_headers),
+        )
+
+    print(
+        f"{args.appointments:,} appointments"
+        f" (orjson {'on' if orjson else 'off'}, msgpack {'on' if msgpack else 'off'})"
+    )
+    for label, ms in lines:
+        print(f"{label:<34} {ms:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Worker models under I/O-bound load: gunicorn sync vs gevent workers
+
+    python -m benchmarks.bench_serving [--concurrency 200] [--latency-ms 5]
+
+Serves benchmarks.latency_app (every SQL statement waits --latency-ms, as
+on a networked MySQL) with gunicorn.conf.py in each SERVE_MODE, the same
+number of worker processes each, and drives it with --concurrency client
+threads for --seconds. Reports throughput and latency percentiles for the
+nearby-hospitals search and a patient's appointment list.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.common import make_app, seed_history, seed_hospitals, seed_patient
+
+NEARBY = json.dumps({"latitude": 10.7905, "longitude": 78.7047, "radius": 50})
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port, proc, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/health")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn did not start")
+
+
+def drive(port, requests, concurrency, seconds):
+    """Round-robin `requests` from `concurrency` keep-alive clients."""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+
+    def client(offset):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        mine, failed = [], 0
+        i = offset
+        while time.monotonic() < stop:
+            method, path, body, headers = requests[i % len(requests)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status >= 400:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            mine.append(time.perf_counter() - start)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors[0], time.monotonic() - started
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--modes", default="sync,gthread,gevent")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, "serving.db"))
+        with app.app_context():
+            seed_hospitals(2000, doctors_per_hospital=3)
+            patient_id, headers = seed_patient()
+            seed_history(patient_id, 50)
+        json_headers = {"Content-Type": "application/json"}
+        requests = [
+            ("POST", "/api/hospitals/nearby", NEARBY, json_headers),
+            ("GET", "/api/appointments/my", None, headers),
+        ]
+
+        print(
+            f"{args.workers} workers, {args.concurrency} clients,"
+            f" {args.latency_ms:g} ms per statement"
+        )
+        print(f"{'mode':<8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+        for mode in args.modes.split(","):
+            port = free_port()
+            env = {
+                **os.environ,
+                "SERVE_MODE": mode,
+                "APP_PORT": str(port),
+                "WEB_WORKERS": str(args.workers),
+                "BENCH_DB_LATENCY_MS": str(args.latency_ms),
+            }
+            proc = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "gunicorn",
+                    "-c",
+                    "gunicorn.conf.py",
+                    "--log-level",
+                    "warning",
+                    "benchmarks.latency_app:app",
+                ],
+                env=env,
+            )
+            try:
+                wait_ready(port, proc)
+                latencies, errors, elapsed = drive(
+                    port, requests, args.concurrency, args.seconds
+                )
+            finally:
+                proc.terminate()
+                proc.wait()
+            latencies.sort()
+            print(
+                f"{mode:<8} {len(latencies) / elapsed:>8.0f}"
+                f" {percentile(latencies, 0.5):>8.1f}"
+                f" {percentile(latencies, 0.95):>8.1f} {errors:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
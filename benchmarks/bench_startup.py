@@ -0,0 +1,122 @@
+"""
+Startup: interpreter start to first served request
+
+    python -m benchmarks.bench_startup [--runs 5]
+
+Each run is a fresh interpreter against an existing SQLite database and
+reports the median of: importing app, create_app(), the first request that
+needs no database, and the first one that reads it. 'auto schema' is
+SCHEMA_AUTO_CREATE=1, the create_all() every boot used to do. 'forked
+worker' is what a gunicorn worker pays with preload_app: the master has
+already run create_app(), the worker is forked and serves its first
+database request.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import make_app
+
+CHILD = r"""
+import json, os, sys, time
+
+start = time.perf_counter()
+import app as module
+
+imported = time.perf_counter()
+app = module.create_app()
+created = time.perf_counter()
+
+
+def first_requests():
+    client = app.test_client()
+    begin = time.perf_counter()
+    assert client.get("/api/health").status_code == 200
+    health = time.perf_counter()
+    assert client.get("/api/awareness/all").status_code == 200
+    return health - begin, time.perf_counter() - health
+
+
+if os.environ.get("BENCH_FORK") == "1":
+    read, write = os.pipe()
+    forked = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        health, query = first_requests()
+        boot = time.perf_counter() - forked
+        os.write(write, json.dumps([health, query, boot]).encode())
+        os._exit(0)
+    os.close(write)
+    with os.fdopen(read) as pipe:
+        health, query, boot = json.load(pipe)
+    os.waitpid(pid, 0)
+else:
+    health, query = first_requests()
+    boot = time.perf_counter() - start
+print(json.dumps({
+    "import": imported - start,
+    "create_app": created - imported,
+    "first request": health,
+    "first query": query,
+    "to first query": boot,
+}))
+"""
+
+
+def run(env):
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "startup.db")
+        make_app(db_path)
+        base = {
+            **os.environ,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+            "PYTHONPATH": os.getcwd(),
+        }
+        variants = {
+            "auto schema": {**base, "SCHEMA_AUTO_CREATE": "1"},
+            "init-db": base,
+            "forked worker": {**base, "BENCH_FORK": "1"},
+        }
+        results = {
+            name: [run(env) for _ in range(args.runs)] for name, env in variants.items()
+        }
+
+    phases = list(next(iter(results.values()))[0])
+    print(f"median of {args.runs} runs, ms")
+    print(f"{'':<16}" + "".join(f"{name:>15}" for name in results))
+    for phase in phases:
+        cells = []
+        for name, runs in results.items():
+            value = statistics.median(r[phase] for r in runs) * 1000
+            forked_phase = phase in ("import", "create_app")
+            cells.append(
+                "(master)"
+                if name == "forked worker" and forked_phase
+                else f"{value:.1f}"
+            )
+        print(f"{phase:<16}" + "".join(f"{c:>15}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
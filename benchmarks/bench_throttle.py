@@ -0,0 +1,97 @@
+"""
+Cost and effect of the rate limiter and admission gates
+
+    python -m benchmarks.bench_throttle [--clients 20] [--requests 40]
+
+1. Per-request cost of a bucket take for each store.
+2. `--clients` threads with their own address each send `--requests`
+   /api/hospitals/nearby requests as fast as they can against a worker
+   whose SQL is slowed to 5 ms a statement: with the limits on, excess
+   requests are answered 429/503 without touching the database, and the
+   statements run per second stay bounded.
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import event
+
+from ratelimit import MemoryBucketStore, SQLiteBucketStore
+
+NEARBY = {"latitude": 10.79, "longitude": 78.70, "radius": 100}
+
+
+def time_store(store, n=20000):
+    start = time.perf_counter()
+    for i in range(n):
+        store.take(f"ip:10.0.{i % 250}.1", 5, 20)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def flood(enabled, clients, requests):
+    os.environ["RATE_LIMIT_ENABLED"] = "1" if enabled else "0"
+    from benchmarks.common import make_app, seed_hospitals
+
+    app = make_app()
+    with app.app_context():
+        from app import db
+
+        seed_hospitals(500, doctors_per_hospital=1)
+        engine = db.engine
+    statements = [0]
+
+    def slow(conn, cursor, statement, parameters, context, executemany):
+        statements[0] += 1
+        time.sleep(0.005)
+
+    event.listen(engine, "before_cursor_execute", slow)
+    codes = {}
+    lock = threading.Lock()
+
+    def client(i):
+        with app.test_client() as c:
+            for _ in range(requests):
+                code = c.post(
+                    "/api/hospitals/nearby",
+                    json=NEARBY,
+                    environ_base={"REMOTE_ADDR": f"10.0.0.{i}"},
+                ).status_code
+                with lock:
+                    codes[code] = codes.get(code, 0) + 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - start
+    event.remove(engine, "before_cursor_execute", slow)
+    return codes, statements[0], seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=40)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(prefix="rhs-buckets-", suffix=".db")
+    os.close(fd)
+    print(f"memory store   {time_store(MemoryBucketStore()):6.1f} us/take")
+    print(f"sqlite store   {time_store(SQLiteBucketStore(path)):6.1f} us/take")
+
+    for enabled in (False, True):
+        codes, statements, seconds = flood(enabled, args.clients, args.requests)
+        label = "limits on " if enabled else "limits off"
+        print(
+            f"{label}  {dict(sorted(codes.items()))}  {statements:,} statements"
+            f" in {seconds:.1f}s ({statements / seconds:,.0f}/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Shared helpers for benchmarks: throwaway SQLite app and synthetic rows
+"""
+
+from contextlib import contextmanager
+from datetime import date, timedelta
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import event
+
+# Tamil Nadu roughly spans these coordinates
+TN_LAT = (8.08, 13.50)
+TN_LON = (76.23, 80.35)
+
+
+def make_app(db_path=None):
+    """create_app() bound to a SQLite file (fresh by default), schema created."""
+    if db_path is None:
+        fd, db_path = tempfile.mkstemp(prefix="rhs-bench-", suffix=".db")
+        os.close(fd)
+        os.remove(db_path)
+    os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    # benchmarks hammer the search endpoints from one address
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+    from app import create_app, init_schema
+
+    app = create_app()
+    init_schema(app)
+    return app
+
+
+def seed_hospitals(n, doctors_per_hospital=0, seed=42, approved_ratio=0.9):
+    """Bulk insert `n` hospitals scattered over Tamil Nadu (needs app context)."""
+    from app import db
+    from models import Doctor, Hospital
+
+    rnd = random.Random(seed)
+    hospitals = [
+        {
+            "name": f"PHC {i}",
+            "district": f"District {i % 38}",
+            "taluk": f"Taluk {i % 300}",
+            "village": f"Village {i}",
+            "latitude": rnd.uniform(*TN_LAT),
+            "longitude": rnd.uniform(*TN_LON),
+            "phone": f"9{i:09d}",
+            "email": f"phc{i}@tn.gov.in",
+            "password_hash": "x",
+            "total_beds": 50,
+            "registration_status": "approved"
+            if rnd.random() < approved_ratio
+            else "pending",
+        }
+        for i in range(n)
+    ]
+    db.session.execute(db.insert(Hospital), hospitals)
+    if doctors_per_hospital:
+        ids = db.session.execute(db.select(Hospital.id)).scalars().all()
+        specs = ["General Medicine", "Pediatrics", "Cardiology", "Orthopedics"]
+        doctors = [
+            {
+                "name": f"Dr. {hid}-{j}",
+                "specialization": specs[(hid + j) % len(specs)],
+                "hospital_id": hid,
+                "phone": f"8{hid:06d}{j:03d}",
+                "availability_status": "available" if j % 3 else "off-duty",
+                "consultation_fee": 100 + 10 * j,
+            }
+            for hid in ids
+            for j in range(doctors_per_hospital)
+        ]
+        db.session.execute(db.insert(Doctor), doctors)
+    db.session.commit()
+
+
+def seed_patient(phone="9000000000"):
+    """Insert a patient and return (id, bearer headers) (needs app context)."""
+    from flask_jwt_extended import create_access_token
+
+    from app import db
+    from models import User
+
+    user = User(name="Bench Patient", phone=phone, password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+    token = create_access_token(identity={"id": user.id, "role": "patient"})
+    return user.id, {"Authorization": f"Bearer {token}"}
+
+
+def seed_history(patient_id, n, seed=42):
+    """`n` appointments and `n` prescriptions for one patient (needs app context)."""
+    from app import db
+    from models import Appointment, Doctor, Prescription
+
+    rnd = random.Random(seed)
+    doctors = db.session.execute(db.select(Doctor.id, Doctor.hospital_id)).all()
+    start = date.today()
+    db.session.execute(
+        db.insert(Appointment),
+        [
+            {
+                "patient_id": patient_id,
+                "doctor_id": doctors[i % len(doctors)].id,
+                "hospital_id": doctors[i % len(doctors)].hospital_id,
+                "appointment_date": start + timedelta(days=i // len(doctors)),
+                "appointment_time": "10:00",
+                "reason": "Checkup",
+                "status": rnd.choice(["confirmed", "completed", "cancelled"]),
+            }
+            for i in range(n)
+        ],
+    )
+    db.session.execute(
+        db.insert(Prescription),
+        [
+            {
+                "patient_id": patient_id,
+                "doctor_id": doctors[i % len(doctors)].id,
+                "medicine_name": "Paracetamol 500mg",
+                "dosage": "1-0-1",
+                "duration": "5 days",
+            }
+            for i in range(n)
+        ],
+    )
+    db.session.commit()
+
+
+@contextmanager
+def count_statements(engine):
+    """Collect every SQL statement sent to `engine` inside the block."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def timeit(fn, repeat=5):
+    """Best-of-`repeat` wall time of fn() in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
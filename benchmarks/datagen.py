@@ -0,0 +1,388 @@
+"""
+Synthetic rural-health dataset for benchmarks
+
+    python -m benchmarks.datagen --db /tmp/rhs.db --scale medium
+
+Hospitals are spread around the real district headquarters of Tamil Nadu,
+each district split into taluks and villages; doctors, patients,
+appointments, prescriptions, medicine stock and EN/TA awareness content
+are generated on top. Output is deterministic for a given seed.
+"""
+
+import argparse
+from datetime import date, datetime, timedelta
+import math
+import random
+import time
+
+from werkzeug.security import generate_password_hash
+
+from inventory import normalize_name
+
+# district headquarters (lat, lon)
+DISTRICTS = {
+    "Ariyalur": (11.14, 79.08),
+    "Chengalpattu": (12.69, 79.98),
+    "Chennai": (13.08, 80.27),
+    "Coimbatore": (11.02, 76.96),
+    "Cuddalore": (11.75, 79.75),
+    "Dharmapuri": (12.13, 78.16),
+    "Dindigul": (10.36, 77.98),
+    "Erode": (11.34, 77.72),
+    "Kallakurichi": (11.74, 78.96),
+    "Kancheepuram": (12.83, 79.70),
+    "Kanyakumari": (8.09, 77.54),
+    "Karur": (10.96, 78.08),
+    "Krishnagiri": (12.52, 78.21),
+    "Madurai": (9.93, 78.12),
+    "Mayiladuthurai": (11.10, 79.65),
+    "Nagapattinam": (10.77, 79.84),
+    "Namakkal": (11.22, 78.17),
+    "Nilgiris": (11.41, 76.70),
+    "Perambalur": (11.23, 78.88),
+    "Pudukkottai": (10.38, 78.82),
+    "Ramanathapuram": (9.37, 78.83),
+    "Ranipet": (12.93, 79.33),
+    "Salem": (11.66, 78.15),
+    "Sivaganga": (9.85, 78.48),
+    "Tenkasi": (8.96, 77.30),
+    "Thanjavur": (10.79, 79.14),
+    "Theni": (10.01, 77.48),
+    "Thoothukudi": (8.76, 78.13),
+    "Tiruchirappalli": (10.80, 78.69),
+    "Tirunelveli": (8.71, 77.76),
+    "Tirupathur": (12.50, 78.57),
+    "Tiruppur": (11.11, 77.34),
+    "Tiruvallur": (13.14, 79.91),
+    "Tiruvannamalai": (12.23, 79.07),
+    "Tiruvarur": (10.77, 79.64),
+    "Vellore": (12.92, 79.13),
+    "Viluppuram": (11.94, 79.49),
+    "Virudhunagar": (9.58, 77.96),
+}
+TALUKS_PER_DISTRICT = 8
+FACILITY_TYPES = ["PHC", "CHC", "GH", "District Hospital", "Sub Centre"]
+SPECIALIZATIONS = [
+    "General Medicine",
+    "General Medicine",
+    "General Medicine",
+    "Pediatrics",
+    "Obstetrics",
+    "Gynecology",
+    "Orthopedics",
+    "Cardiology",
+    "Dermatology",
+    "ENT",
+    "Ophthalmology",
+    "Dental",
+]
+MEDICINES = [
+    ("Paracetamol 500mg", "Paracetamol", "tablet"),
+    ("Amoxicillin 500mg", "Amoxicillin", "capsule"),
+    ("Ibuprofen 400mg", "Ibuprofen", "tablet"),
+    ("Metformin 500mg", "Metformin", "tablet"),
+    ("Aspirin 100mg", "Aspirin", "tablet"),
+    ("Cough Syrup", "Dextromethorphan", "ml"),
+    ("Antibiotic Ointment", "Neomycin", "tube"),
+    ("Antacid Tablet", "Magnesium Hydroxide", "tablet"),
+    ("Multivitamin Tablet", "Multivitamins", "tablet"),
+    ("Antihistamine Tablet", "Cetirizine", "tablet"),
+    ("ORS Sachet", "Oral Rehydration Salts", "sachet"),
+    ("Iron Folic Acid", "Ferrous Sulphate", "tablet"),
+    ("Amlodipine 5mg", "Amlodipine", "tablet"),
+    ("Azithromycin 500mg", "Azithromycin", "tablet"),
+]
+TOPICS = {
+    "Vaccination": ("Vaccination schedule", "தடுப்பூசி அட்டவணை"),
+    "Maternal Health": ("Antenatal care", "கர்ப்பகால பராமரிப்பு"),
+    "Nutrition": ("Balanced diet", "சமச்சீர் உணவு"),
+    "Hygiene": ("Hand washing", "கை கழுவுதல்"),
+    "Dengue": ("Dengue prevention", "டெங்கு தடுப்பு"),
+    "Diabetes": ("Living with diabetes", "நீரிழிவுடன் வாழ்வது"),
+}
+SLOT_TIMES = [f"{h:02d}:{m:02d}" for h in range(9, 17) for m in (0, 30)]
+
+SCALES = {
+    "small": {
+        "hospitals": 200,
+        "doctors": 4,
+        "patients": 2_000,
+        "appointments": 20_000,
+        "prescriptions": 20_000,
+        "medicines": 10,
+        "awareness": 60,
+    },
+    "medium": {
+        "hospitals": 2_000,
+        "doctors": 5,
+        "patients": 50_000,
+        "appointments": 500_000,
+        "prescriptions": 500_000,
+        "medicines": 25,
+        "awareness": 600,
+    },
+    "large": {
+        "hospitals": 10_000,
+        "doctors": 6,
+        "patients": 500_000,
+        "appointments": 3_000_000,
+        "prescriptions": 3_000_000,
+        "medicines": 50,
+        "awareness": 3_000,
+    },
+}
+
+BATCH = 10_000
+
+
+def _insert(db, model, rows):
+    """executemany in BATCH-sized chunks, one transaction per chunk."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= BATCH:
+            db.session.execute(db.insert(model), chunk)
+            db.session.commit()
+            chunk = []
+    if chunk:
+        db.session.execute(db.insert(model), chunk)
+        db.session.commit()
+
+
+def generate(
+    hospitals,
+    doctors,
+    patients,
+    appointments,
+    prescriptions,
+    medicines,
+    awareness,
+    seed=2024,
+    log=print,
+):
+    """Fill the database bound to the current app context."""
+    from app import db
+    from models import (
+        Appointment,
+        AwarenessContent,
+        Doctor,
+        HealthScheme,
+        Hospital,
+        Medicine,
+        Prescription,
+        User,
+    )
+
+    rnd = random.Random(seed)
+    today = date.today()
+    # one cheap shared hash: generating per-row hashes would dominate the run
+    pwhash = generate_password_hash("demo123", "pbkdf2:sha256:1000")
+    districts = list(DISTRICTS.items())
+    started = time.perf_counter()
+
+    def step(name, count):
+        log(f"  {name:<14} {count:>10,}  ({time.perf_counter() - started:.1f}s)")
+
+    def hospital_rows():
+        for i in range(hospitals):
+            district, (lat, lon) = districts[i % len(districts)]
+            taluk = rnd.randrange(TALUKS_PER_DISTRICT)
+            # taluk 1 is the HQ; the rest sit in a ring ~25 km around it,
+            # with villages scattered around each taluk centre
+            ring = 0.22 * rnd.uniform(0.8, 1.2) if taluk else 0.0
+            angle = 2 * math.pi * taluk / TALUKS_PER_DISTRICT
+            tlat = lat + ring * math.cos(angle)
+            tlon = lon + ring * math.sin(angle)
+            kind = rnd.choice(FACILITY_TYPES)
+            yield {
+                "name": f"{kind} {district} {i}",
+                "district": district,
+                "taluk": f"{district} Taluk {taluk + 1}",
+                "village": f"Village {i}",
+                "latitude": round(tlat + rnd.gauss(0, 0.06), 6),
+                "longitude": round(tlon + rnd.gauss(0, 0.06), 6),
+                "phone": f"94{i:08d}",
+                "email": f"h{i}@tn.gov.in",
+                "password_hash": pwhash,
+                "total_beds": rnd.choice([10, 30, 50, 100, 200, 500]),
+                "registration_status": "approved"
+                if rnd.random() < 0.95
+                else "pending",
+            }
+
+    _insert(db, Hospital, hospital_rows())
+    step("hospitals", hospitals)
+
+    hospital_ids = db.session.execute(db.select(Hospital.id)).scalars().all()
+    _insert(
+        db,
+        Doctor,
+        (
+            {
+                "name": f"Dr. {hid}-{j}",
+                "specialization": rnd.choice(SPECIALIZATIONS),
+                "hospital_id": hid,
+                "phone": f"93{hid:06d}{j:02d}",
+                "availability_status": "available"
+                if rnd.random() < 0.8
+                else "off-duty",
+                "consultation_fee": rnd.choice([0, 0, 100, 150, 200, 300]),
+            }
+            for hid in hospital_ids
+            for j in range(doctors)
+        ),
+    )
+    doctor_rows = db.session.execute(db.select(Doctor.id, Doctor.hospital_id)).all()
+    step("doctors", len(doctor_rows))
+
+    _insert(
+        db,
+        User,
+        (
+            {
+                "name": f"Patient {i}",
+                "phone": f"9{i:09d}",
+                "password_hash": pwhash,
+                "role": "patient",
+                "age": rnd.randint(1, 90),
+                "gender": rnd.choice(["M", "F"]),
+            }
+            for i in range(patients)
+        ),
+    )
+    step("patients", patients)
+    first_patient = db.session.execute(db.select(db.func.min(User.id))).scalar()
+
+    # appointments take about half of the (doctor, day, slot) cells, walked
+    # in order so uq_slot holds; the window ends ~1 month ahead
+    per_day = len(doctor_rows) * len(SLOT_TIMES)
+    days = max(1, -(-appointments * 5 // (per_day * 2)))
+    start_day = today - timedelta(days=max(days - 30, 0))
+
+    def appointment_rows():
+        n = 0
+        for d in range(days):
+            day = start_day + timedelta(days=d)
+            for doctor_id, hospital_id in doctor_rows:
+                for t in SLOT_TIMES:
+                    if n >= appointments:
+                        return
+                    if rnd.random() < 0.5:
+                        continue
+                    n += 1
+                    yield {
+                        "patient_id": first_patient + rnd.randrange(patients),
+                        "doctor_id": doctor_id,
+                        "hospital_id": hospital_id,
+                        "appointment_date": day,
+                        "appointment_time": t,
+                        "reason": "Checkup",
+                        "status": "completed"
+                        if day < today
+                        else rnd.choice(["confirmed"] * 9 + ["cancelled"]),
+                    }
+
+    _insert(db, Appointment, appointment_rows())
+    step("appointments", db.session.query(Appointment).count())
+
+    _insert(
+        db,
+        Prescription,
+        (
+            {
+                "patient_id": first_patient + rnd.randrange(patients),
+                "doctor_id": rnd.choice(doctor_rows)[0],
+                "medicine_name": rnd.choice(MEDICINES)[0],
+                "dosage": rnd.choice(["1-0-1", "1-1-1", "0-0-1", "1-0-0"]),
+                "duration": f"{rnd.choice([3, 5, 7, 14, 30])} days",
+                "prescribed_at": datetime.combine(
+                    today - timedelta(days=rnd.randrange(365)), datetime.min.time()
+                ),
+            }
+            for _ in range(prescriptions)
+        ),
+    )
+    step("prescriptions", prescriptions)
+
+    _insert(
+        db,
+        Medicine,
+        (
+            {
+                "hospital_id": hid,
+                "name": name if j < len(MEDICINES) else f"{name} #{j}",
+                "generic_name": generic,
+                # Core inserts bypass the model's @validates hooks
+                "search_name": normalize_name(
+                    name if j < len(MEDICINES) else f"{name} #{j}"
+                ),
+                "search_generic": normalize_name(generic),
+                "quantity": rnd.choice([0, 5, 20, 100, 500, 1000]),
+                "unit": unit,
+                "expiry_date": today + timedelta(days=rnd.randint(-60, 720)),
+                "cost": rnd.choice([2, 5, 10, 20, 50]),
+            }
+            for hid in hospital_ids
+            for j, (name, generic, unit) in (
+                (j, MEDICINES[j % len(MEDICINES)]) for j in range(medicines)
+            )
+        ),
+    )
+    step("medicines", len(hospital_ids) * medicines)
+
+    topics = list(TOPICS.items())
+    _insert(
+        db,
+        AwarenessContent,
+        (
+            {
+                "title": f"{topics[i % len(topics)][1][i % 2]} {i}",
+                "content": (
+                    "Visit your nearest PHC for free consultation. " * 20
+                    if i % 2 == 0
+                    else "அருகிலுள்ள ஆரம்ப சுகாதார நிலையத்தை அணுகவும். " * 20
+                ),
+                "category": topics[i % len(topics)][0],
+                "language": "EN" if i % 2 == 0 else "TA",
+            }
+            for i in range(awareness)
+        ),
+    )
+    _insert(
+        db,
+        HealthScheme,
+        (
+            {
+                "name": f"Health Scheme {i}",
+                "description": "State and central health assistance. " * 10,
+                "eligibility": "Residents of Tamil Nadu",
+                "benefits": "Cashless treatment at empanelled hospitals",
+                "contact_info": "Toll-free: 104",
+            }
+            for i in range(25)
+        ),
+    )
+    step("awareness", awareness)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", required=True, help="SQLite file to create")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=2024)
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name}", type=int, help="override the scale preset")
+    args = parser.parse_args()
+
+    from benchmarks.common import make_app
+
+    sizes = dict(SCALES[args.scale])
+    sizes.update({k: v for k, v in vars(args).items() if k in sizes and v})
+    app = make_app(args.db)
+    with app.app_context():
+        print(f"generating '{args.scale}' dataset into {args.db}")
+        generate(seed=args.seed, **sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+create_app() with a fixed delay before every SQL statement, standing in
+for the network round trip to MySQL that a local SQLite file does not have
+
+    BENCH_DB_LATENCY_MS=5 gunicorn -c gunicorn.conf.py benchmarks.latency_app:app
+
+The delay is time.sleep, which gevent patches like the socket reads of
+PyMySQL, so each worker model waits on it the way it would on MySQL.
+"""
+
+import os
+import time
+
+from sqlalchemy import event
+
+from app import create_app, db
+
+LATENCY = float(os.getenv("BENCH_DB_LATENCY_MS", 5)) / 1000
+
+# the load generator is a single client address
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+app = create_app()
+
+
+def _round_trip(conn, cursor, statement, parameters, context, executemany):
+    time.sleep(LATENCY)
+
+
+with app.app_context():
+    for engine in db.engines.values():
+        event.listen(engine, "before_cursor_execute", _round_trip)
@@ -0,0 +1,77 @@
+"""
+Guard against N+1 queries: every read endpoint must issue the same number of
+SQL statements whether it returns a handful of rows or thousands.
+
+    python -m benchmarks.query_counts
+
+Exits non-zero when a statement count grows with the result size;
+tests/test_query_counts.py runs the same check under pytest.
+"""
+
+import sys
+
+from benchmarks.common import (
+    count_statements,
+    make_app,
+    seed_history,
+    seed_hospitals,
+    seed_patient,
+)
+
+# wide enough to cover most of Tamil Nadu from the default search point
+NEARBY = {"latitude": 10.7905, "longitude": 78.7047, "radius": 400}
+
+
+def measure(hospitals, history):
+    app = make_app()
+    with app.app_context():
+        from app import db
+
+        seed_hospitals(hospitals, doctors_per_hospital=3)
+        patient_id, headers = seed_patient()
+        seed_history(patient_id, history)
+        engine = db.engine
+
+    client = app.test_client()
+    calls = {
+        "hospitals_nearby": lambda: client.post("/api/hospitals/nearby", json=NEARBY),
+        "doctors_nearby": lambda: client.post("/api/doctors/nearby", json=NEARBY),
+        "doctors_nearby[specialization]": lambda: client.post(
+            "/api/doctors/nearby", json={**NEARBY, "specialization": "pediatrics"}
+        ),
+        "my_appointments": lambda: client.get("/api/appointments/my", headers=headers),
+        "my_prescriptions": lambda: client.get(
+            "/api/prescriptions/my", headers=headers
+        ),
+        "awareness_all": lambda: client.get("/api/awareness/all"),
+        "health_schemes": lambda: client.get("/api/health-schemes"),
+    }
+
+    counts = {}
+    for name, call in calls.items():
+        with count_statements(engine) as statements:
+            resp = call()
+        assert resp.status_code == 200, f"{name}: HTTP {resp.status_code}"
+        counts[name] = (len(statements), len(resp.get_json()))
+    return counts
+
+
+def main():
+    small = measure(hospitals=5, history=5)
+    large = measure(hospitals=500, history=500)
+
+    failed = False
+    print(f"{'endpoint':<32} {'rows':>11} {'statements':>11}")
+    for name in small:
+        (s_count, s_rows), (l_count, l_rows) = small[name], large[name]
+        ok = s_count == l_count
+        failed |= not ok
+        print(
+            f"{name:<32} {s_rows:>5}/{l_rows:<5} {s_count:>5}/{l_count:<5}"
+            f" {'ok' if ok else 'GROWS WITH RESULT SIZE'}"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Read-replica routing against two SQLite files acting as primary and replica
+
+    python -m benchmarks.replica_routing
+
+The replica is a snapshot of the primary taken with SQLite's backup API
+("replication"); rows written afterwards exist only on the primary, which
+makes the engine each request used visible. Checks that read-only
+endpoints hit the replica, writes hit the primary, a patient reads their
+own booking from the primary right after making it, and that an
+unreachable replica falls back to the primary. Exits non-zero on failure.
+"""
+
+from datetime import date, timedelta
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from benchmarks.common import (
+    count_statements,
+    make_app,
+    seed_history,
+    seed_hospitals,
+    seed_patient,
+)
+
+NEARBY = {"latitude": 10.7905, "longitude": 78.7047, "radius": 400}
+STICKY_SECONDS = 1
+
+
+def replicate(primary, replica):
+    src, dst = sqlite3.connect(primary), sqlite3.connect(replica)
+    with dst:
+        src.backup(dst)
+    src.close()
+    dst.close()
+
+
+def build(tmp, replica_uri):
+    os.environ["SQLALCHEMY_REPLICA_URIS"] = replica_uri
+    os.environ["REPLICA_STICKY_SECONDS"] = str(STICKY_SECONDS)
+    try:
+        return make_app(os.path.join(tmp, "primary.db"))
+    finally:
+        del os.environ["SQLALCHEMY_REPLICA_URIS"]
+
+
+def main():
+    results = []
+
+    def check(name, ok):
+        results.append((name, ok))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        replica_path = os.path.join(tmp, "replica.db")
+        app = build(tmp, f"sqlite:///{replica_path}")
+        from app import db
+
+        with app.app_context():
+            seed_hospitals(50, doctors_per_hospital=2)
+            patient_id, headers = seed_patient()
+            seed_history(patient_id, 20)
+            replicate(os.path.join(tmp, "primary.db"), replica_path)
+            primary, replica = db.engines[None], db.engines["replica_1"]
+            doctor = db.session.execute(
+                db.text("SELECT id, hospital_id FROM doctors LIMIT 1")
+            ).one()
+
+        client = app.test_client()
+
+        def run(call):
+            with count_statements(primary) as on_primary, count_statements(
+                replica
+            ) as on_replica:
+                resp = call()
+            return resp, len(on_primary), len(on_replica)
+
+        for name, call in {
+            "hospitals_nearby": lambda: client.post(
+                "/api/hospitals/nearby", json=NEARBY
+            ),
+            "doctors_nearby": lambda: client.post("/api/doctors/nearby", json=NEARBY),
+            "my_appointments": lambda: client.get(
+                "/api/appointments/my", headers=headers
+            ),
+            "awareness_all": lambda: client.get("/api/awareness/all"),
+        }.items():
+            resp, p, r = run(call)
+            check(f"{name} reads the replica", resp.status_code == 200 and r and not p)
+
+        resp, p, r = run(
+            lambda: client.post(
+                "/api/appointments/book",
+                headers=headers,
+                json={
+                    "doctor_id": doctor.id,
+                    "hospital_id": doctor.hospital_id,
+                    "appointment_date": (date.today() + timedelta(days=90)).isoformat(),
+                    "appointment_time": "11:00",
+                    "reason": "Replica check",
+                },
+            )
+        )
+        check("booking writes the primary", resp.status_code == 201 and p and not r)
+        booked = resp.get_json()["appointment"]["id"]
+
+        resp, p, r = run(lambda: client.get("/api/appointments/my", headers=headers))
+        ids = [a["id"] for a in resp.get_json()]
+        check("booker reads own write from primary", booked in ids and p and not r)
+
+        time.sleep(STICKY_SECONDS + 0.1)
+        resp, p, r = run(lambda: client.get("/api/appointments/my", headers=headers))
+        ids = [a["id"] for a in resp.get_json()]
+        check(
+            "replica again once sticky window ends", booked not in ids and r and not p
+        )
+
+        resp, p, r = run(lambda: client.get("/api/health-schemes"))
+        check("anonymous reads unaffected by booking", r and not p)
+
+        # a replica whose directory does not exist cannot be opened
+        down = build(tmp, f"sqlite:///{tmp}/missing/replica.db")
+        resp = down.test_client().post("/api/hospitals/nearby", json=NEARBY)
+        check("unreachable replica falls back to primary", resp.status_code == 200)
+
+    failed = False
+    for name, ok in results:
+        failed |= not ok
+        print(f"{name:<44} {'ok' if ok else 'FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,391 @@
+"""
+Drive every route in app.py against a synthetic dataset and record latency
+
+    python -m benchmarks.run --scale small
+    python -m benchmarks.run --scale medium --db /tmp/rhs-medium.db --requests 500
+    python -m benchmarks.run --compare latest --fail-on-regression 15
+
+Each scenario is timed request by request through the Flask test client;
+p50/p95/p99 and throughput go to benchmarks/results/<commit>-<time>.json so
+runs on different commits can be compared with --compare.
+"""
+
+import argparse
+from datetime import date, datetime, timedelta
+import glob
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def git_commit():
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def random_point(rnd):
+    from benchmarks.common import TN_LAT, TN_LON
+
+    return rnd.uniform(*TN_LAT), rnd.uniform(*TN_LON)
+
+
+def build_scenarios(app, rnd):
+    """name -> callable(client) issuing one request and returning the response."""
+    from flask_jwt_extended import create_access_token
+
+    from app import db
+    from benchmarks.datagen import SLOT_TIMES
+    from models import Doctor, Hospital, User
+    from sync import encode_token
+
+    with app.app_context():
+        patient_ids = db.session.execute(
+            db.select(User.id).order_by(db.func.random()).limit(200)
+        ).scalars().all()
+        tokens = [
+            {
+                "Authorization": "Bearer "
+                + create_access_token(identity={"id": pid, "role": "patient"})
+            }
+            for pid in patient_ids
+        ]
+        phones = db.session.execute(
+            db.select(User.phone).where(User.id.in_(patient_ids))
+        ).scalars().all()
+        doctors = db.session.execute(
+            db.select(Doctor.id, Doctor.hospital_id)
+            .order_by(db.func.random())
+            .limit(500)
+        ).all()
+        hospital_ids = db.session.execute(
+            db.select(Hospital.id).order_by(db.func.random()).limit(500)
+        ).scalars().all()
+
+        hospital_tokens = [
+            {
+                "Authorization": "Bearer "
+                + create_access_token(identity={"id": hid, "role": "hospital"})
+            }
+            for hid in hospital_ids[:50]
+        ]
+
+    # a device that synced after the dataset was written: the common
+    # reconnect with (almost) nothing new
+    synced_at = (datetime.utcnow(), 0)
+    sync_token = encode_token(
+        {
+            key: synced_at
+            for stream in ("awareness:EN", "schemes", "appointments", "prescriptions")
+            for key in (stream, f"{stream}:deleted")
+        }
+    )
+
+    today = date.today()
+    counter = {"register": 0}
+    booked = []
+
+    def nearby_body(**extra):
+        lat, lon = random_point(rnd)
+        return {"latitude": lat, "longitude": lon, "radius": 25, **extra}
+
+    def register(c):
+        counter["register"] += 1
+        return c.post(
+            "/api/auth/register",
+            json={
+                "phone": f"8{os.getpid() % 1000:03d}{counter['register']:06d}",
+                "password": "demo123",
+                "name": "Bench",
+            },
+        )
+
+    def login(c):
+        return c.post(
+            "/api/auth/login", json={"phone": rnd.choice(phones), "password": "demo123"}
+        )
+
+    def book(c):
+        doctor_id, hospital_id = rnd.choice(doctors)
+        headers = rnd.choice(tokens)
+        resp = c.post(
+            "/api/appointments/book",
+            headers=headers,
+            json={
+                "doctor_id": doctor_id,
+                "hospital_id": hospital_id,
+                "appointment_date": (
+                    today + timedelta(days=rnd.randint(31, 60))
+                ).isoformat(),
+                "appointment_time": rnd.choice(SLOT_TIMES),
+                "reason": "Benchmark",
+            },
+        )
+        if resp.status_code == 201:
+            booked.append((resp.get_json()["appointment"]["id"], headers))
+        return resp
+
+    def cancel(c):
+        if not booked:
+            return book(c)
+        apt_id, headers = booked.pop()
+        return c.put(f"/api/appointments/{apt_id}/cancel", headers=headers)
+
+    def hold(c):
+        doctor_id, _ = rnd.choice(doctors)
+        return c.post(
+            "/api/slots/hold",
+            headers=rnd.choice(tokens),
+            json={
+                "doctor_id": doctor_id,
+                "appointment_date": (
+                    today + timedelta(days=rnd.randint(61, 90))
+                ).isoformat(),
+                "appointment_time": f"{rnd.randint(9, 16):02d}:00",
+            },
+        )
+
+    return {
+        "health": lambda c: c.get("/api/health"),
+        "cache_stats": lambda c: c.get("/api/cache/stats"),
+        "awareness_all": lambda c: c.get(
+            "/api/awareness/all", query_string={"language": rnd.choice(["EN", "TA"])}
+        ),
+        "awareness_page": lambda c: c.get(
+            "/api/awareness/all", query_string={"language": "EN", "limit": 20}
+        ),
+        "health_schemes": lambda c: c.get("/api/health-schemes"),
+        "hospitals_nearby": lambda c: c.post(
+            "/api/hospitals/nearby", json=nearby_body()
+        ),
+        "hospitals_nearby_page": lambda c: c.post(
+            "/api/hospitals/nearby", json=nearby_body(limit=10)
+        ),
+        "hospitals_nearby_batch": lambda c: c.post(
+            "/api/hospitals/nearby/batch",
+            json={"points": [random_point(rnd) for _ in range(100)], "limit": 5},
+        ),
+        "doctors_nearby": lambda c: c.post("/api/doctors/nearby", json=nearby_body()),
+        "doctors_nearby_spec": lambda c: c.post(
+            "/api/doctors/nearby", json=nearby_body(specialization="Pediatrics")
+        ),
+        "slots_available": lambda c: c.get(
+            "/api/slots/available",
+            query_string={
+                "hospital_id": rnd.choice(hospital_ids),
+                "date_to": (today + timedelta(days=6)).isoformat(),
+            },
+        ),
+        "medicines_nearby": lambda c: c.post(
+            "/api/medicines/nearby",
+            json=nearby_body(name=rnd.choice(["para", "amox", "ors", "cetirizine"])),
+        ),
+        "hospital_medicines": lambda c: c.get(
+            f"/api/hospitals/{rnd.choice(hospital_ids)}/medicines",
+            query_string={"q": "am"},
+        ),
+        "medicine_alerts": lambda c: c.get(
+            "/api/medicines/alerts", headers=rnd.choice(hospital_tokens)
+        ),
+        "register": register,
+        "login": login,
+        "book_appointment": book,
+        "cancel_appointment": cancel,
+        "slot_hold": hold,
+        "my_appointments": lambda c: c.get(
+            "/api/appointments/my", headers=rnd.choice(tokens)
+        ),
+        "my_appointments_page": lambda c: c.get(
+            "/api/appointments/my",
+            headers=rnd.choice(tokens),
+            query_string={"limit": 20},
+        ),
+        "my_prescriptions": lambda c: c.get(
+            "/api/prescriptions/my", headers=rnd.choice(tokens)
+        ),
+        "sync_full": lambda c: c.get(
+            "/api/sync",
+            headers={**rnd.choice(tokens), "Accept-Encoding": "gzip"},
+        ),
+        "sync_delta": lambda c: c.get(
+            "/api/sync",
+            headers={**rnd.choice(tokens), "Accept-Encoding": "gzip"},
+            query_string={"since": sync_token},
+        ),
+    }
+
+
+def run_scenario(client, call, requests, warmup):
+    for _ in range(warmup):
+        call(client)
+    latencies, statuses = [], {}
+    started = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        resp = call(client)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "count": requests,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "rps": round(requests / elapsed, 1),
+        "errors": sum(n for s, n in statuses.items() if s >= 500),
+        "statuses": {str(s): n for s, n in sorted(statuses.items())},
+    }
+
+
+def load_result(ref):
+    if ref == "latest":
+        files = sorted(
+            glob.glob(os.path.join(RESULTS_DIR, "*.json")), key=os.path.getmtime
+        )
+        if not files:
+            raise SystemExit("no stored results to compare against")
+        ref = files[-1]
+    with open(ref, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold):
+    """Print per-scenario deltas; return names that regressed past threshold %."""
+    print(
+        f"\ncompared with {baseline['commit']} ({baseline['timestamp']}),"
+        f" scale {baseline['scale']}"
+    )
+    print(f"{'scenario':<24} {'p50 ms':>17} {'p95 ms':>17} {'rps':>15}")
+    regressed = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before:
+            continue
+
+        def delta(key):
+            old = before[key] or 1e-9
+            return (now[key] - old) / old * 100
+
+        flag = ""
+        if threshold is not None and delta("p95_ms") > threshold:
+            regressed.append(name)
+            flag = "  REGRESSED"
+        print(
+            f"{name:<24} {before['p50_ms']:>7.2f}->{now['p50_ms']:<7.2f}"
+            f"{delta('p50_ms'):+5.0f}% {before['p95_ms']:>7.2f}->{now['p95_ms']:<7.2f}"
+            f"{delta('p95_ms'):+5.0f}% {before['rps']:>6.0f}->{now['rps']:<6.0f}{flag}"
+        )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", default="small", help="datagen preset")
+    parser.add_argument("--db", help="reuse/create this SQLite dataset file")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--only", help="comma-separated scenario names")
+    parser.add_argument("--compare", help="result file or 'latest' to diff against")
+    parser.add_argument(
+        "--fail-on-regression",
+        type=float,
+        metavar="PCT",
+        help="exit 1 if any scenario's p95 grew by more than PCT percent",
+    )
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--seed", type=int, default=2024)
+    args = parser.parse_args()
+
+    # the dataset shares one cheap pbkdf2 hash; hash inline at the same cost
+    # so login measures the request path rather than the hash setting
+    os.environ.setdefault("PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000")
+    os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
+    from benchmarks import datagen
+    from benchmarks.common import make_app
+
+    db_path = args.db or os.path.join(
+        os.environ.get("TMPDIR", "/tmp"), f"rhs-bench-{args.scale}-{args.seed}.db"
+    )
+    fresh = not os.path.exists(db_path)
+    app = make_app(db_path)
+    if fresh:
+        with app.app_context():
+            print(f"generating '{args.scale}' dataset into {db_path}")
+            datagen.generate(seed=args.seed, **datagen.SCALES[args.scale])
+
+    baseline = load_result(args.compare) if args.compare else None
+
+    rnd = random.Random(args.seed)
+    scenarios = build_scenarios(app, rnd)
+    if args.only:
+        wanted = args.only.split(",")
+        scenarios = {k: v for k, v in scenarios.items() if k in wanted}
+
+    client = app.test_client()
+    results = {}
+    print(
+        f"{'scenario':<24} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        f" {'req/s':>8} {'5xx':>5}"
+    )
+    for name, call in scenarios.items():
+        r = results[name] = run_scenario(client, call, args.requests, args.warmup)
+        print(
+            f"{name:<24} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f}"
+            f" {r['rps']:>8.1f} {r['errors']:>5}"
+        )
+
+    current = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "scale": args.scale,
+        "sizes": datagen.SCALES.get(args.scale),
+        "requests": args.requests,
+        "python": platform.python_version(),
+        "results": results,
+    }
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(
+            RESULTS_DIR,
+            f"{current['commit']}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json",
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"\nsaved {path}")
+
+    if baseline:
+        regressed = compare(baseline, current, args.fail_on_regression)
+        if regressed:
+            print(f"\nregressions: {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
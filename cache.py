@@ -0,0 +1,106 @@
+"""
+Rural Healthcare System - Response cache
+In-process TTL cache of pre-serialized JSON bodies with ETag support and
+pre-compressed variants
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+import hashlib
+import threading
+import time
+
+from compression import compress
+
+
+class CachedBody:
+    __slots__ = ("body", "etag", "last_modified", "expires_at", "_encoded")
+
+    def __init__(self, body, ttl):
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        self.expires_at = time.monotonic() + ttl
+        self._encoded = {}
+
+    def encoded(self, encoding):
+        """The body compressed with `encoding`, built on first use."""
+        if encoding is None:
+            return self.body
+        body = self._encoded.get(encoding)
+        if body is None:
+            body = self._encoded[encoding] = compress(self.body, encoding, best=True)
+        return body
+
+
+class ResponseCache:
+    """
+    Maps a key (e.g. "awareness:TA") to serialized response bytes.
+    Entries expire after `ttl` seconds or when invalidated explicitly, and
+    at most `max_entries` are kept (least recently used go). Expired
+    entries are dropped when read and whenever a new one is stored.
+    """
+
+    def __init__(self, ttl=300, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        # bumped on every invalidation so a build that raced with one is
+        # served once but never stored
+        self._generation = 0
+
+    def get_or_build(self, key, build):
+        """Cached entry for `key`, calling build() -> bytes on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                del self._entries[key]
+            generation = self._generation
+
+        entry = CachedBody(build(), self.ttl)
+        with self._lock:
+            self.misses += 1
+            if generation == self._generation:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                self._evict()
+        return entry
+
+    def _evict(self):
+        now = time.monotonic()
+        for key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, prefix=""):
+        """Drop every key starting with `prefix` (everything by default)."""
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "ttl": self.ttl,
+                "max_entries": self.max_entries,
+            }
@@ -0,0 +1,137 @@
+"""
+Rural Healthcare System - Response compression
+Accept-Encoding negotiation (brotli when installed, gzip) for response
+bodies above a size threshold, with byte counters
+"""
+
+import gzip
+import threading
+
+from flask import has_request_context, request
+
+try:
+    import brotli
+except ImportError:  # optional; clients asking for br get gzip
+    brotli = None
+
+# preference order when a client accepts several with the same q-value
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+COMPRESSIBLE_MIMETYPES = (
+    "application/json",
+    "application/msgpack",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+# per-request bodies trade ratio for speed; cached bodies are compressed
+# once per TTL, so they get the best ratio
+FAST_LEVELS = {"br": 4, "gzip": 6}
+BEST_LEVELS = {"br": 11, "gzip": 9}
+
+
+def compress(body, encoding, best=False):
+    level = (BEST_LEVELS if best else FAST_LEVELS)[encoding]
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    # mtime=0 keeps the output, and so the ETag of cached bodies, stable
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def compressible(mimetype):
+    return mimetype.startswith("text/") or mimetype in COMPRESSIBLE_MIMETYPES
+
+
+class ResponseCompressor:
+    """
+    after_request hook compressing 200 responses of at least `min_bytes`
+    with the best encoding the client accepts. Streamed responses and
+    bodies that already carry a Content-Encoding, such as pre-compressed
+    cached bodies, are passed through. Counts bytes before and after per
+    encoding.
+    """
+
+    def __init__(self, min_bytes=1024):
+        self.min_bytes = min_bytes
+        self._lock = threading.Lock()
+        # encoding ("identity" for uncompressed) -> [responses, bytes in, bytes out]
+        self._counts = {}
+
+    def init_app(self, app):
+        app.after_request(self._compress)
+
+    def negotiate(self, size):
+        """Encoding for a body of `size` bytes to the current client, or None."""
+        if size < self.min_bytes or not has_request_context():
+            return None
+        accepted = request.accept_encodings
+        best = max(ENCODINGS, key=lambda e: accepted[e])
+        return best if accepted[best] > 0 else None
+
+    def count(self, encoding, size_in, size_out):
+        with self._lock:
+            counts = self._counts.setdefault(encoding or "identity", [0, 0, 0])
+            counts[0] += 1
+            counts[1] += size_in
+            counts[2] += size_out
+
+    def stats(self):
+        with self._lock:
+            counts = {k: list(v) for k, v in self._counts.items()}
+        bytes_in = sum(c[1] for c in counts.values())
+        bytes_out = sum(c[2] for c in counts.values())
+        return {
+            "min_bytes": self.min_bytes,
+            "encodings": {
+                encoding: {"responses": n, "bytes_in": b_in, "bytes_out": b_out}
+                for encoding, (n, b_in, b_out) in sorted(counts.items())
+            },
+            "bytes_saved": bytes_in - bytes_out,
+            "ratio": round(bytes_out / bytes_in, 4) if bytes_in else None,
+        }
+
+    def metric_lines(self):
+        """Prometheus exposition lines for Metrics.add_collector."""
+        stats = self.stats()
+        lines = [
+            "# HELP rhs_response_bytes_total Response body bytes before and after"
+            " compression.",
+            "# TYPE rhs_response_bytes_total counter",
+        ]
+        for encoding, c in stats["encodings"].items():
+            lines.append(
+                f'rhs_response_bytes_total{{encoding="{encoding}",stage="in"}} '
+                f'{c["bytes_in"]}'
+            )
+            lines.append(
+                f'rhs_response_bytes_total{{encoding="{encoding}",stage="out"}} '
+                f'{c["bytes_out"]}'
+            )
+        lines += [
+            "# HELP rhs_response_bytes_saved_total Bytes saved by compression.",
+            "# TYPE rhs_response_bytes_saved_total counter",
+            f"rhs_response_bytes_saved_total {stats['bytes_saved']}",
+        ]
+        return lines
+
+    def _compress(self, response):
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or not compressible(response.mimetype or "")
+        ):
+            return response
+        body = response.get_data()
+        if len(body) < self.min_bytes:
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = self.negotiate(len(body))
+        if encoding is None:
+            self.count(None, len(body), len(body))
+            return response
+        compressed = compress(body, encoding)
+        self.count(encoding, len(body), len(compressed))
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        return response
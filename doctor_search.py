@@ -0,0 +1,393 @@
+"""
+Rural Healthcare System - Doctor search
+In-memory doctor index keyed by normalized specialization, availability and
+hospital location cell, with prefix and synonym matching
+"""
+
+from bisect import bisect_left
+import math
+import re
+import threading
+import time
+
+import numpy as np
+
+from geo import bounding_box, haversine_km
+
+# canonical specialization -> spellings, titles and lay terms patients type
+SPECIALIZATIONS = {
+    "general medicine": (
+        "general",
+        "general physician",
+        "physician",
+        "gp",
+        "family medicine",
+        "internal medicine",
+        "fever",
+    ),
+    "pediatrics": (
+        "paediatrics",
+        "pediatrician",
+        "paediatrician",
+        "child",
+        "children",
+        "child specialist",
+    ),
+    "cardiology": ("cardiologist", "cardiac", "heart"),
+    "orthopedics": (
+        "orthopaedics",
+        "orthopedic",
+        "orthopaedic",
+        "ortho",
+        "bone",
+        "fracture",
+    ),
+    "gynecology": (
+        "gynaecology",
+        "gynecologist",
+        "gynaecologist",
+        "obstetrics",
+        "obg",
+        "obgyn",
+        "women",
+        "pregnancy",
+    ),
+    "dermatology": ("dermatologist", "skin"),
+    "ent": ("otorhinolaryngology", "ear", "nose", "throat", "ear nose throat"),
+    "ophthalmology": ("ophthalmologist", "eye", "eyes"),
+    "dentistry": ("dental", "dentist", "teeth", "tooth"),
+    "psychiatry": ("psychiatrist", "mental health"),
+    "neurology": ("neurologist", "brain", "nerve"),
+    "pulmonology": ("pulmonologist", "chest", "lungs", "respiratory"),
+    "diabetology": ("diabetologist", "diabetes", "sugar"),
+}
+
+# columns of Doctor.to_dict() other than hospital_name
+DOCTOR_FIELDS = (
+    "id",
+    "name",
+    "specialization",
+    "hospital_id",
+    "phone",
+    "availability_status",
+    "consultation_fee",
+)
+
+_ALIASES = {
+    alias: canonical
+    for canonical, aliases in SPECIALIZATIONS.items()
+    for alias in (canonical, *aliases)
+}
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def _clean(text):
+    return _NON_WORD.sub(" ", str(text or "").lower()).strip()
+
+
+def normalize_specialization(text):
+    """Canonical name for a specialization as doctors or patients spell it."""
+    cleaned = _clean(text)
+    return _ALIASES.get(cleaned, cleaned)
+
+
+# element types of rank_key(), for decoding its pagination cursors
+RANK_KEY_TYPES = ((int, float), bool, (int, float), int, int)
+
+
+def rank_key(item):
+    """
+    Ordering of search() results, also the pagination key: nearest first,
+    then available doctors, then lower fee.
+    """
+    doc, distance = item
+    return (
+        distance,
+        doc["availability_status"] != "available",
+        doc["consultation_fee"] or 0,
+        doc["hospital_id"],
+        doc["id"],
+    )
+
+
+class DoctorIndex:
+    """
+    Doctors of approved hospitals, bucketed by (specialization, available,
+    cell) where a cell is a CELL_DEGREES square around the hospital. A
+    search only looks at the buckets of matching specializations in the
+    cells its radius touches.
+
+    load() fills the index from the database. Rows this process writes are
+    queued with mark_dirty() and re-read by the caller via take_dirty() and
+    the upsert/remove methods; stale() turns true after `ttl` seconds so
+    writes made by other workers are picked up by a full reload.
+    """
+
+    # ~28 km; a 50 km search touches about 5x5 cells
+    CELL_DEGREES = 0.25
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._dirty_doctors = set()
+        self._dirty_hospitals = set()
+        self._reset()
+
+    def _reset(self):
+        # doctor id -> to_dict()-shaped dict, whether or not it is bucketed,
+        # and its canonical specialization
+        self._doctors = {}
+        self._specs = {}
+        # hospital id -> (name, latitude, longitude, cell), approved only
+        self._hospitals = {}
+        self._staff = {}
+        self._buckets = {}
+        # bucket key -> (doctors, NumPy columns) for search(), built lazily
+        self._columns = {}
+        # search term -> canonical specializations, and the terms sorted
+        self._terms = {}
+        self._sorted_terms = []
+
+    def __len__(self):
+        return sum(len(b) for b in self._buckets.values())
+
+    def stale(self):
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def clear(self):
+        """Forget everything; the next stale() check triggers a reload."""
+        with self._lock:
+            self._reset()
+            self._loaded_at = None
+
+    def mark_dirty(self, doctors=(), hospitals=()):
+        """Doctor / hospital ids whose rows changed since they were loaded."""
+        with self._lock:
+            self._dirty_doctors.update(doctors)
+            self._dirty_hospitals.update(hospitals)
+
+    def take_dirty(self):
+        """(doctor ids, hospital ids) to re-read, emptying the queue."""
+        with self._lock:
+            doctors, self._dirty_doctors = self._dirty_doctors, set()
+            hospitals, self._dirty_hospitals = self._dirty_hospitals, set()
+        return doctors, hospitals
+
+    def load(self, hospitals, doctors):
+        """
+        Rebuild from (id, name, latitude, longitude) rows of approved
+        hospitals and to_dict()-shaped doctor mappings (hospital_name is
+        filled in here).
+        """
+        with self._lock:
+            self._reset()
+            for h in hospitals:
+                self._hospitals[h[0]] = (h[1], h[2], h[3], self._cell(h[2], h[3]))
+            for doc in doctors:
+                self._add_doctor(dict(doc))
+            self._loaded_at = time.monotonic()
+
+    def upsert_doctor(self, doc):
+        with self._lock:
+            self._remove_doctor(doc["id"])
+            self._add_doctor(dict(doc))
+
+    def remove_doctor(self, doctor_id):
+        with self._lock:
+            self._remove_doctor(doctor_id)
+
+    def upsert_hospital(self, hospital_id, name, latitude, longitude, approved):
+        """Move a hospital's doctors to its new cell, or hide them if unapproved."""
+        with self._lock:
+            staff = self._staff.get(hospital_id, set())
+            for doctor_id in staff:
+                self._unbucket(self._doctors[doctor_id])
+            if approved:
+                self._hospitals[hospital_id] = (
+                    name,
+                    latitude,
+                    longitude,
+                    self._cell(latitude, longitude),
+                )
+            else:
+                self._hospitals.pop(hospital_id, None)
+            for doctor_id in staff:
+                self._bucket(self._doctors[doctor_id])
+
+    def remove_hospital(self, hospital_id):
+        self.upsert_hospital(hospital_id, None, None, None, approved=False)
+
+    def search(self, lat, lon, radius, specialization=None, available_only=False):
+        """
+        [(doctor dict, distance km)] within `radius` km, ordered by
+        rank_key(). `specialization` matches canonical names, synonyms and
+        prefixes of either ("cardio", "heart", "paediatrics").
+        """
+        with self._lock:
+            specs = self._matching(specialization) if specialization else None
+            if specs is not None and not specs:
+                return []
+            keys = self._candidate_keys(lat, lon, radius, specs, available_only)
+            if not keys:
+                return []
+            docs = []
+            columns = []
+            for key in keys:
+                bucket_docs, bucket_columns = self._columns_of(key)
+                docs.extend(bucket_docs)
+                columns.append(bucket_columns)
+
+        columns = np.concatenate(columns, axis=1)
+        lat_rad, lon_rad, cos_lat = columns[:3]
+        dist = haversine_km(
+            math.radians(lat), math.radians(lon), lat_rad, lon_rad, cos_lat
+        )
+        inside = np.flatnonzero(dist <= radius)
+        # rank_key() order; np.lexsort sorts by its last key first
+        ranked = inside[np.lexsort((*columns[:2:-1, inside], dist[inside]))]
+        return [(docs[i], float(dist[i])) for i in ranked.tolist()]
+
+    def _candidate_keys(self, lat, lon, radius, specs, available_only):
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius)
+        statuses = (True,) if available_only else (True, False)
+        if min_lon is not None and specs is not None:
+            lat_cells = range(
+                math.floor(min_lat / self.CELL_DEGREES),
+                math.floor(max_lat / self.CELL_DEGREES) + 1,
+            )
+            lon_cells = range(
+                math.floor(min_lon / self.CELL_DEGREES),
+                math.floor(max_lon / self.CELL_DEGREES) + 1,
+            )
+            probes = len(specs) * len(statuses) * len(lat_cells) * len(lon_cells)
+            if probes < len(self._buckets):
+                keys = []
+                for spec in specs:
+                    for available in statuses:
+                        for i in lat_cells:
+                            for j in lon_cells:
+                                if (spec, available, (i, j)) in self._buckets:
+                                    keys.append((spec, available, (i, j)))
+                return keys
+
+        # a huge radius or no specialization: filter the bucket list instead
+        def wanted(key):
+            spec, available, (i, j) = key
+            if specs is not None and spec not in specs:
+                return False
+            if available_only and not available:
+                return False
+            if min_lon is None:
+                return True
+            return (
+                (i + 1) * self.CELL_DEGREES >= min_lat
+                and i * self.CELL_DEGREES <= max_lat
+                and (j + 1) * self.CELL_DEGREES >= min_lon
+                and j * self.CELL_DEGREES <= max_lon
+            )
+
+        return [key for key in self._buckets if wanted(key)]
+
+    def _matching(self, query):
+        """Canonical specializations a patient's query refers to."""
+        cleaned = _clean(query)
+        if not cleaned:
+            return None
+        if cleaned in _ALIASES:
+            return {_ALIASES[cleaned]}
+        found = set()
+        start = bisect_left(self._sorted_terms, cleaned)
+        for term in self._sorted_terms[start:]:
+            if not term.startswith(cleaned):
+                break
+            found |= self._terms[term]
+        return found
+
+    def _columns_of(self, key):
+        """
+        A bucket's doctors as a list and, lined up with it, a float array
+        of rows: latitude, longitude (radians), cos(latitude), then the
+        rank_key() fields after distance. Rebuilt after the bucket changes.
+        """
+        cached = self._columns.get(key)
+        if cached is None:
+            docs = list(self._buckets[key].values())
+            lat = np.radians([self._hospitals[d["hospital_id"]][1] for d in docs])
+            lon = np.radians([self._hospitals[d["hospital_id"]][2] for d in docs])
+            columns = np.array(
+                [
+                    lat,
+                    lon,
+                    np.cos(lat),
+                    [not key[1]] * len(docs),
+                    [d["consultation_fee"] or 0 for d in docs],
+                    [d["hospital_id"] for d in docs],
+                    [d["id"] for d in docs],
+                ],
+                dtype=np.float64,
+            )
+            cached = self._columns[key] = (docs, columns)
+        return cached
+
+    def _cell(self, latitude, longitude):
+        return (
+            math.floor(latitude / self.CELL_DEGREES),
+            math.floor(longitude / self.CELL_DEGREES),
+        )
+
+    def _key(self, doc):
+        hospital = self._hospitals.get(doc["hospital_id"])
+        if hospital is None:
+            return None
+        available = doc["availability_status"] == "available"
+        return (self._specs[doc["id"]], available, hospital[3])
+
+    def _add_doctor(self, doc):
+        spec = normalize_specialization(doc["specialization"])
+        if spec not in self._terms:
+            self._add_terms(spec)
+        self._doctors[doc["id"]] = doc
+        self._specs[doc["id"]] = spec
+        self._staff.setdefault(doc["hospital_id"], set()).add(doc["id"])
+        self._bucket(doc)
+
+    def _remove_doctor(self, doctor_id):
+        doc = self._doctors.pop(doctor_id, None)
+        if doc is None:
+            return
+        self._unbucket(doc)
+        del self._specs[doctor_id]
+        staff = self._staff.get(doc["hospital_id"])
+        if staff is not None:
+            staff.discard(doctor_id)
+            if not staff:
+                del self._staff[doc["hospital_id"]]
+
+    def _bucket(self, doc):
+        key = self._key(doc)
+        if key is not None:
+            doc["hospital_name"] = self._hospitals[doc["hospital_id"]][0]
+            self._buckets.setdefault(key, {})[doc["id"]] = doc
+            self._columns.pop(key, None)
+
+    def _unbucket(self, doc):
+        key = self._key(doc)
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket.pop(doc["id"], None)
+            self._columns.pop(key, None)
+            if not bucket:
+                del self._buckets[key]
+
+    def _add_terms(self, spec):
+        # the canonical name, each of its words and every known synonym
+        terms = {spec, *spec.split()}
+        for alias, canonical in _ALIASES.items():
+            if canonical == spec:
+                terms.add(alias)
+        for term in terms:
+            if term not in self._terms:
+                self._terms[term] = set()
+                self._sorted_terms.insert(bisect_left(self._sorted_terms, term), term)
+            self._terms[term].add(spec)
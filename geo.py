@@ -0,0 +1,129 @@
+"""
+Rural Healthcare System - Geo helpers
+Haversine distance, bounding-box prefilter and vectorized batch search
+"""
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+
+# distances are rounded to 2 decimals before the radius check, so a point up to
+# 0.005 km past the radius still matches; pad the box so it never drops one
+BOX_PADDING_KM = 0.01
+
+
+def calculate_distance(lat1, lon1, lat2, lon2):
+    """Haversine distance in km."""
+    R = EARTH_RADIUS_KM
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(math.radians(lat1))
+        * math.cos(math.radians(lat2))
+        * math.sin(dlon / 2) ** 2
+    )
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return round(R * c, 2)
+
+
+def bounding_box(lat, lon, radius):
+    """
+    (min_lat, max_lat, min_lon, max_lon) enclosing every point within
+    `radius` km of (lat, lon). Longitude bounds are None when the circle
+    reaches a pole or wraps the antimeridian.
+    """
+    angular = (max(radius, 0) + BOX_PADDING_KM) / EARTH_RADIUS_KM
+    dlat = math.degrees(angular)
+    min_lat, max_lat = lat - dlat, lat + dlat
+
+    sin_angular = math.sin(min(angular, math.pi / 2))
+    cos_lat = math.cos(math.radians(lat))
+    if angular >= math.pi / 2 or sin_angular >= cos_lat:
+        return min_lat, max_lat, None, None
+
+    dlon = math.degrees(math.asin(sin_angular / cos_lat))
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180 or max_lon > 180:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def haversine_km(plat, plon, lat, lon, cos_lat):
+    """
+    Vectorized calculate_distance() between radian arrays, broadcasting
+    like NumPy; `cos_lat` is np.cos(lat), precomputed by the caller.
+    """
+    a = (
+        np.sin((lat - plat) / 2) ** 2
+        + np.cos(plat) * cos_lat * np.sin((lon - plon) / 2) ** 2
+    )
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return np.round(EARTH_RADIUS_KM * c, 2)
+
+
+class CoordinateIndex:
+    """Hospital coordinates held as NumPy arrays for batch distance queries."""
+
+    # query points are processed in chunks of at most this many matrix cells
+    # (~32 MB of float64) so thousands of points don't blow up memory
+    MAX_CELLS = 4_000_000
+
+    def __init__(self, rows):
+        """`rows` is an iterable of (id, latitude, longitude), sorted by id."""
+        rows = list(rows)
+        self.ids = np.array([r[0] for r in rows], dtype=np.int64)
+        lat = np.array([r[1] for r in rows], dtype=np.float64)
+        lon = np.array([r[2] for r in rows], dtype=np.float64)
+        self.lat = np.radians(lat)
+        self.lon = np.radians(lon)
+        self.cos_lat = np.cos(self.lat)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def distance_matrix(self, points):
+        """Haversine km from each (lat, lon) in `points` to every hospital."""
+        pts = np.radians(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+        return haversine_km(pts[:, 0:1], pts[:, 1:2], self.lat, self.lon, self.cos_lat)
+
+    def nearest(self, points, radius, k):
+        """
+        For every query point, up to `k` (hospital_id, distance) pairs within
+        `radius` km, nearest first and ties broken by id like the scalar
+        endpoint.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if not len(self) or not len(points) or k <= 0:
+            return [[] for _ in range(len(points))]
+
+        chunk = max(1, self.MAX_CELLS // len(self))
+        results = []
+        for start in range(0, len(points), chunk):
+            dist = self.distance_matrix(points[start : start + chunk])
+            dist[dist > radius] = np.inf
+            kk = min(k, dist.shape[1])
+            if kk < dist.shape[1]:
+                # pull the k smallest to the front, keeping anything tied
+                # with the k-th so the id tie-break below stays exact
+                part = np.partition(dist, kk - 1, axis=1)[:, kk - 1 : kk]
+                candidates = [
+                    np.flatnonzero(row <= kth) for row, kth in zip(dist, part)
+                ]
+            else:
+                candidates = [np.arange(dist.shape[1])] * len(dist)
+
+            for row, idx in zip(dist, candidates):
+                idx = idx[np.isfinite(row[idx])]
+                order = idx[np.lexsort((idx, row[idx]))][:k]
+                results.append(
+                    [(int(self.ids[i]), float(row[i])) for i in order]
+                )
+        return results
+
+
+def nearest_batch(points, rows, radius, k):
+    """One-shot CoordinateIndex(rows).nearest(points, radius, k)."""
+    return CoordinateIndex(rows).nearest(points, radius, k)
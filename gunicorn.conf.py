@@ -0,0 +1,120 @@
+"""
+Gunicorn settings
+
+    gunicorn -c gunicorn.conf.py "app:create_app()"
+    SERVE_MODE=gevent gunicorn -c gunicorn.conf.py "app:create_app()"
+
+SERVE_MODE picks the worker model:
+- sync (default): one request at a time per worker process; a request
+  waiting on MySQL holds its worker.
+- gevent: each worker serves up to WEB_CONNECTIONS requests at once.
+  PyMySQL is pure Python, so the monkey-patched socket turns every query
+  wait into a switch to another request, with the routes unchanged. CPU
+  work (password hashing, batch distance search) runs outside the loop:
+  in PASSWORD_HASH_WORKERS processes and via serving.offload().
+- gthread: WEB_THREADS threads per worker, the middle ground.
+
+Every worker has its own connection pool, so the pools are sized from
+DB_MAX_CONNECTIONS, the connections this host may hold open to MySQL
+(per server; replicas get the same per-worker pool). Each worker gets
+DB_MAX_CONNECTIONS // workers: pool_size what one worker keeps busy (1
+for sync, WEB_THREADS for gthread, 20 for gevent, capped by the share),
+max_overflow the rest. Requests beyond that wait DB_POOL_TIMEOUT seconds
+for a connection instead of MySQL refusing them with "Too many
+connections". The default of 120 leaves room under MySQL's default
+max_connections of 151 for `flask run-jobs` and admin sessions; raise
+both together. The default worker count is capped at DB_MAX_CONNECTIONS
+on large hosts, while an explicit WEB_WORKERS above it is an error, as
+are explicit DB_POOL_SIZE / DB_MAX_OVERFLOW that do not fit the share.
+
+Password hashes are likewise budgeted per host: PASSWORD_HASH_HOST_WORKERS
+(default: the CPU count) hashing processes, split evenly between gthread
+and gevent workers (at least one each), whose PASSWORD_HASH_QUEUE limit
+then answers 503 once a worker has that many hashes in flight. A sync
+worker serves nothing while it waits on a hash, so it hashes inline
+(PASSWORD_HASH_WORKERS=0): the worker count is the bound there and the
+queue limit never trips.
+
+The search endpoints are rate limited per client address by default.
+Behind a load balancer or reverse proxy, set RATE_LIMIT_PROXY_HOPS to the
+number of proxies appending to X-Forwarded-For; left at 0, every client
+shares the proxy's bucket (a warning is logged once such a request
+arrives). Clients behind one NAT share a bucket unless they log in.
+
+In sync and gthread mode the app is imported once in the master and the
+workers are forked from it (WEB_PRELOAD=0 turns that off). create_app()
+opens no database connections, so forked workers share nothing but
+code. The schema is not created at boot; run `flask --app app init-db`
+once per deployment.
+"""
+
+import multiprocessing
+import os
+
+mode = os.getenv("SERVE_MODE", "sync")
+
+bind = f"0.0.0.0:{os.getenv('APP_PORT', 5000)}"
+timeout = int(os.getenv("WEB_TIMEOUT", 30))
+max_connections = int(os.getenv("DB_MAX_CONNECTIONS", 120))
+
+
+def default_workers(n):
+    # every worker needs at least one connection of the host's budget
+    return min(n, max_connections)
+
+
+if mode == "gevent":
+    worker_class = "gevent"
+    workers = int(
+        os.getenv("WEB_WORKERS", default_workers(multiprocessing.cpu_count()))
+    )
+    worker_connections = int(os.getenv("WEB_CONNECTIONS", 500))
+    # in-flight requests each want a DB connection
+    busy_connections = 20
+elif mode == "gthread":
+    worker_class = "gthread"
+    workers = int(
+        os.getenv("WEB_WORKERS", default_workers(multiprocessing.cpu_count()))
+    )
+    threads = int(os.getenv("WEB_THREADS", 16))
+    busy_connections = threads
+elif mode == "sync":
+    worker_class = "sync"
+    workers = int(
+        os.getenv("WEB_WORKERS", default_workers(multiprocessing.cpu_count() * 2 + 1))
+    )
+    busy_connections = 1
+else:
+    raise ValueError(f"SERVE_MODE must be sync, gthread or gevent, not {mode!r}")
+
+per_worker = max_connections // workers
+if per_worker < 1:
+    raise ValueError(
+        f"DB_MAX_CONNECTIONS={max_connections} is fewer than one per worker"
+        f" (WEB_WORKERS={workers})"
+    )
+pool_size = int(os.getenv("DB_POOL_SIZE", min(busy_connections, per_worker)))
+max_overflow = int(os.getenv("DB_MAX_OVERFLOW", per_worker - pool_size))
+if pool_size + max_overflow > per_worker:
+    raise ValueError(
+        f"DB_POOL_SIZE + DB_MAX_OVERFLOW = {pool_size + max_overflow} per worker"
+        f" exceeds DB_MAX_CONNECTIONS={max_connections} // {workers} workers"
+    )
+
+if mode == "sync":
+    hash_workers = 0
+else:
+    hash_budget = int(
+        os.getenv("PASSWORD_HASH_HOST_WORKERS", multiprocessing.cpu_count())
+    )
+    hash_workers = max(1, hash_budget // workers)
+hash_workers = int(os.getenv("PASSWORD_HASH_WORKERS", hash_workers))
+
+# read by create_app() in the master (--preload) or in each worker
+os.environ["DB_POOL_SIZE"] = str(pool_size)
+os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+os.environ["PASSWORD_HASH_WORKERS"] = str(hash_workers)
+
+# gevent has to patch the standard library before the app is imported,
+# which happens in each worker after the fork
+preload_app = os.getenv("WEB_PRELOAD", "0" if mode == "gevent" else "1") == "1"
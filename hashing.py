@@ -0,0 +1,101 @@
+"""
+Rural Healthcare System - Password hashing
+Runs the deliberately slow hash functions in a bounded process pool
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import threading
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from serving import offload
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing queue is full; callers should answer 503."""
+
+
+class PasswordHasher:
+    """
+    Hash/verify passwords off the request thread.
+
+    `workers` processes do the hashing; at most `max_pending` hashes may be
+    queued or running at once, beyond which calls fail fast with
+    HasherBusy instead of piling up behind each other. workers=0 hashes
+    inline on the calling thread (handy for development and tests), or on
+    gevent's thread pool under gevent workers.
+    Both limits are per process. A sync gunicorn worker runs one request
+    at a time, so max_pending never trips there; the number of workers
+    bounds the hashes in flight (see gunicorn.conf.py).
+    `method` is the werkzeug method string and controls the hash cost;
+    hashes made with any other method are reported by needs_rehash().
+    """
+
+    def __init__(self, method, workers=0, max_pending=None, timeout=30):
+        self.method = method
+        self.workers = workers
+        self.max_pending = max_pending or max(workers, 1) * 4
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pool = None
+        self._pool_pid = None
+        self._pool_lock = threading.Lock()
+        self._prefix = None
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def hash_many(self, passwords):
+        """
+        Hash a batch (bulk import) across the pool. Not subject to
+        max_pending; batches go in `workers` at a time so interactive hashes
+        submitted meanwhile queue behind one round, not the whole batch.
+        """
+        if not self.workers:
+            return [generate_password_hash(p, self.method) for p in passwords]
+        hashes = []
+        for i in range(0, len(passwords), self.workers):
+            window = passwords[i : i + self.workers]
+            hashes.extend(
+                self._executor().map(
+                    generate_password_hash,
+                    window,
+                    [self.method] * len(window),
+                    timeout=self.timeout,
+                )
+            )
+        return hashes
+
+    def needs_rehash(self, pwhash):
+        """True when `pwhash` was made with different cost parameters."""
+        if self._prefix is None:
+            # werkzeug fills in defaults ("pbkdf2" -> "pbkdf2:sha256:600000"),
+            # so read the canonical prefix off a throwaway hash once
+            self._prefix = self.hash("").split("$", 1)[0]
+        return pwhash.split("$", 1)[0] != self._prefix
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy()
+        try:
+            if not self.workers:
+                return offload(fn, *args)
+            return self._executor().submit(fn, *args).result(self.timeout)
+        finally:
+            self._slots.release()
+
+    def _executor(self):
+        # created lazily and per process, so a gunicorn --preload master
+        # never forks workers that share (or inherit a dead) pool
+        with self._pool_lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                self._pool_pid = os.getpid()
+            return self._pool
@@ -0,0 +1,36 @@
+"""
+Rural Healthcare System - App-scoped event listeners
+SQLAlchemy events on model and session classes, registered once per
+process and dispatched to the handlers of the app in context
+"""
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+
+# (target, identifier) -> the one listener registered with SQLAlchemy
+_dispatchers = {}
+
+
+def listen(app, target, identifier, fn):
+    """
+    event.listen(target, identifier, fn) for `app` only.
+
+    Model and session classes are shared by every app in the process, while
+    handlers close over one app's caches. Listening directly would stack a
+    handler per create_app() (tests, benchmarks) and run old apps' handlers
+    on every flush, e.g. writing a sync tombstone per app for one delete.
+    """
+    key = (target, identifier)
+    handlers = app.extensions.setdefault("event_handlers", {})
+    handlers.setdefault(key, []).append(fn)
+    if key not in _dispatchers:
+
+        def dispatch(*args):
+            if has_app_context():
+                for handler in current_app.extensions.get("event_handlers", {}).get(
+                    key, ()
+                ):
+                    handler(*args)
+
+        _dispatchers[key] = dispatch
+        event.listen(target, identifier, dispatch)
@@ -0,0 +1,260 @@
+"""
+Rural Healthcare System - Background jobs
+Database-backed job queue with leases and retries, a worker thread pool and
+a periodic scheduler, run by `flask run-jobs` apart from the web workers
+"""
+
+from datetime import datetime, timedelta
+import json
+import threading
+import uuid
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+# first retry after this long, doubling per attempt
+RETRY_BASE_SECONDS = 30
+
+
+class JobQueue:
+    """
+    Jobs are rows of the jobs table: a kind, a JSON payload and the time
+    they are due. claim() hands due jobs to one worker under a lease; a
+    job whose worker died is claimed again once the lease runs out, so
+    handlers must be idempotent. Failures are retried with exponential
+    backoff and left as 'failed' after `max_attempts`.
+    """
+
+    def __init__(self, db, lease_seconds=300, max_attempts=5):
+        self.db = db
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def enqueue(self, kind, payload, run_at=None, key=None):
+        """Add a job to the current transaction; the caller commits."""
+        from models import Job
+
+        job = Job(
+            kind=kind,
+            payload=json.dumps(payload, separators=(",", ":")),
+            run_at=run_at or datetime.utcnow(),
+            key=key,
+        )
+        self.db.session.add(job)
+        return job
+
+    def enqueue_once(self, kind, payload, key, run_at=None):
+        """Enqueue and commit unless a job with `key` exists. Returns bool."""
+        from models import Job
+
+        session = self.db.session
+        if session.scalar(select(Job.id).where(Job.key == key)) is not None:
+            return False
+        self.enqueue(kind, payload, run_at, key)
+        try:
+            session.commit()
+        except IntegrityError:
+            # another scheduler got there first
+            session.rollback()
+            return False
+        return True
+
+    def claim(self, limit):
+        """Up to `limit` due jobs, now leased to the caller."""
+        from models import Job
+
+        session = self.db.session
+        now = datetime.utcnow()
+        due = or_(
+            and_(Job.status == "queued", Job.run_at <= now),
+            and_(Job.status == "running", Job.locked_until < now),
+        )
+        # SKIP LOCKED lets MySQL workers claim disjoint batches without
+        # waiting on each other; the guarded UPDATE below keeps it correct
+        # where it is not supported
+        ids = session.scalars(
+            select(Job.id)
+            .where(due)
+            .order_by(Job.run_at, Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not ids:
+            session.rollback()
+            return []
+        token = uuid.uuid4().hex
+        session.execute(
+            update(Job)
+            .where(Job.id.in_(ids), due)
+            .values(
+                status="running",
+                locked_by=token,
+                locked_until=now + timedelta(seconds=self.lease_seconds),
+                attempts=Job.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        return session.scalars(
+            select(Job).where(Job.locked_by == token).order_by(Job.id)
+        ).all()
+
+    def finish(self, job):
+        job.status = "done"
+        job.finished_at = datetime.utcnow()
+        job.locked_by = None
+        job.locked_until = None
+        self.db.session.commit()
+
+    def fail(self, job, error):
+        """Record the error and queue a retry, or give up."""
+        job.last_error = str(error)[:2000]
+        job.locked_by = None
+        job.locked_until = None
+        if job.attempts >= self.max_attempts:
+            job.status = "failed"
+            job.finished_at = datetime.utcnow()
+        else:
+            job.status = "queued"
+            delay = RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+            job.run_at = datetime.utcnow() + timedelta(seconds=delay)
+        self.db.session.commit()
+
+    def prune(self, before):
+        """Delete jobs that finished successfully before `before`."""
+        from models import Job
+
+        pruned = self.db.session.execute(
+            delete(Job).where(Job.status == "done", Job.finished_at < before)
+        ).rowcount
+        self.db.session.commit()
+        return pruned
+
+    def counts(self):
+        """{status: jobs}"""
+        from models import Job
+
+        return dict(
+            self.db.session.execute(
+                select(Job.status, func.count()).group_by(Job.status)
+            ).all()
+        )
+
+
+class WorkerPool:
+    """
+    `workers` threads, each claiming up to `batch` jobs at a time and
+    running handlers[job.kind](payload) in its own app context and session.
+    Idle threads poll every `poll_seconds`.
+    """
+
+    def __init__(self, app, queue, handlers, workers=4, batch=10, poll_seconds=1.0):
+        self.app = app
+        self.queue = queue
+        self.handlers = handlers
+        self.workers = workers
+        self.batch = batch
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self.done = 0
+        self.failed = 0
+
+    def start(self):
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._loop, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def drain(self):
+        """Run due jobs on all workers until none are left, then return."""
+        threads = [
+            threading.Thread(target=self._loop, args=(True,), daemon=True)
+            for _ in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _loop(self, until_idle=False):
+        while not self._stop.is_set():
+            with self.app.app_context():
+                try:
+                    jobs = self.queue.claim(self.batch)
+                except Exception:
+                    self.app.logger.exception("claiming jobs failed")
+                    self.queue.db.session.rollback()
+                    jobs = []
+                for job in jobs:
+                    self._run(job)
+            if not jobs:
+                if until_idle:
+                    return
+                self._stop.wait(self.poll_seconds)
+
+    def _run(self, job):
+        session = self.queue.db.session
+        handler = self.handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise LookupError(f"no handler for job kind {job.kind!r}")
+            handler(json.loads(job.payload))
+        except Exception as e:
+            session.rollback()
+            self.app.logger.exception("job %s (%s) failed", job.id, job.kind)
+            self.queue.fail(job, repr(e))
+            with self._lock:
+                self.failed += 1
+            return
+        self.queue.finish(job)
+        with self._lock:
+            self.done += 1
+
+
+class Scheduler:
+    """Calls every planner() each `interval` seconds on one thread."""
+
+    def __init__(self, app, db, planners, interval=60):
+        self.app = app
+        self.db = db
+        self.planners = planners
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def tick(self):
+        for planner in self.planners:
+            with self.app.app_context():
+                try:
+                    planner()
+                except Exception:
+                    self.app.logger.exception("planner %s failed", planner.__name__)
+                    self.db.session.rollback()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="job-scheduler")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.tick()
+            self._stop.wait(self.interval)
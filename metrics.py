@@ -0,0 +1,267 @@
+"""
+Rural Healthcare System - Request instrumentation
+Opt-in latency histograms, SQL counters, phase timers and sampled profiles,
+rendered in Prometheus text format
+"""
+
+from contextlib import contextmanager, nullcontext
+import cProfile
+import functools
+import os
+import random
+import threading
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NOOP = nullcontext()
+
+
+class Metrics:
+    """
+    Collects per-endpoint request metrics when `enabled`. Disabled, no
+    hooks or event listeners are installed and phase() is a shared no-op
+    context manager, so the cost is one attribute check per call site.
+    """
+
+    def __init__(
+        self,
+        enabled=False,
+        slow_seconds=1.0,
+        profile_sample_rate=0.0,
+        profile_dir="/tmp/rhs-profiles",
+    ):
+        self.enabled = enabled
+        self.slow_seconds = slow_seconds
+        self.profile_sample_rate = profile_sample_rate
+        self.profile_dir = profile_dir
+        self._lock = threading.Lock()
+        # endpoint -> {"buckets": [...], "sum": s, "count": n}
+        self._latency = {}
+        # (endpoint, status) -> count
+        self._requests = {}
+        # endpoint -> [statements, seconds]
+        self._sql = {}
+        # (endpoint, phase) -> seconds
+        self._phases = {}
+        self._profiles_written = 0
+        self._collectors = []
+
+    # ---------- wiring ----------
+
+    def init_app(self, app, *engines):
+        if not self.enabled:
+            return
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._before_cursor)
+            event.listen(engine, "after_cursor_execute", self._after_cursor)
+            event.listen(engine, "handle_error", self._cursor_error)
+
+    def add_collector(self, collect):
+        """Register collect() -> iterable of extra exposition lines."""
+        self._collectors.append(collect)
+
+    def instrument(self, owner, attr, phase):
+        """Time every call of owner.attr (class or instance) as `phase`."""
+        if not self.enabled:
+            return
+        fn = getattr(owner, attr)
+        if getattr(fn, "_metrics_phase", None):
+            # already wrapped by an earlier app; phases land in the same g
+            return
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            with self.phase(phase):
+                return fn(*args, **kwargs)
+
+        timed._metrics_phase = phase
+        setattr(owner, attr, timed)
+
+    def phase(self, name):
+        if not self.enabled or not has_request_context():
+            return _NOOP
+        return self._timed_phase(name)
+
+    @contextmanager
+    def _timed_phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            state = g.get("_metrics")
+            if state is not None:
+                phases = state["phases"]
+                phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+    # ---------- request hooks ----------
+
+    def _start_request(self):
+        state = {
+            "start": time.perf_counter(),
+            "sql_count": 0,
+            "sql_time": 0.0,
+            "phases": {},
+            "profiler": None,
+        }
+        if self.profile_sample_rate and random.random() < self.profile_sample_rate:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                state["profiler"] = profiler
+            except ValueError:
+                # another profiler is already active on this thread
+                pass
+        g._metrics = state
+
+    def _finish_request(self, response):
+        state = g.pop("_metrics", None)
+        if state is None:
+            return response
+        elapsed = time.perf_counter() - state["start"]
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        endpoint = f"{request.method} {endpoint}"
+
+        profiler = state["profiler"]
+        if profiler is not None:
+            profiler.disable()
+            if elapsed >= self.slow_seconds:
+                self._dump_profile(profiler, endpoint)
+
+        with self._lock:
+            hist = self._latency.setdefault(
+                endpoint,
+                {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0},
+            )
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if elapsed <= bound:
+                    hist["buckets"][i] += 1
+            hist["sum"] += elapsed
+            hist["count"] += 1
+
+            key = (endpoint, response.status_code)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+            sql = self._sql.setdefault(endpoint, [0, 0.0])
+            sql[0] += state["sql_count"]
+            sql[1] += state["sql_time"]
+
+            for name, seconds in state["phases"].items():
+                key = (endpoint, name)
+                self._phases[key] = self._phases.get(key, 0.0) + seconds
+        return response
+
+    def _dump_profile(self, profiler, endpoint):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        slug = "".join(c if c.isalnum() else "_" for c in endpoint).strip("_")
+        path = os.path.join(
+            self.profile_dir, f"{slug}-{int(time.time() * 1000)}-{os.getpid()}.prof"
+        )
+        profiler.dump_stats(path)
+        with self._lock:
+            self._profiles_written += 1
+
+    # ---------- SQL events ----------
+
+    def _before_cursor(self, conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("_metrics_start", []).append(time.perf_counter())
+
+    def _after_cursor(self, conn, cursor, statement, parameters, context, many):
+        start = conn.info["_metrics_start"].pop()
+        if not has_request_context():
+            return
+        state = g.get("_metrics")
+        if state is not None:
+            state["sql_count"] += 1
+            state["sql_time"] += time.perf_counter() - start
+
+    def _cursor_error(self, exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("_metrics_start"):
+            conn.info["_metrics_start"].pop()
+
+    # ---------- exposition ----------
+
+    def render(self):
+        """All metrics in Prometheus text exposition format."""
+        lines = [
+            "# HELP rhs_request_duration_seconds Request latency by endpoint.",
+            "# TYPE rhs_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for endpoint, hist in sorted(self._latency.items()):
+                label = _label(endpoint)
+                for bound, count in zip(LATENCY_BUCKETS, hist["buckets"]):
+                    lines.append(
+                        f'rhs_request_duration_seconds_bucket{{endpoint="{label}",'
+                        f'le="{bound}"}} {count}'
+                    )
+                lines.append(
+                    f'rhs_request_duration_seconds_bucket{{endpoint="{label}",'
+                    f'le="+Inf"}} {hist["count"]}'
+                )
+                lines.append(
+                    f'rhs_request_duration_seconds_sum{{endpoint="{label}"}} '
+                    f'{hist["sum"]:.6f}'
+                )
+                lines.append(
+                    f'rhs_request_duration_seconds_count{{endpoint="{label}"}} '
+                    f'{hist["count"]}'
+                )
+
+            lines += [
+                "# HELP rhs_requests_total Requests by endpoint and status.",
+                "# TYPE rhs_requests_total counter",
+            ]
+            for (endpoint, status), count in sorted(self._requests.items()):
+                lines.append(
+                    f'rhs_requests_total{{endpoint="{_label(endpoint)}",'
+                    f'status="{status}"}} {count}'
+                )
+
+            lines += [
+                "# HELP rhs_sql_statements_total SQL statements issued per endpoint.",
+                "# TYPE rhs_sql_statements_total counter",
+            ]
+            for endpoint, (count, _) in sorted(self._sql.items()):
+                lines.append(
+                    f'rhs_sql_statements_total{{endpoint="{_label(endpoint)}"}} {count}'
+                )
+            lines += [
+                "# HELP rhs_sql_seconds_total Time spent in SQL per endpoint.",
+                "# TYPE rhs_sql_seconds_total counter",
+            ]
+            for endpoint, (_, seconds) in sorted(self._sql.items()):
+                lines.append(
+                    f'rhs_sql_seconds_total{{endpoint="{_label(endpoint)}"}} '
+                    f"{seconds:.6f}"
+                )
+
+            lines += [
+                "# HELP rhs_phase_seconds_total Time spent per request phase.",
+                "# TYPE rhs_phase_seconds_total counter",
+            ]
+            for (endpoint, name), seconds in sorted(self._phases.items()):
+                lines.append(
+                    f'rhs_phase_seconds_total{{endpoint="{_label(endpoint)}",'
+                    f'phase="{name}"}} {seconds:.6f}'
+                )
+
+            lines += [
+                "# HELP rhs_profiles_written_total Slow-request cProfile dumps.",
+                "# TYPE rhs_profiles_written_total counter",
+                f"rhs_profiles_written_total {self._profiles_written}",
+            ]
+
+        for collect in self._collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
@@ -1,6 +1,9 @@
-from datetime import datetime
+from datetime import date, datetime
+
+from sqlalchemy.orm import validates
 
 from app import db  # if circular import occurs, move models into app.py
+from inventory import normalize_name
 
 
 class User(db.Model):
@@ -20,6 +23,11 @@ class User(db.Model):
     appointments = db.relationship("Appointment", backref="patient", lazy=True)
     prescriptions = db.relationship("Prescription", backref="patient", lazy=True)
 
+    @staticmethod
+    def enabled(is_active):
+        """Only an explicit False disables an account; NULL counts as active."""
+        return is_active is not False
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -54,6 +62,12 @@ class Hospital(db.Model):
     appointments = db.relationship("Appointment", backref="hospital", lazy=True)
     medicines = db.relationship("Medicine", backref="hospital", lazy=True)
 
+    __table_args__ = (
+        db.Index(
+            "idx_hosp_location", "registration_status", "latitude", "longitude"
+        ),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -99,6 +113,13 @@ class Doctor(db.Model):
         }
 
 
+def _slot_active(context):
+    # default of Appointment.active_slot, per inserted row (bulk inserts too)
+    if context.get_current_parameters().get("status") == "cancelled":
+        return None
+    return True
+
+
 class Appointment(db.Model):
     __tablename__ = "appointments"
 
@@ -109,16 +130,59 @@ class Appointment(db.Model):
     appointment_date = db.Column(db.Date, nullable=False)
     appointment_time = db.Column(db.String(10), nullable=False)
     reason = db.Column(db.String(255), nullable=False)
+    # confirmed, cancelled, completed, or no_show once the day passed
+    # without the visit being completed (see reminders.py)
     status = db.Column(db.String(20), default="confirmed")
+    # True while the appointment occupies its slot, NULL once cancelled:
+    # uq_slot ignores NULLs, so cancelled rows stay in the patient's history
+    # while the slot is booked again
+    active_slot = db.Column(db.Boolean, default=_slot_active)
     notes = db.Column(db.Text)
+    # set when the reminder job is queued, in the same transaction
+    reminded_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
 
     __table_args__ = (
         db.UniqueConstraint(
-            "doctor_id", "appointment_date", "appointment_time", name="uq_slot"
+            "doctor_id",
+            "appointment_date",
+            "appointment_time",
+            "active_slot",
+            name="uq_slot",
         ),
+        db.Index("idx_apt_patient_sync", "patient_id", "updated_at"),
+        # per-day scans by the reminder / no-show jobs, in id order
+        db.Index("idx_apt_date", "appointment_date"),
+        db.Index("idx_apt_remind", "appointment_date", "reminded_at"),
     )
 
+    @classmethod
+    def list_query(cls):
+        """to_dict()-shaped rows from one join, without building ORM objects."""
+        return (
+            db.session.query(
+                cls.id,
+                cls.patient_id,
+                cls.doctor_id,
+                cls.hospital_id,
+                User.name.label("patient_name"),
+                Doctor.name.label("doctor_name"),
+                Hospital.name.label("hospital_name"),
+                cls.appointment_date,
+                cls.appointment_time,
+                cls.reason,
+                cls.status,
+                cls.created_at,
+            )
+            .select_from(cls)
+            .outerjoin(User, cls.patient_id == User.id)
+            .outerjoin(Doctor, cls.doctor_id == Doctor.id)
+            .outerjoin(Hospital, cls.hospital_id == Hospital.id)
+        )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -138,6 +202,37 @@ class Appointment(db.Model):
         }
 
 
+class SlotHold(db.Model):
+    __tablename__ = "slot_holds"
+
+    id = db.Column(db.Integer, primary_key=True)
+    patient_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    doctor_id = db.Column(db.Integer, db.ForeignKey("doctors.id"), nullable=False)
+    appointment_date = db.Column(db.Date, nullable=False)
+    appointment_time = db.Column(db.String(10), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "doctor_id", "appointment_date", "appointment_time", name="uq_hold_slot"
+        ),
+        db.Index("idx_hold_expiry", "expires_at"),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "patient_id": self.patient_id,
+            "doctor_id": self.doctor_id,
+            "appointment_date": self.appointment_date.isoformat()
+            if self.appointment_date
+            else None,
+            "appointment_time": self.appointment_time,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+        }
+
+
 class Medicine(db.Model):
     __tablename__ = "medicines"
 
@@ -150,9 +245,29 @@ class Medicine(db.Model):
     expiry_date = db.Column(db.Date, nullable=False)
     cost = db.Column(db.Float, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # normalized copies of name/generic_name for indexed prefix search
+    search_name = db.Column(db.String(150))
+    search_generic = db.Column(db.String(150))
 
-    def to_dict(self):
-        today = datetime.now().date()
+    __table_args__ = (
+        db.Index("idx_med_search_name", "search_name", "expiry_date"),
+        db.Index("idx_med_search_generic", "search_generic", "expiry_date"),
+        db.Index("idx_med_hospital_qty", "hospital_id", "quantity"),
+    )
+
+    @validates("name")
+    def _set_search_name(self, key, value):
+        self.search_name = normalize_name(value)
+        return value
+
+    @validates("generic_name")
+    def _set_search_generic(self, key, value):
+        self.search_generic = normalize_name(value)
+        return value
+
+    def to_dict(self, today=None):
+        # listings pass `today` once instead of asking the clock per row
+        today = today or date.today()
         return {
             "id": self.id,
             "hospital_id": self.hospital_id,
@@ -180,6 +295,30 @@ class Prescription(db.Model):
     duration = db.Column(db.String(100))
     notes = db.Column(db.Text)
     prescribed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    __table_args__ = (db.Index("idx_presc_patient_sync", "patient_id", "updated_at"),)
+
+    @classmethod
+    def list_query(cls):
+        """to_dict()-shaped rows from one join, without building ORM objects."""
+        return (
+            db.session.query(
+                cls.id,
+                cls.patient_id,
+                cls.doctor_id,
+                Doctor.name.label("doctor_name"),
+                cls.medicine_name,
+                cls.dosage,
+                cls.duration,
+                cls.notes,
+                cls.prescribed_at,
+            )
+            .select_from(cls)
+            .outerjoin(Doctor, cls.doctor_id == Doctor.id)
+        )
 
     def to_dict(self):
         return {
@@ -206,6 +345,18 @@ class AwarenessContent(db.Model):
     category = db.Column(db.String(100), nullable=False)
     language = db.Column(db.String(10), default="EN")
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    __table_args__ = (db.Index("idx_aware_sync", "language", "updated_at"),)
+
+    @classmethod
+    def list_query(cls):
+        """to_dict()-shaped rows without building ORM objects."""
+        return db.session.query(
+            cls.id, cls.title, cls.content, cls.category, cls.language, cls.created_at
+        )
 
     def to_dict(self):
         return {
@@ -230,6 +381,23 @@ class HealthScheme(db.Model):
     benefits = db.Column(db.Text)
     contact_info = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    __table_args__ = (db.Index("idx_scheme_sync", "updated_at"),)
+
+    @classmethod
+    def list_query(cls):
+        """to_dict()-shaped rows without building ORM objects."""
+        return db.session.query(
+            cls.id,
+            cls.name,
+            cls.description,
+            cls.eligibility,
+            cls.benefits,
+            cls.contact_info,
+        )
 
     def to_dict(self):
         return {
@@ -240,3 +408,82 @@ class HealthScheme(db.Model):
             "benefits": self.benefits,
             "contact_info": self.contact_info,
         }
+
+
+class SyncTombstone(db.Model):
+    """A deleted synced row, kept so delta sync can tell clients to drop it."""
+
+    __tablename__ = "sync_tombstones"
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(30), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    # patient the row belonged to; NULL for public catalog rows
+    owner_id = db.Column(db.Integer)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index("idx_tomb_sync", "entity", "owner_id", "deleted_at"),
+        db.Index("idx_tomb_age", "deleted_at"),
+    )
+
+
+class AppointmentDailyStat(db.Model):
+    """
+    Appointments per (hospital, doctor, appointment date), kept current by
+    analytics.record() on book/cancel and rebuilt by analytics.reconcile().
+    """
+
+    __tablename__ = "appointment_daily_stats"
+
+    hospital_id = db.Column(db.Integer, primary_key=True)
+    doctor_id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    # rows currently not cancelled / cancelled
+    booked = db.Column(db.Integer, default=0, nullable=False)
+    cancelled = db.Column(db.Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        db.Index("idx_stat_doctor_day", "doctor_id", "day"),
+        db.Index("idx_stat_day", "day"),
+    )
+
+
+class DistrictDailyStat(db.Model):
+    """Appointments per (hospital district, appointment date), like above."""
+
+    __tablename__ = "district_daily_stats"
+
+    district = db.Column(db.String(50), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    booked = db.Column(db.Integer, default=0, nullable=False)
+    cancelled = db.Column(db.Integer, default=0, nullable=False)
+
+    __table_args__ = (db.Index("idx_dstat_day", "day"),)
+
+
+class Job(db.Model):
+    """A unit of background work for `flask run-jobs` (see jobs.py)."""
+
+    __tablename__ = "jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(30), nullable=False)
+    payload = db.Column(db.Text, nullable=False)
+    # jobs that must exist once, e.g. "no_shows:2024-05-01"
+    key = db.Column(db.String(100), unique=True)
+    # queued, running, done or failed
+    status = db.Column(db.String(20), default="queued", nullable=False)
+    run_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    locked_by = db.Column(db.String(32))
+    locked_until = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index("idx_job_due", "status", "run_at"),
+        db.Index("idx_job_lock", "locked_by"),
+        db.Index("idx_job_finished", "status", "finished_at"),
+    )
@@ -0,0 +1,115 @@
+"""
+Rural Healthcare System - Pagination helpers
+Opaque keyset cursors and incremental JSON array streaming for list endpoints
+"""
+
+import base64
+from bisect import bisect_right
+import json
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# rows fetched per round-trip from the server-side cursor when streaming
+STREAM_BATCH = 500
+# element types of a cursor key; keyset_page keys are a single id
+NUMBER = (int, float)
+ID_KEY = (int,)
+
+
+def encode_cursor(key):
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, types=ID_KEY):
+    """
+    The key of `cursor`, checked against the endpoint's key `types` (one
+    type or tuple of types per element) so a forged or stale cursor is a
+    ValueError here rather than a TypeError when compared.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if (
+        not isinstance(key, list)
+        or len(key) != len(types)
+        or not all(_is_type(value, t) for value, t in zip(key, types))
+    ):
+        raise ValueError("Invalid cursor")
+    return tuple(key)
+
+
+def _is_type(value, t):
+    # bool is an int subclass; JSON true is not an id
+    if isinstance(value, bool):
+        return t is bool
+    return isinstance(value, t)
+
+
+def page_args(source, key_types=ID_KEY):
+    """
+    (limit, after_key) from request args / JSON body, or None when the
+    caller passed neither `limit` nor `cursor` (unpaginated legacy shape).
+    `key_types` are the cursor key's element types (see decode_cursor).
+    Raises ValueError on malformed input.
+    """
+    limit = source.get("limit")
+    cursor = source.get("cursor")
+    if limit is None and not cursor:
+        return None
+    limit = DEFAULT_PAGE_SIZE if limit is None else int(limit)
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    after = decode_cursor(cursor, key_types) if cursor else None
+    return min(limit, MAX_PAGE_SIZE), after
+
+
+def wants_stream(source):
+    return str(source.get("stream", "")).lower() in ("1", "true", "yes")
+
+
+def keyset_page(query, column, limit, after):
+    """
+    One page of `query` ordered by the unique, indexed `column`, starting
+    after the cursor key. Returns (rows, next_key).
+    """
+    if after is not None:
+        query = query.filter(column > after[0])
+    rows = query.order_by(column).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, (getattr(rows[-1], column.key),)
+
+
+def slice_page(items, key, limit, after):
+    """
+    One page of `items`, already sorted by key(item), starting after the
+    cursor key. Returns (items, next_key).
+    """
+    start = 0
+    if after is not None:
+        start = bisect_right([list(key(i)) for i in items], list(after))
+    page = items[start : start + limit]
+    if start + limit >= len(items):
+        return page, None
+    return page, key(page[-1])
+
+
+def page_body(items, next_key):
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(next_key) if next_key is not None else None,
+    }
+
+
+def stream_array(rows, serialize, dumps):
+    """Yield a JSON array chunk by chunk, one element per row."""
+    yield "["
+    first = True
+    for row in rows:
+        yield ("" if first else ",") + dumps(serialize(row))
+        first = False
+    yield "]\n"
@@ -0,0 +1,63 @@
+"""
+Rural Healthcare System - Prescription issuance
+Validation of the rows of a hospital's bulk prescription request
+"""
+
+from inventory import normalize_name
+
+MAX_PRESCRIPTION_ITEMS = 1000
+
+
+def _required_text(raw, field, limit):
+    value = str(raw.get(field) or "").strip()
+    if not value:
+        raise ValueError(f"{field} required")
+    if len(value) > limit:
+        raise ValueError(f"{field} too long")
+    return value
+
+
+def _positive_id(raw, field):
+    try:
+        value = int(raw.get(field))
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be an integer") from None
+    if value < 1:
+        raise ValueError(f"{field} must be positive")
+    return value
+
+
+def parse_prescription_item(raw):
+    """
+    Validate one prescription of a bulk request and return the column
+    values plus "search_name", the normalized medicine name matched against
+    the hospital's stock. Raises ValueError with a human-readable reason.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("item must be an object")
+    medicine = _required_text(raw, "medicine_name", 150)
+    duration = str(raw.get("duration") or "").strip() or None
+    if duration is not None and len(duration) > 100:
+        raise ValueError("duration too long")
+    return {
+        "patient_id": _positive_id(raw, "patient_id"),
+        "doctor_id": _positive_id(raw, "doctor_id"),
+        "medicine_name": medicine,
+        "dosage": _required_text(raw, "dosage", 100),
+        "duration": duration,
+        "notes": str(raw.get("notes") or "").strip() or None,
+        "search_name": normalize_name(medicine),
+    }
+
+
+def parse_appointment_ids(raw):
+    """Distinct appointment ids of a request, in order. Raises ValueError."""
+    if raw is None:
+        return []
+    if not isinstance(raw, list):
+        raise ValueError("complete_appointments must be a list")
+    try:
+        ids = [int(i) for i in raw]
+    except (TypeError, ValueError):
+        raise ValueError("complete_appointments must hold integer ids") from None
+    return list(dict.fromkeys(ids))
@@ -0,0 +1,322 @@
+"""
+Rural Healthcare System - Rate limiting and admission control
+Per-client token buckets and per-endpoint concurrency limits that turn
+excess load into 429/503 answers before it reaches the database
+"""
+
+from collections import OrderedDict
+from functools import wraps
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import decode_token
+
+
+def refill(tokens, updated, now, rate, burst):
+    return min(burst, tokens + max(now - updated, 0) * rate)
+
+
+class MemoryBucketStore:
+    """
+    Buckets in this process; with several gunicorn workers each keeps its
+    own, so a client gets up to workers x the configured rate. Holds at
+    most `max_keys` clients, dropping the least recently seen.
+    """
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, cost=1):
+        """Seconds until `cost` tokens are available; 0 means taken."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = refill(tokens, updated, now, rate, burst)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SQLiteBucketStore:
+    """
+    Buckets in a local SQLite file shared by every worker process on the
+    host, so the configured rate holds across them. Each take() is one
+    short write transaction; buckets idle for `idle_seconds` are deleted
+    every `sweep_every` takes.
+    """
+
+    def __init__(self, path, idle_seconds=3600, sweep_every=10_000, timeout=0.5):
+        self.path = path
+        self.idle_seconds = idle_seconds
+        self.sweep_every = sweep_every
+        self.timeout = timeout
+        self._local = threading.local()
+        self._takes = 0
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        conn.close()
+
+    def take(self, key, rate, burst, cost=1):
+        """Seconds until `cost` tokens are available; 0 means taken."""
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = refill(*(row or (burst, now)), now, rate, burst)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            conn.execute(
+                "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE"
+                " SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            self._takes += 1
+            if self._takes % self.sweep_every == 0:
+                conn.execute(
+                    "DELETE FROM buckets WHERE updated < ?", (now - self.idle_seconds,)
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+    def __len__(self):
+        return self._conn().execute("SELECT count(*) FROM buckets").fetchone()[0]
+
+    def _conn(self):
+        # one connection per thread and per process: forked gunicorn
+        # workers must not share the master's
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.conn = self._connect()
+            local.pid = os.getpid()
+        return local.conn
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        return conn
+
+
+def make_store(spec):
+    """Bucket store from RATE_LIMIT_STORE: "memory" or "sqlite:<path>"."""
+    if spec == "memory":
+        return MemoryBucketStore()
+    if spec.startswith("sqlite:"):
+        return SQLiteBucketStore(spec[len("sqlite:") :])
+    raise ValueError("RATE_LIMIT_STORE must be memory or sqlite:<path>")
+
+
+def client_key(proxy_hops=0):
+    """
+    The account of a valid bearer token, else the client address. With
+    `proxy_hops` trusted reverse proxies in front, the address is taken
+    from X-Forwarded-For as they appended it.
+    """
+    auth = request.headers.get("Authorization", "")
+    if auth.startswith("Bearer "):
+        try:
+            claims = decode_token(auth[len("Bearer ") :])
+            identity = claims[current_app.config["JWT_IDENTITY_CLAIM"]]
+            return f"{identity['role']}:{identity['id']}"
+        except Exception:
+            pass  # expired or forged; fall back to the address
+    route = request.access_route
+    if proxy_hops and len(route) > proxy_hops:
+        return f"ip:{route[-proxy_hops - 1]}"
+    return f"ip:{request.remote_addr}"
+
+
+class Gate:
+    """At most `limit` requests inside at once; enter() never waits."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.inflight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def enter(self):
+        with self._lock:
+            if self.inflight >= self.limit:
+                return False
+            self.inflight += 1
+            self.peak = max(self.peak, self.inflight)
+            return True
+
+    def leave(self):
+        with self._lock:
+            self.inflight -= 1
+
+
+class Throttle:
+    """
+    limit() decorates a view with two checks, cheapest first:
+
+    - a token bucket per client (see client_key) refilled at `rate` per
+      second up to `burst`, shared by every limited endpoint; an empty
+      bucket answers 429 with Retry-After.
+    - a Gate per endpoint of `concurrency` requests in flight in this
+      worker process; a full gate answers 503, so a burst from many
+      clients queues in the load balancer rather than in the DB pool.
+
+    A failing store lets requests through (and counts the error) rather
+    than taking the endpoints down with it.
+
+    With proxy_hops=0 every client behind a reverse proxy or NAT shares
+    the proxy's bucket; the first request carrying X-Forwarded-For then
+    logs a warning.
+    """
+
+    def __init__(
+        self,
+        store,
+        rate=5.0,
+        burst=20,
+        concurrency=8,
+        retry_after=1,
+        proxy_hops=0,
+        enabled=True,
+    ):
+        self.store = store
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.retry_after = retry_after
+        self.proxy_hops = proxy_hops
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._gates = {}
+        # endpoint -> {"allowed", "limited", "shed"}
+        self._counts = {}
+        self.store_errors = 0
+        self._warned_proxy = False
+
+    def limit(self, cost=1, concurrency=None):
+        """Limit a view; `cost` tokens per request (e.g. for batch endpoints)."""
+
+        def decorator(view):
+            if not self.enabled:
+                return view
+            name = view.__name__
+            gate = self._gates[name] = Gate(concurrency or self.concurrency)
+            self._counts[name] = {"allowed": 0, "limited": 0, "shed": 0}
+
+            @wraps(view)
+            def limited(*args, **kwargs):
+                wait = self._take(cost)
+                if wait:
+                    self._count(name, "limited")
+                    return (
+                        jsonify({"error": "Too many requests, please slow down"}),
+                        429,
+                        {"Retry-After": str(math.ceil(wait))},
+                    )
+                if not gate.enter():
+                    self._count(name, "shed")
+                    return (
+                        jsonify({"error": "Server busy, please retry"}),
+                        503,
+                        {"Retry-After": str(self.retry_after)},
+                    )
+                self._count(name, "allowed")
+                try:
+                    return view(*args, **kwargs)
+                finally:
+                    gate.leave()
+
+            return limited
+
+        return decorator
+
+    def _take(self, cost):
+        if (
+            not self.proxy_hops
+            and not self._warned_proxy
+            and "X-Forwarded-For" in request.headers
+        ):
+            self._warned_proxy = True
+            current_app.logger.warning(
+                "rate limiting by the proxy's address: requests carry"
+                " X-Forwarded-For but RATE_LIMIT_PROXY_HOPS is 0"
+            )
+        key = client_key(self.proxy_hops)
+        try:
+            return self.store.take(key, self.rate, self.burst, cost)
+        except Exception:
+            with self._lock:
+                self.store_errors += 1
+            return 0
+
+    def _count(self, name, outcome):
+        with self._lock:
+            self._counts[name][outcome] += 1
+
+    def stats(self):
+        with self._lock:
+            counts = {name: dict(c) for name, c in self._counts.items()}
+            errors = self.store_errors
+        for name, gate in self._gates.items():
+            counts[name].update(
+                inflight=gate.inflight, peak=gate.peak, concurrency=gate.limit
+            )
+        return {
+            "enabled": self.enabled,
+            "rate": self.rate,
+            "burst": self.burst,
+            "store": type(self.store).__name__,
+            "clients": len(self.store),
+            "store_errors": errors,
+            "endpoints": counts,
+        }
+
+    def metric_lines(self):
+        """Prometheus exposition lines for Metrics.add_collector."""
+        stats = self.stats()
+        lines = [
+            "# HELP rhs_throttle_requests_total Requests to limited endpoints"
+            " by outcome.",
+            "# TYPE rhs_throttle_requests_total counter",
+        ]
+        for name, c in stats["endpoints"].items():
+            for outcome in ("allowed", "limited", "shed"):
+                lines.append(
+                    f'rhs_throttle_requests_total{{endpoint="{name}",'
+                    f'outcome="{outcome}"}} {c[outcome]}'
+                )
+        lines += ["# TYPE rhs_throttle_inflight gauge"]
+        for name, c in stats["endpoints"].items():
+            lines.append(f'rhs_throttle_inflight{{endpoint="{name}"}} {c["inflight"]}')
+        lines += [
+            "# TYPE rhs_throttle_store_errors_total counter",
+            f"rhs_throttle_store_errors_total {stats['store_errors']}",
+        ]
+        return lines
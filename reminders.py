@@ -0,0 +1,216 @@
+"""
+Rural Healthcare System - Appointment reminders and no-shows
+Planners that turn upcoming and past appointments into batched jobs, their
+job handlers, and notification sinks standing in for an SMS gateway
+"""
+
+from datetime import date, datetime, timedelta
+import importlib
+import json
+import sys
+import threading
+
+from sqlalchemy import select, update
+
+
+class StdoutSink:
+    """Writes each notification as a JSON line to stdout."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def __call__(self, messages):
+        lines = "".join(json.dumps(m, ensure_ascii=False) + "\n" for m in messages)
+        with self._lock:
+            self.stream.write(lines)
+            self.stream.flush()
+
+
+class FileSink(StdoutSink):
+    """Appends each notification as a JSON line to `path`."""
+
+    def __init__(self, path):
+        super().__init__(open(path, "a", encoding="utf-8"))
+
+
+def make_sink(spec):
+    """
+    Notification sink from NOTIFY_SINK: "stdout", "file:<path>", or
+    "<module>:<callable>" for a gateway client taking a list of messages.
+    """
+    if spec == "stdout":
+        return StdoutSink()
+    if spec.startswith("file:"):
+        return FileSink(spec[len("file:") :])
+    module, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError("NOTIFY_SINK must be stdout, file:<path> or module:attr")
+    return getattr(importlib.import_module(module), attr)
+
+
+class AppointmentJobs:
+    """
+    Planners run by the Scheduler and the handlers of the jobs they queue.
+
+    plan_reminders() walks the confirmed, not yet reminded appointments of
+    today and the next `days_ahead` days in id order, `batch_size` at a
+    time, and for each batch stamps reminded_at and queues one "remind"
+    job in the same transaction, so every appointment is queued once.
+    plan_no_shows() queues one "no_shows" job per past day of the last
+    `no_show_days`; it marks the day's still confirmed appointments as
+    no_show, a batch per UPDATE. Both are safe to run again.
+    """
+
+    def __init__(
+        self,
+        db,
+        queue,
+        sink,
+        batch_size=500,
+        days_ahead=1,
+        no_show_days=7,
+        retention_days=7,
+    ):
+        self.db = db
+        self.queue = queue
+        self.sink = sink
+        self.batch_size = batch_size
+        self.days_ahead = days_ahead
+        self.no_show_days = no_show_days
+        self.retention_days = retention_days
+
+    def planners(self):
+        return [self.plan_reminders, self.plan_no_shows, self.prune_jobs]
+
+    def handlers(self):
+        return {"remind": self.send_reminders, "no_shows": self.mark_no_shows}
+
+    # ---------- planners ----------
+
+    def plan_reminders(self, today=None):
+        """Queue reminder jobs; returns the number of appointments queued."""
+        from models import Appointment
+
+        session = self.db.session
+        today = today or datetime.now().date()
+        queued = 0
+        for offset in range(self.days_ahead + 1):
+            day = today + timedelta(days=offset)
+            after = 0
+            while True:
+                # idx_apt_remind (appointment_date, reminded_at), id order
+                ids = session.scalars(
+                    select(Appointment.id)
+                    .where(
+                        Appointment.appointment_date == day,
+                        Appointment.reminded_at.is_(None),
+                        Appointment.status == "confirmed",
+                        Appointment.id > after,
+                    )
+                    .order_by(Appointment.id)
+                    .limit(self.batch_size)
+                ).all()
+                if not ids:
+                    break
+                session.execute(
+                    update(Appointment)
+                    .where(Appointment.id.in_(ids))
+                    .values(reminded_at=datetime.utcnow())
+                    .execution_options(synchronize_session=False)
+                )
+                self.queue.enqueue("remind", {"ids": ids})
+                session.commit()
+                queued += len(ids)
+                after = ids[-1]
+        return queued
+
+    def plan_no_shows(self, today=None):
+        """Queue the no-show sweep of each recent past day, once per day."""
+        today = today or datetime.now().date()
+        queued = 0
+        for offset in range(1, self.no_show_days + 1):
+            day = (today - timedelta(days=offset)).isoformat()
+            queued += self.queue.enqueue_once(
+                "no_shows", {"day": day}, key=f"no_shows:{day}"
+            )
+        return queued
+
+    def prune_jobs(self):
+        return self.queue.prune(datetime.utcnow() - timedelta(days=self.retention_days))
+
+    # ---------- handlers ----------
+
+    def send_reminders(self, payload):
+        """Notify the patients of the appointments in payload["ids"]."""
+        from models import Appointment, Doctor, Hospital, User
+
+        rows = self.db.session.execute(
+            select(
+                Appointment.id,
+                Appointment.appointment_date,
+                Appointment.appointment_time,
+                User.name,
+                User.phone,
+                Doctor.name,
+                Hospital.name,
+                Hospital.phone,
+            )
+            .join(User, User.id == Appointment.patient_id)
+            .join(Doctor, Doctor.id == Appointment.doctor_id)
+            .join(Hospital, Hospital.id == Appointment.hospital_id)
+            .where(
+                Appointment.id.in_(payload["ids"]),
+                # cancelled since the job was queued
+                Appointment.status == "confirmed",
+            )
+            .order_by(Appointment.id)
+        ).all()
+        if rows:
+            self.sink([reminder_message(*row) for row in rows])
+        return len(rows)
+
+    def mark_no_shows(self, payload):
+        """Mark the confirmed appointments of payload["day"] as no_show."""
+        from models import Appointment
+
+        session = self.db.session
+        day = date.fromisoformat(payload["day"])
+        marked, after = 0, 0
+        while True:
+            # idx_apt_date, id order
+            ids = session.scalars(
+                select(Appointment.id)
+                .where(
+                    Appointment.appointment_date == day,
+                    Appointment.status == "confirmed",
+                    Appointment.id > after,
+                )
+                .order_by(Appointment.id)
+                .limit(self.batch_size)
+            ).all()
+            if not ids:
+                return marked
+            marked += session.execute(
+                update(Appointment)
+                .where(Appointment.id.in_(ids), Appointment.status == "confirmed")
+                .values(status="no_show")
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            session.commit()
+            after = ids[-1]
+
+
+def reminder_message(
+    appointment_id, day, time_str, patient, phone, doctor, hospital, hospital_phone
+):
+    return {
+        "type": "appointment_reminder",
+        "appointment_id": appointment_id,
+        "to": phone,
+        "text": (
+            f"Dear {patient}, reminder of your appointment with {doctor} at "
+            f"{hospital} on {day:%d-%m-%Y} at {time_str}. "
+            f"To cancel, call {hospital_phone}."
+        ),
+    }
@@ -0,0 +1,187 @@
+"""
+Rural Healthcare System - Read replica routing
+Session that sends read-only requests to replicas, with health checks,
+fallback to the primary and read-your-writes stickiness
+"""
+
+import functools
+import random
+import threading
+import time
+
+from flask import has_request_context
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+
+from hooks import listen
+
+REPLICA_BIND_PREFIX = "replica_"
+
+
+def replica_binds(uris):
+    """SQLALCHEMY_BINDS entries for a comma-separated list of replica URIs."""
+    uris = [u.strip() for u in (uris or "").split(",") if u.strip()]
+    return {f"{REPLICA_BIND_PREFIX}{i}": uri for i, uri in enumerate(uris, start=1)}
+
+
+def _is_write(clause):
+    return bool(getattr(clause, "is_dml", False)) or (
+        getattr(clause, "_for_update_arg", None) is not None
+    )
+
+
+class RoutingSession(Session):
+    """
+    db.session class. While session.info["replica"] holds an engine, plain
+    SELECTs go to it. Flushes, INSERT/UPDATE/DELETE and SELECT ... FOR
+    UPDATE go to the primary, and after the first of those the rest of the
+    session stays there too, so it reads what it just wrote.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get("replica")
+        if replica is not None and bind is None:
+            if self._flushing or _is_write(clause):
+                self.info["replica"] = None
+            elif clause is not None:
+                return replica
+        if self._flushing or _is_write(clause):
+            self.info["wrote"] = True
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _identity_key():
+    if not has_request_context():
+        return None
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:
+        # no @jwt_required on this endpoint
+        return None
+    if not isinstance(identity, dict):
+        return None
+    return (identity.get("role"), identity.get("id"))
+
+
+class ReplicaRouter:
+    """
+    Chooses a replica for views wrapped in reads(). A replica is pinged at
+    most every `check_seconds`; one that fails a ping or drops a connection
+    is skipped for `retry_seconds` and its requests go to the primary.
+
+    Read-your-writes: once a request by some identity commits a write,
+    that identity's reads stay on the primary for `sticky_seconds`, long
+    enough for replication to catch up. The record is per process.
+    """
+
+    def __init__(self, db, check_seconds=5, retry_seconds=30, sticky_seconds=10):
+        self.db = db
+        self.check_seconds = check_seconds
+        self.retry_seconds = retry_seconds
+        self.sticky_seconds = sticky_seconds
+        self.replicas = []
+        self._lock = threading.Lock()
+        # bind key -> monotonic time of the last good ping / end of backoff
+        self._checked = {}
+        self._down_until = {}
+        # identity key -> monotonic time its reads may use replicas again
+        self._writers = {}
+        self.routed = {"replica": 0, "primary": 0}
+
+    def init_app(self, app):
+        self.replicas = [
+            key
+            for key in app.config.get("SQLALCHEMY_BINDS") or {}
+            if key.startswith(REPLICA_BIND_PREFIX)
+        ]
+        with app.app_context():
+            for key in self.replicas:
+                event.listen(
+                    self.db.engines[key],
+                    "handle_error",
+                    functools.partial(self._replica_error, key),
+                )
+        listen(app, RoutingSession, "after_commit", self._after_commit)
+        listen(app, RoutingSession, "after_soft_rollback", self._after_rollback)
+
+    def reads(self, view):
+        """Decorator for read-only views: run their SELECTs on a replica."""
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            engine = self.pick()
+            with self._lock:
+                self.routed["primary" if engine is None else "replica"] += 1
+            if engine is not None:
+                self.db.session.info["replica"] = engine
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    def pick(self):
+        """A healthy replica engine, or None for the primary."""
+        if not self.replicas or self.recently_wrote(_identity_key()):
+            return None
+        now = time.monotonic()
+        candidates = [k for k in self.replicas if self._down_until.get(k, 0) <= now]
+        random.shuffle(candidates)
+        for key in candidates:
+            if self._healthy(key, now):
+                return self.db.engines[key]
+        return None
+
+    def recently_wrote(self, identity_key):
+        if identity_key is None:
+            return False
+        until = self._writers.get(identity_key)
+        return until is not None and until > time.monotonic()
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "replicas": len(self.replicas),
+                "down": sorted(k for k, t in self._down_until.items() if t > now),
+                "routed": dict(self.routed),
+            }
+
+    def _healthy(self, key, now):
+        if now - self._checked.get(key, float("-inf")) < self.check_seconds:
+            return True
+        try:
+            with self.db.engines[key].connect() as conn:
+                conn.exec_driver_sql("SELECT 1")
+        except DBAPIError:
+            self._mark_down(key)
+            return False
+        self._checked[key] = now
+        return True
+
+    def _mark_down(self, key):
+        with self._lock:
+            self._down_until[key] = time.monotonic() + self.retry_seconds
+            self._checked.pop(key, None)
+
+    def _replica_error(self, key, context):
+        # lost connections and failed connects; SQL errors say nothing about
+        # the replica's health
+        if context.is_disconnect or context.connection is None:
+            self._mark_down(key)
+
+    def _after_commit(self, session):
+        if not session.info.pop("wrote", False):
+            return
+        identity_key = _identity_key()
+        if identity_key is not None:
+            with self._lock:
+                self._writers[identity_key] = time.monotonic() + self.sticky_seconds
+                if len(self._writers) > 10_000:
+                    now = time.monotonic()
+                    self._writers = {k: t for k, t in self._writers.items() if t > now}
+
+    def _after_rollback(self, session, previous_transaction):
+        # the writes are undone; a savepoint's rollback keeps the outer ones
+        if previous_transaction.parent is None:
+            session.info.pop("wrote", None)
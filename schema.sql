@@ -8,8 +8,13 @@ USE rural_healthcare;
 
 -- 2. Clean existing tables (for fresh setup)
 SET FOREIGN_KEY_CHECKS = 0;
+DROP TABLE IF EXISTS jobs;
+DROP TABLE IF EXISTS district_daily_stats;
+DROP TABLE IF EXISTS appointment_daily_stats;
+DROP TABLE IF EXISTS sync_tombstones;
 DROP TABLE IF EXISTS prescriptions;
 DROP TABLE IF EXISTS medicines;
+DROP TABLE IF EXISTS slot_holds;
 DROP TABLE IF EXISTS appointments;
 DROP TABLE IF EXISTS awareness_content;
 DROP TABLE IF EXISTS health_schemes;
@@ -60,7 +65,8 @@ CREATE TABLE hospitals (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         ON UPDATE CURRENT_TIMESTAMP,
     INDEX idx_hosp_district (district),
-    INDEX idx_hosp_status (registration_status)
+    INDEX idx_hosp_status (registration_status),
+    INDEX idx_hosp_location (registration_status, latitude, longitude)
 ) ENGINE=InnoDB
   DEFAULT CHARSET=utf8mb4
   COLLATE=utf8mb4_unicode_ci;
@@ -101,8 +107,10 @@ CREATE TABLE appointments (
     appointment_date DATE NOT NULL,
     appointment_time VARCHAR(10) NOT NULL,  -- e.g. '10:00'
     reason VARCHAR(255) NOT NULL,
-    status VARCHAR(20) DEFAULT 'confirmed', -- 'confirmed','cancelled','completed'
+    status VARCHAR(20) DEFAULT 'confirmed', -- 'confirmed','cancelled','completed','no_show'
+    active_slot BOOLEAN NULL DEFAULT TRUE,  -- NULL once cancelled, frees uq_apt_slot
     notes TEXT,
+    reminded_at DATETIME NULL,              -- reminder job queued
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         ON UPDATE CURRENT_TIMESTAMP,
@@ -122,9 +130,38 @@ CREATE TABLE appointments (
     INDEX idx_apt_hospital (hospital_id),
     INDEX idx_apt_date (appointment_date),
     INDEX idx_apt_status (status),
+    INDEX idx_apt_patient_sync (patient_id, updated_at),
+    INDEX idx_apt_remind (appointment_date, reminded_at),
 
     CONSTRAINT uq_apt_slot
-        UNIQUE (doctor_id, appointment_date, appointment_time)
+        UNIQUE (doctor_id, appointment_date, appointment_time, active_slot)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COLLATE=utf8mb4_unicode_ci;
+
+-- ==========================
+-- SLOT HOLDS (short-lived reservations before booking)
+-- ==========================
+CREATE TABLE slot_holds (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    patient_id INT NOT NULL,
+    doctor_id INT NOT NULL,
+    appointment_date DATE NOT NULL,
+    appointment_time VARCHAR(10) NOT NULL,
+    expires_at DATETIME NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT fk_hold_patient
+        FOREIGN KEY (patient_id) REFERENCES users(id)
+        ON DELETE CASCADE,
+    CONSTRAINT fk_hold_doctor
+        FOREIGN KEY (doctor_id) REFERENCES doctors(id)
+        ON DELETE CASCADE,
+
+    INDEX idx_hold_expiry (expires_at),
+
+    CONSTRAINT uq_hold_slot
+        UNIQUE (doctor_id, appointment_date, appointment_time, active_slot)
 ) ENGINE=InnoDB
   DEFAULT CHARSET=utf8mb4
   COLLATE=utf8mb4_unicode_ci;
@@ -141,6 +178,9 @@ CREATE TABLE medicines (
     unit VARCHAR(20) DEFAULT 'tablet',
     expiry_date DATE NOT NULL,
     cost DECIMAL(10,2) DEFAULT 0,
+    -- lower-cased, punctuation-free copies of name/generic_name for prefix search
+    search_name VARCHAR(150),
+    search_generic VARCHAR(150),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         ON UPDATE CURRENT_TIMESTAMP,
@@ -152,7 +192,10 @@ CREATE TABLE medicines (
 
     INDEX idx_med_hospital (hospital_id),
     INDEX idx_med_name (name),
-    INDEX idx_med_expiry (expiry_date)
+    INDEX idx_med_expiry (expiry_date),
+    INDEX idx_med_search_name (search_name, expiry_date),
+    INDEX idx_med_search_generic (search_generic, expiry_date),
+    INDEX idx_med_hospital_qty (hospital_id, quantity)
 ) ENGINE=InnoDB
   DEFAULT CHARSET=utf8mb4
   COLLATE=utf8mb4_unicode_ci;
@@ -169,6 +212,8 @@ CREATE TABLE prescriptions (
     duration VARCHAR(100),
     notes TEXT,
     prescribed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ON UPDATE CURRENT_TIMESTAMP,
 
     CONSTRAINT fk_presc_patient
         FOREIGN KEY (patient_id)
@@ -181,7 +226,8 @@ CREATE TABLE prescriptions (
 
     INDEX idx_presc_patient (patient_id),
     INDEX idx_presc_doctor (doctor_id),
-    INDEX idx_presc_date (prescribed_at)
+    INDEX idx_presc_date (prescribed_at),
+    INDEX idx_presc_patient_sync (patient_id, updated_at)
 ) ENGINE=InnoDB
   DEFAULT CHARSET=utf8mb4
   COLLATE=utf8mb4_unicode_ci;
@@ -196,9 +242,12 @@ CREATE TABLE awareness_content (
     category VARCHAR(100) NOT NULL,
     language VARCHAR(10) DEFAULT 'EN', -- 'EN' or 'TA'
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ON UPDATE CURRENT_TIMESTAMP,
 
     INDEX idx_aware_category (category),
-    INDEX idx_aware_language (language)
+    INDEX idx_aware_language (language),
+    INDEX idx_aware_sync (language, updated_at)
 ) ENGINE=InnoDB
   DEFAULT CHARSET=utf8mb4
   COLLATE=utf8mb4_unicode_ci;
@@ -215,7 +264,78 @@ CREATE TABLE health_schemes (
     contact_info VARCHAR(100),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        ON UPDATE CURRENT_TIMESTAMP
+        ON UPDATE CURRENT_TIMESTAMP,
+
+    INDEX idx_scheme_sync (updated_at)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COLLATE=utf8mb4_unicode_ci;
+
+-- ==========================
+-- SYNC TOMBSTONES (deleted rows, for /api/sync)
+-- ==========================
+CREATE TABLE sync_tombstones (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    entity VARCHAR(30) NOT NULL,          -- table name of the deleted row
+    row_id INT NOT NULL,
+    owner_id INT,                         -- patient; NULL for catalog rows
+    deleted_at DATETIME NOT NULL,
+
+    INDEX idx_tomb_sync (entity, owner_id, deleted_at),
+    INDEX idx_tomb_age (deleted_at)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COLLATE=utf8mb4_unicode_ci;
+
+-- ==========================
+-- ANALYTICS ROLLUPS (maintained on book/cancel, see analytics.py)
+-- ==========================
+CREATE TABLE appointment_daily_stats (
+    hospital_id INT NOT NULL,
+    doctor_id INT NOT NULL,
+    day DATE NOT NULL,                    -- appointment date
+    booked INT NOT NULL DEFAULT 0,        -- appointments not cancelled
+    cancelled INT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (hospital_id, doctor_id, day),
+    INDEX idx_stat_doctor_day (doctor_id, day),
+    INDEX idx_stat_day (day)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE district_daily_stats (
+    district VARCHAR(50) NOT NULL,
+    day DATE NOT NULL,
+    booked INT NOT NULL DEFAULT 0,
+    cancelled INT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (district, day),
+    INDEX idx_dstat_day (day)
+) ENGINE=InnoDB
+  DEFAULT CHARSET=utf8mb4
+  COLLATE=utf8mb4_unicode_ci;
+
+-- ==========================
+-- BACKGROUND JOBS (flask run-jobs, see jobs.py)
+-- ==========================
+CREATE TABLE jobs (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    kind VARCHAR(30) NOT NULL,            -- 'remind','no_shows'
+    payload TEXT NOT NULL,                -- JSON
+    `key` VARCHAR(100) NULL UNIQUE,       -- jobs that must exist once
+    status VARCHAR(20) NOT NULL DEFAULT 'queued', -- 'queued','running','done','failed'
+    run_at DATETIME NOT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    locked_by VARCHAR(32) NULL,
+    locked_until DATETIME NULL,
+    last_error TEXT,
+    created_at DATETIME NOT NULL,
+    finished_at DATETIME NULL,
+
+    INDEX idx_job_due (status, run_at),
+    INDEX idx_job_lock (locked_by),
+    INDEX idx_job_finished (status, finished_at)
 ) ENGINE=InnoDB
   DEFAULT CHARSET=utf8mb4
   COLLATE=utf8mb4_unicode_ci;
@@ -282,6 +402,10 @@ VALUES
 (4, 'Multivitamin Tablet', 'Multivitamins', 300, 'tablet', '2027-08-31', 50),
 (5, 'Antihistamine Tablet', 'Cetirizine', 200, 'tablet', '2026-10-31', 10);
 
+-- sample names carry no punctuation, so lower-casing matches normalize_name()
+UPDATE medicines
+SET search_name = LOWER(name), search_generic = LOWER(generic_name);
+
 -- Awareness content (EN + TA)
 INSERT INTO awareness_content (title, content, category, language) VALUES
 ('Child Vaccination Schedule',
@@ -0,0 +1,138 @@
+"""
+Rural Healthcare System - Response serialization
+Fast JSON (orjson when installed) and MessagePack negotiation for jsonify
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used instead
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional; clients asking for it get JSON
+    msgpack = None
+
+MSGPACK_MIMETYPES = ("application/msgpack", "application/x-msgpack")
+
+# stdlib json turns int keys into strings; keep that behaviour
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def _default(o):
+    # ISO 8601 like the to_dict() methods (and orjson), not Flask's HTTP dates,
+    # so projected rows can carry date/datetime values straight through
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, Decimal):
+        return float(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    app.json replacement. dumps()/encode() use orjson when it is installed,
+    and jsonify() answers in MessagePack when msgpack is installed and the
+    client's Accept header prefers it over JSON.
+    """
+
+    default = staticmethod(_default)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS).decode()
+
+    def negotiate(self):
+        """Mimetype to answer the current request in."""
+        if msgpack is None or not has_request_context():
+            return self.mimetype
+        best = request.accept_mimetypes.best_match((self.mimetype, *MSGPACK_MIMETYPES))
+        return MSGPACK_MIMETYPES[0] if best in MSGPACK_MIMETYPES else self.mimetype
+
+    def encode(self, obj, mimetype=None):
+        """(body bytes, mimetype) for `obj`, negotiated unless `mimetype`."""
+        mimetype = mimetype or self.negotiate()
+        if mimetype in MSGPACK_MIMETYPES:
+            return msgpack.packb(obj, default=_default, datetime=False), mimetype
+        if orjson is not None:
+            return (
+                orjson.dumps(
+                    obj,
+                    default=_default,
+                    option=_ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE,
+                ),
+                mimetype,
+            )
+        return (self.dumps(obj) + "\n").encode(), mimetype
+
+    def response(self, *args, **kwargs):
+        mimetype = self.negotiate()
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if pretty and mimetype == self.mimetype:
+            resp = super().response(*args, **kwargs)
+        else:
+            obj = self._prepare_response_obj(args, kwargs)
+            body, mimetype = self.encode(obj, mimetype)
+            resp = self._app.response_class(body, mimetype=mimetype)
+        if msgpack is not None:
+            resp.vary.add("Accept")
+        return resp
+
+
+def row_dict(row):
+    """Serializer for rows of a column-projected query (see list_query())."""
+    return row._asdict()
+
+
+def parse_fields(raw, available, always=("id",)):
+    """
+    Sparse fieldset from a `fields` argument: a comma-separated string or a
+    list of names. Returns the names in `available` order, plus `always`,
+    or None when `raw` is empty (every field). Raises ValueError.
+    """
+    if not raw:
+        return None
+    names = raw.split(",") if isinstance(raw, str) else raw
+    if not isinstance(names, list):
+        raise ValueError("fields must be a list or comma-separated names")
+    wanted = {str(name).strip() for name in names} - {""}
+    unknown = wanted - set(available)
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(sorted(unknown))}")
+    wanted.update(always)
+    return tuple(name for name in available if name in wanted)
+
+
+def project(item, fields):
+    """`item` with only the keys in `fields` (None keeps everything)."""
+    if fields is None:
+        return item
+    return {name: item[name] for name in fields if name in item}
+
+
+def select_fields(query, fields):
+    """
+    A list_query() narrowed to the labelled columns in `fields`, so the
+    columns left out are neither fetched nor serialized.
+    """
+    if fields is None:
+        return query
+    return query.with_entities(
+        *(
+            column["expr"]
+            for column in query.column_descriptions
+            if column["name"] in fields
+        )
+    )
+
+
+def query_fields(query):
+    """Names of the labelled columns of a list_query(), in order."""
+    return tuple(column["name"] for column in query.column_descriptions)
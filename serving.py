@@ -0,0 +1,28 @@
+"""
+Rural Healthcare System - Serving mode helpers
+Keeps CPU-bound work off the event loop when running under gevent workers
+"""
+
+import sys
+
+
+def cooperative():
+    """True inside a gevent-patched worker (SERVE_MODE=gevent)."""
+    if "gevent" not in sys.modules:
+        return False
+    from gevent import monkey
+
+    return monkey.is_module_patched("socket")
+
+
+def offload(fn, *args):
+    """
+    fn(*args), run on gevent's native thread pool when cooperative so other
+    requests keep being served meanwhile; a plain call otherwise. Meant for
+    work that releases the GIL (numpy, hashlib), not for short Python loops.
+    """
+    if not cooperative():
+        return fn(*args)
+    from gevent import get_hub
+
+    return get_hub().threadpool.apply(fn, args)
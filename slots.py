@@ -0,0 +1,98 @@
+"""
+Rural Healthcare System - Slot availability
+Per-doctor, per-day bitmaps of booked appointment slots
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import threading
+import time
+
+
+class SlotGrid:
+    """The bookable times of a day, e.g. 09:00-17:00 every 30 minutes."""
+
+    def __init__(self, start="09:00", end="17:00", minutes=30):
+        first = datetime.strptime(start, "%H:%M")
+        last = datetime.strptime(end, "%H:%M")
+        self.minutes = minutes
+        self.times = []
+        t = first
+        while t < last:
+            self.times.append(t.strftime("%H:%M"))
+            t += timedelta(minutes=minutes)
+        self._bit = {t: 1 << i for i, t in enumerate(self.times)}
+        self.full = (1 << len(self.times)) - 1
+
+    def bit(self, time_str):
+        """Bit for `time_str`, or 0 for times off the grid."""
+        return self._bit.get(time_str, 0)
+
+    def free_times(self, booked):
+        return [t for i, t in enumerate(self.times) if not booked >> i & 1]
+
+
+class SlotAvailability:
+    """
+    Booked-slot bitmaps keyed by (doctor_id, date). Bitmaps are loaded in
+    bulk for whatever a query asks for, patched in place on book/cancel,
+    and expire after `ttl` seconds so bookings made by other workers show
+    up. At most `max_entries` bitmaps are kept (least recently used go).
+    """
+
+    def __init__(self, grid, ttl=60, max_entries=200_000):
+        self.grid = grid
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._bitmaps = OrderedDict()
+        self._lock = threading.Lock()
+
+    def booked(self, doctor_ids, dates, load):
+        """
+        {(doctor_id, date): bitmap} for every combination. `load(doctor_ids,
+        first, last)` must return (doctor_id, date, time) rows of the
+        non-cancelled appointments in that range; it is called at most once.
+        """
+        now = time.monotonic()
+        result, missing = {}, set()
+        with self._lock:
+            for doctor_id in doctor_ids:
+                for day in dates:
+                    entry = self._bitmaps.get((doctor_id, day))
+                    if entry is None or entry[1] < now:
+                        missing.add(doctor_id)
+                        break
+                    result[(doctor_id, day)] = entry[0]
+
+        if missing and dates:
+            fresh = {(d, day): 0 for d in missing for day in dates}
+            for doctor_id, day, time_str in load(sorted(missing), dates[0], dates[-1]):
+                if (doctor_id, day) in fresh:
+                    fresh[(doctor_id, day)] |= self.grid.bit(time_str)
+            self._store(fresh)
+            result.update(fresh)
+        return result
+
+    def mark_booked(self, doctor_id, day, time_str):
+        self._patch(doctor_id, day, time_str, booked=True)
+
+    def mark_free(self, doctor_id, day, time_str):
+        self._patch(doctor_id, day, time_str, booked=False)
+
+    def _patch(self, doctor_id, day, time_str, booked):
+        bit = self.grid.bit(time_str)
+        with self._lock:
+            entry = self._bitmaps.get((doctor_id, day))
+            if entry is None or not bit:
+                return
+            bitmap = entry[0] | bit if booked else entry[0] & ~bit
+            self._bitmaps[(doctor_id, day)] = (bitmap, entry[1])
+
+    def _store(self, bitmaps):
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            for key, bitmap in bitmaps.items():
+                self._bitmaps[key] = (bitmap, expires)
+                self._bitmaps.move_to_end(key)
+            while len(self._bitmaps) > self.max_entries:
+                self._bitmaps.popitem(last=False)
@@ -0,0 +1,67 @@
+"""
+Shared fixtures: a fresh SQLite-backed app per test (pytest-flask's
+`client` fixture uses it), seeded with approved hospitals and doctors
+"""
+
+from datetime import date, timedelta
+
+from flask_jwt_extended import create_access_token
+import pytest
+
+from benchmarks.common import make_app, seed_hospitals, seed_patient
+
+
+@pytest.fixture
+def app():
+    app = make_app()
+    with app.app_context():
+        seed_hospitals(3, doctors_per_hospital=2, approved_ratio=1)
+    return app
+
+
+@pytest.fixture
+def db(app):
+    from app import db
+
+    return db
+
+
+@pytest.fixture
+def patients(app):
+    """Two patients as (id, auth headers)."""
+    with app.app_context():
+        return [seed_patient(phone) for phone in ("9000000001", "9000000002")]
+
+
+@pytest.fixture
+def doctor(app):
+    """(doctor id, hospital id, auth headers of that hospital)."""
+    from models import Doctor
+
+    with app.app_context():
+        doc = Doctor.query.order_by(Doctor.id).first()
+        token = create_access_token(
+            identity={"id": doc.hospital_id, "role": "hospital"}
+        )
+        return doc.id, doc.hospital_id, {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def booking(doctor):
+    """book(client, headers, days_ahead=3, time="10:00") -> booking response."""
+    doctor_id, hospital_id, _ = doctor
+
+    def book(client, headers, days_ahead=3, time="10:00"):
+        return client.post(
+            "/api/appointments/book",
+            headers=headers,
+            json={
+                "doctor_id": doctor_id,
+                "hospital_id": hospital_id,
+                "appointment_date": (date.today() + timedelta(days_ahead)).isoformat(),
+                "appointment_time": time,
+                "reason": "Fever",
+            },
+        )
+
+    return book
@@ -0,0 +1,30 @@
+from datetime import date
+
+from sqlalchemy import literal, select
+
+import analytics
+
+
+def test_portable_upsert_accumulates(app, db):
+    from models import AppointmentDailyStat
+
+    table = AppointmentDailyStat.__table__
+    keys = ["hospital_id", "doctor_id", "day"]
+
+    def bump(booked, cancelled):
+        source = select(
+            literal(1),
+            literal(1),
+            literal(date(2030, 1, 1)),
+            literal(booked),
+            literal(cancelled),
+        )
+        analytics._upsert_portable(db.session, table, source, keys)
+
+    with app.app_context():
+        bump(1, 0)
+        bump(1, 0)
+        bump(-1, 1)
+        db.session.commit()
+        rows = db.session.execute(select(table.c.booked, table.c.cancelled)).all()
+    assert rows == [(1, 1)]
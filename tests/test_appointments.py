@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+
+from benchmarks.common import make_app
+
+
+def test_double_booking_is_refused(client, patients, booking):
+    (_, first), (_, second) = patients
+    assert booking(client, first).status_code == 201
+    assert booking(client, second).status_code == 409
+
+
+def test_patient_rebooks_own_cancelled_slot(app, client, patients, booking):
+    from models import Appointment
+
+    patient_id, headers = patients[0]
+    apt_id = booking(client, headers).get_json()["appointment"]["id"]
+    client.put(f"/api/appointments/{apt_id}/cancel", headers=headers)
+
+    resp = booking(client, headers)
+    assert resp.status_code == 201
+    assert resp.get_json()["appointment"]["id"] != apt_id
+    with app.app_context():
+        statuses = Appointment.query.filter_by(patient_id=patient_id)
+        assert sorted(a.status for a in statuses) == ["cancelled", "confirmed"]
+
+
+def test_rebooking_anothers_cancelled_slot_keeps_their_history(
+    app, client, patients, booking, doctor
+):
+    from models import Appointment, SyncTombstone
+
+    (first_id, first), (second_id, second) = patients
+    _, _, hospital = doctor
+    apt_id = booking(client, first).get_json()["appointment"]["id"]
+    client.put(f"/api/appointments/{apt_id}/cancel", headers=first)
+
+    resp = booking(client, second)
+    assert resp.status_code == 201
+    assert resp.get_json()["appointment"]["patient_id"] == second_id
+    assert booking(client, first).status_code == 409
+    with app.app_context():
+        old = Appointment.query.filter_by(patient_id=first_id).one()
+        assert (old.id, old.status) == (apt_id, "cancelled")
+        assert not SyncTombstone.query.count()
+    mine = client.get("/api/appointments/my", headers=first).get_json()
+    assert [(a["id"], a["status"]) for a in mine] == [(apt_id, "cancelled")]
+
+    stats = client.get(
+        "/api/analytics/hospital",
+        headers=hospital,
+        query_string={"to": (date.today() + timedelta(3)).isoformat()},
+    ).get_json()
+    assert (stats["booked"], stats["cancelled"]) == (1, 1)
+
+
+def test_rows_inserted_cancelled_leave_the_slot_free(
+    app, db, client, patients, booking, doctor
+):
+    from models import Appointment
+
+    (first_id, _), (_, second) = patients
+    doctor_id, hospital_id, _ = doctor
+    with app.app_context():
+        db.session.execute(
+            db.insert(Appointment),
+            [
+                {
+                    "patient_id": first_id,
+                    "doctor_id": doctor_id,
+                    "hospital_id": hospital_id,
+                    "appointment_date": date.today() + timedelta(3),
+                    "appointment_time": "10:00",
+                    "reason": "Fever",
+                    "status": "cancelled",
+                }
+            ],
+        )
+        db.session.commit()
+
+    assert booking(client, second).status_code == 201
+
+
+def test_one_tombstone_per_delete_with_several_apps(app, patients, booking):
+    from app import db
+    from models import Appointment, SyncTombstone
+
+    make_app()  # another app in the process must not add its listeners
+    _, headers = patients[0]
+    booking(app.test_client(), headers)
+    with app.app_context():
+        db.session.delete(Appointment.query.one())
+        db.session.commit()
+        assert SyncTombstone.query.count() == 1
+
+
+def test_prescription_batch_completes_only_due_appointments(
+    app, client, patients, doctor
+):
+    from app import db
+    from models import Appointment
+
+    patient_id, _ = patients[0]
+    doctor_id, hospital_id, hospital = doctor
+    with app.app_context():
+        rows = [
+            Appointment(
+                patient_id=patient_id,
+                doctor_id=doctor_id,
+                hospital_id=hospital_id,
+                appointment_date=date.today() + timedelta(days),
+                appointment_time="10:00",
+                reason="Fever",
+            )
+            for days in (0, 2)
+        ]
+        db.session.add_all(rows)
+        db.session.commit()
+        today_id, future_id = (row.id for row in rows)
+
+    resp = client.post(
+        "/api/prescriptions/batch",
+        headers=hospital,
+        json={"complete_appointments": [today_id, future_id]},
+    )
+    body = resp.get_json()
+    assert body["completed"] == [today_id]
+    assert [e["id"] for e in body["appointment_errors"]] == [future_id]
+    with app.app_context():
+        assert db.session.get(Appointment, future_id).status == "confirmed"
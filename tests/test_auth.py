@@ -0,0 +1,146 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from benchmarks.common import make_app
+
+CHEAP = "pbkdf2:sha256:1000"
+OLD = "pbkdf2:sha256:500"
+
+
+@pytest.fixture
+def auth_app(monkeypatch):
+    """An app hashing inline with a cheap method and a one-hash queue."""
+    monkeypatch.setenv("PASSWORD_HASH_METHOD", CHEAP)
+    monkeypatch.setenv("PASSWORD_HASH_WORKERS", "0")
+    monkeypatch.setenv("PASSWORD_HASH_QUEUE", "1")
+    return make_app()
+
+
+def add_account(app, model, password_method=OLD, **fields):
+    from app import db
+
+    with app.app_context():
+        account = model(password_hash=generate_password_hash("pw", password_method))
+        for name, value in fields.items():
+            setattr(account, name, value)
+        db.session.add(account)
+        db.session.commit()
+        return account.id
+
+
+def password_hash(app, model, account_id):
+    from app import db
+
+    with app.app_context():
+        return db.session.get(model, account_id).password_hash
+
+
+def login(client, phone, role="patient"):
+    return client.post(
+        "/api/auth/login", json={"phone": phone, "password": "pw", "role": role}
+    )
+
+
+def test_login_rehashes_with_current_method(auth_app):
+    from models import User
+
+    user_id = add_account(auth_app, User, name="A", phone="9000000001")
+
+    assert login(auth_app.test_client(), "9000000001").status_code == 200
+    assert password_hash(auth_app, User, user_id).startswith(CHEAP + "$")
+
+
+def test_unapproved_hospital_login_does_not_rehash(auth_app):
+    from models import Hospital
+
+    hospital_id = add_account(
+        auth_app,
+        Hospital,
+        name="PHC",
+        district="D",
+        taluk="T",
+        village="V",
+        latitude=10.0,
+        longitude=78.0,
+        phone="9100000000",
+        email="phc@tn.gov.in",
+        registration_status="pending",
+    )
+
+    resp = login(auth_app.test_client(), "phc@tn.gov.in", role="hospital")
+    assert resp.status_code == 403
+    assert password_hash(auth_app, Hospital, hospital_id).startswith(OLD + "$")
+
+
+def test_full_hashing_queue_answers_503(auth_app, monkeypatch):
+    import hashing
+    from models import User
+
+    add_account(auth_app, User, password_method=CHEAP, name="A", phone="9000000001")
+    started, release = threading.Event(), threading.Event()
+    check = hashing.check_password_hash
+
+    def slow_check(pwhash, password):
+        started.set()
+        release.wait(5)
+        return check(pwhash, password)
+
+    monkeypatch.setattr(hashing, "check_password_hash", slow_check)
+    with ThreadPoolExecutor(1) as pool:
+        first = pool.submit(login, auth_app.test_client(), "9000000001")
+        assert started.wait(5)
+        busy = login(auth_app.test_client(), "9000000001")
+        release.set()
+        assert first.result().status_code == 200
+
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "2"
+
+
+def set_is_active(app, user_id, value):
+    from app import db
+    from models import User
+
+    with app.app_context():
+        db.session.get(User, user_id).is_active = value
+        db.session.commit()
+
+
+def test_deactivated_patient_token_is_revoked(app, patients):
+    user_id, headers = patients[0]
+    client = app.test_client()
+    assert client.get("/api/appointments/my", headers=headers).status_code == 200
+
+    set_is_active(app, user_id, False)
+    assert client.get("/api/appointments/my", headers=headers).status_code == 401
+
+
+def test_null_is_active_is_allowed_by_token_and_login(auth_app):
+    from flask_jwt_extended import create_access_token
+
+    from models import User
+
+    user_id = add_account(auth_app, User, name="A", phone="9000000001")
+    set_is_active(auth_app, user_id, None)
+    client = auth_app.test_client()
+
+    assert login(client, "9000000001").status_code == 200
+    with auth_app.app_context():
+        token = create_access_token(identity={"id": user_id, "role": "patient"})
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/appointments/my", headers=headers).status_code == 200
+
+
+def test_deleted_patient_token_is_revoked(app, patients):
+    from app import db
+    from models import User
+
+    user_id, headers = patients[0]
+    with app.app_context():
+        db.session.delete(db.session.get(User, user_id))
+        db.session.commit()
+    resp = app.test_client().get("/api/appointments/my", headers=headers)
+    assert resp.status_code == 401
@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def articles(client):
+    return len(client.get("/api/awareness/all").get_json())
+
+
+def articles_elsewhere(app):
+    """articles() from another thread, like a request on another worker."""
+    with ThreadPoolExecutor(1) as pool:
+        return pool.submit(articles, app.test_client()).result()
+
+
+def add_article(db):
+    from models import AwarenessContent
+
+    db.session.add(
+        AwarenessContent(title="Boil water", content="...", category="hygiene")
+    )
+
+
+def catalog_misses(client):
+    return client.get("/api/cache/stats").get_json()["catalog"]["misses"]
+
+
+def test_rebuild_between_flush_and_commit_is_not_kept(app, db, client):
+    assert articles(client) == 0
+    with app.app_context():
+        add_article(db)
+        db.session.flush()
+        # rebuilds the entry without the uncommitted row
+        assert articles_elsewhere(app) == 0
+        db.session.commit()
+    assert articles(client) == 1
+
+
+def test_rollback_keeps_catalog_cache(app, db, client):
+    articles(client)
+    misses = catalog_misses(client)
+    with app.app_context():
+        add_article(db)
+        db.session.flush()
+        db.session.rollback()
+    assert articles(client) == 0
+    assert catalog_misses(client) == misses
+
+
+def test_least_recently_used_entry_is_evicted():
+    from cache import ResponseCache
+
+    cache = ResponseCache(ttl=60, max_entries=2)
+    for key in ("a", "b"):
+        cache.get_or_build(key, lambda: key.encode())
+    cache.get_or_build("a", lambda: b"rebuilt")  # a is now the most recent
+    cache.get_or_build("c", lambda: b"c")
+
+    assert cache.get_or_build("a", lambda: b"rebuilt").body == b"a"
+    assert cache.get_or_build("b", lambda: b"rebuilt").body == b"rebuilt"
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 2
+
+
+def test_expired_entries_are_dropped_on_write(monkeypatch):
+    import cache as cache_module
+    from cache import ResponseCache
+
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(ttl=60)
+    for day in ("2024-01-01", "2024-01-02"):
+        cache.get_or_build(f"alerts:1:{day}", lambda: b"{}")
+    now[0] += 61
+    cache.get_or_build("alerts:1:2024-01-03", lambda: b"{}")
+
+    assert cache.stats()["entries"] == 1
+
+
+def test_unknown_language_is_refused_before_caching(client):
+    resp = client.get("/api/awareness/all", query_string={"language": "xx" * 50})
+    assert resp.status_code == 400
+    assert client.get("/api/cache/stats").get_json()["catalog"]["entries"] == 0
@@ -0,0 +1,88 @@
+from doctor_search import DoctorIndex, normalize_specialization
+
+# two hospitals ~11 km apart around Tiruchirappalli
+HOSPITALS = [(1, "PHC Near", 10.80, 78.70), (2, "PHC Far", 10.90, 78.70)]
+
+
+def doctor(doctor_id, hospital_id, specialization, available=True, fee=100):
+    return {
+        "id": doctor_id,
+        "name": f"Dr. {doctor_id}",
+        "specialization": specialization,
+        "hospital_id": hospital_id,
+        "phone": "8000000000",
+        "availability_status": "available" if available else "off-duty",
+        "consultation_fee": fee,
+    }
+
+
+def index(*doctors):
+    idx = DoctorIndex()
+    idx.load(HOSPITALS, doctors)
+    return idx
+
+
+def ids(found):
+    return [doc["id"] for doc, _ in found]
+
+
+def test_specializations_are_normalized():
+    assert normalize_specialization("Paediatrician") == "pediatrics"
+    assert normalize_specialization("  ENT ") == "ent"
+    assert normalize_specialization("Sports Medicine") == "sports medicine"
+
+
+def test_synonyms_and_prefixes_match():
+    idx = index(
+        doctor(1, 1, "Cardiology"), doctor(2, 1, "Pediatrics"), doctor(3, 1, "General")
+    )
+    assert ids(idx.search(10.8, 78.7, 50, "heart")) == [1]
+    assert ids(idx.search(10.8, 78.7, 50, "cardio")) == [1]
+    assert ids(idx.search(10.8, 78.7, 50, "child")) == [2]
+    assert ids(idx.search(10.8, 78.7, 50, "physician")) == [3]
+    assert idx.search(10.8, 78.7, 50, "astrology") == []
+
+
+def test_ranked_by_distance_then_availability_then_fee():
+    idx = index(
+        doctor(1, 2, "Cardiology"),
+        doctor(2, 1, "Cardiology", available=False),
+        doctor(3, 1, "Cardiology", fee=300),
+        doctor(4, 1, "Cardiology", fee=200),
+    )
+    assert ids(idx.search(10.8, 78.7, 50, "cardiology")) == [4, 3, 2, 1]
+    assert ids(idx.search(10.8, 78.7, 50, available_only=True)) == [4, 3, 1]
+    assert ids(idx.search(10.8, 78.7, 5)) == [4, 3, 2]
+
+
+def test_unapproved_hospital_hides_its_doctors():
+    idx = index(doctor(1, 1, "Cardiology"), doctor(2, 2, "Cardiology"))
+    idx.upsert_hospital(1, "PHC Near", 10.80, 78.70, approved=False)
+    assert ids(idx.search(10.8, 78.7, 50)) == [2]
+
+    idx.upsert_hospital(1, "PHC Near", 10.80, 78.70, approved=True)
+    assert ids(idx.search(10.8, 78.7, 50)) == [1, 2]
+
+
+def test_endpoint_sees_committed_changes(app, db, client, doctor):
+    from models import Doctor, Hospital
+
+    doctor_id, hospital_id, _ = doctor
+    with app.app_context():
+        h = db.session.get(Hospital, hospital_id)
+        point = {"latitude": h.latitude, "longitude": h.longitude, "radius": 1}
+
+    def nearby(**filters):
+        resp = client.post("/api/doctors/nearby", json={**point, **filters})
+        return [d["id"] for d in resp.get_json()]
+
+    assert doctor_id in nearby()
+    with app.app_context():
+        db.session.get(Doctor, doctor_id).specialization = "Dermatology"
+        db.session.commit()
+    assert nearby(specialization="skin") == [doctor_id]
+
+    with app.app_context():
+        db.session.get(Hospital, hospital_id).registration_status = "rejected"
+        db.session.commit()
+    assert doctor_id not in nearby()
@@ -0,0 +1,115 @@
+import json
+
+from flask_jwt_extended import create_access_token
+import pytest
+from werkzeug.security import check_password_hash
+
+from hashing import PasswordHasher
+from importer import BulkImporter, detect_format, read_records
+
+HOSPITALS_CSV = """name,district,taluk,village,latitude,longitude,phone,email,password
+PHC A,Salem,Omalur,Kadayampatti,11.7,78.0,9100000001,a@tn.gov.in,secret-a
+PHC B,Salem,Omalur,Pannapatti,north,78.0,9100000002,b@tn.gov.in,secret-b
+PHC C,Salem,Omalur,Thindamangalam,11.8,78.1,9100000003,a@tn.gov.in,secret-c
+PHC D,Salem,Attur,Thalaivasal,11.6,78.5,9100000004,phc0@tn.gov.in,secret-d
+"""
+SPEC = {"specialization": "Pediatrics", "phone": "8000000001"}
+
+
+def importer(db, chunk_size=2):
+    return BulkImporter(db, PasswordHasher("pbkdf2:sha256:1000"), chunk_size)
+
+
+def csv_records(text):
+    return read_records(text.splitlines(keepends=True), "csv")
+
+
+def test_detect_format():
+    assert detect_format("stock.CSV") == "csv"
+    assert detect_format("doctors.ndjson") == "jsonl"
+    assert detect_format(content_type="application/x-ndjson; charset=utf-8") == "jsonl"
+    assert detect_format("data.xlsx") is None
+
+
+def test_hospital_rows_are_validated_deduplicated_and_hashed(app, db):
+    from models import Hospital
+
+    with app.app_context():
+        report = importer(db).run("hospitals", csv_records(HOSPITALS_CSV))
+        assert (report["rows"], report["inserted"], report["failed"]) == (4, 1, 3)
+        assert [e["row"] for e in report["errors"]] == [2, 3, 4]
+        assert "latitude" in report["errors"][0]["error"]
+
+        hospital = Hospital.query.filter_by(email="a@tn.gov.in").one()
+        assert hospital.registration_status == "pending"
+        assert check_password_hash(hospital.password_hash, "secret-a")
+
+
+def test_doctor_rows_resolve_hospitals_by_id_or_email(app, db):
+    from models import Doctor, Hospital
+
+    with app.app_context():
+        hospital_id = Hospital.query.filter_by(email="phc1@tn.gov.in").one().id
+        lines = [
+            json.dumps({"hospital_id": hospital_id, "name": "Dr. A", **SPEC}),
+            json.dumps({"hospital_email": "phc2@tn.gov.in", "name": "Dr. B", **SPEC}),
+            json.dumps(
+                {"hospital_email": "nowhere@tn.gov.in", "name": "Dr. C", **SPEC}
+            ),
+            "{not json",
+        ]
+        report = importer(db).run("doctors", read_records(lines, "jsonl"))
+        assert report["inserted"] == 2
+        assert [e["row"] for e in report["errors"]] == [3, 4]
+        assert "unknown hospital" in report["errors"][0]["error"]
+        assert Doctor.query.filter(Doctor.name.in_(["Dr. A", "Dr. B"])).count() == 2
+
+
+def test_rejected_chunk_is_retried_row_by_row(app, db, monkeypatch):
+    from models import Hospital
+
+    # let a duplicate email reach the database, as a concurrent insert would
+    monkeypatch.setattr(BulkImporter, "_new_hospitals", lambda self, chunk, fail: chunk)
+    with app.app_context():
+        report = importer(db, chunk_size=10).run(
+            "hospitals", csv_records(HOSPITALS_CSV.replace("north", "11.9"))
+        )
+        assert report["inserted"] == 2  # A and B; C and D collide
+        assert [e["row"] for e in report["errors"]] == [3, 4]
+        assert Hospital.query.filter_by(email="b@tn.gov.in").count() == 1
+
+
+@pytest.fixture
+def admin(app):
+    with app.app_context():
+        token = create_access_token(identity={"id": 0, "role": "admin"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_admin_import_endpoint(client, admin, monkeypatch):
+    monkeypatch.setattr(PasswordHasher, "hash_many", lambda self, ps: ["x"] * len(ps))
+    resp = client.post(
+        "/api/admin/import/hospitals",
+        headers={**admin, "Content-Type": "text/csv"},
+        data=HOSPITALS_CSV,
+    )
+    assert resp.status_code == 200
+    assert (resp.get_json()["inserted"], resp.get_json()["failed"]) == (1, 3)
+
+    resp = client.post("/api/admin/import/hospitals", headers=admin, data="x")
+    assert resp.status_code == 400
+    assert client.post("/api/admin/import/patients", headers=admin).status_code == 404
+
+
+def test_import_cli_writes_rejected_rows(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(PasswordHasher, "hash_many", lambda self, ps: ["x"] * len(ps))
+    source, errors = tmp_path / "hospitals.csv", tmp_path / "errors.jsonl"
+    source.write_text(HOSPITALS_CSV)
+
+    result = app.test_cli_runner().invoke(
+        args=["import-data", "hospitals", str(source), "--errors", str(errors)]
+    )
+    assert result.exit_code == 0, result.output
+    assert "1 of 4 rows inserted, 3 failed" in result.output
+    rows = [json.loads(line)["row"] for line in errors.read_text().splitlines()]
+    assert rows == [2, 3, 4]
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+
+import pytest
+
+from inventory import normalize_name, parse_stock_item, prefix_pattern
+
+TODAY = date.today()
+
+
+def lot(name, quantity, days, **extra):
+    return {
+        "name": name,
+        "quantity": quantity,
+        "expiry_date": (TODAY + timedelta(days)).isoformat(),
+        **extra,
+    }
+
+
+def test_names_are_normalized_for_prefix_search():
+    assert normalize_name("Paracetamol-500 MG") == "paracetamol 500 mg"
+    assert normalize_name("  %_ ") is None
+    assert prefix_pattern("Para%") == "para%"
+    assert prefix_pattern("p") is None
+
+
+@pytest.mark.parametrize(
+    "raw, error",
+    [
+        ({"quantity": 1, "expiry_date": "2030-01-01"}, "name required"),
+        (lot("ORS", -1, 30), "quantity must not be negative"),
+        ({"name": "ORS", "quantity": 1, "expiry_date": "soon"}, "expiry_date"),
+    ],
+)
+def test_invalid_stock_items(raw, error):
+    with pytest.raises(ValueError, match=error):
+        parse_stock_item(raw)
+
+
+@pytest.fixture
+def stock(client, doctor):
+    """update(items) posting a stock update as the doctor's hospital."""
+    _, _, headers = doctor
+
+    def update(items):
+        return client.post(
+            "/api/medicines/stock", headers=headers, json={"items": items}
+        )
+
+    return update
+
+
+def test_stock_update_upserts_lots_and_reports_bad_rows(client, doctor, stock):
+    _, hospital_id, _ = doctor
+    body = stock([lot("Paracetamol 500", 100, 200), {"name": "ORS"}]).get_json()
+    assert (body["inserted"], body["updated"]) == (1, 0)
+    assert [e["index"] for e in body["errors"]] == [1]
+
+    body = stock([lot("paracetamol-500", 40, 200), lot("Paracetamol 500", 5, 20)])
+    assert (body.get_json()["inserted"], body.get_json()["updated"]) == (1, 1)
+    meds = client.get(f"/api/hospitals/{hospital_id}/medicines?q=para").get_json()
+    assert sorted(m["quantity"] for m in meds) == [5, 40]
+
+
+def test_nearby_search_skips_expired_and_empty_lots(app, db, client, doctor, stock):
+    from models import Hospital
+
+    _, hospital_id, _ = doctor
+    stock(
+        [
+            lot("Amoxicillin 250", 10, 100, generic_name="Amoxycillin"),
+            lot("Amoxicillin 500", 10, -1),
+            lot("Amoxicillin 125", 0, 100),
+        ]
+    )
+    with app.app_context():
+        h = db.session.get(Hospital, hospital_id)
+        point = {"latitude": h.latitude, "longitude": h.longitude, "radius": 5}
+
+    found = client.post("/api/medicines/nearby", json={**point, "name": "amoxy"})
+    [hospital] = found.get_json()
+    assert hospital["hospital_id"] == hospital_id
+    assert [m["name"] for m in hospital["medicines"]] == ["Amoxicillin 250"]
+
+
+def test_alerts_follow_stock_updates(client, doctor, stock):
+    _, _, headers = doctor
+    stock([lot("ORS", 5, 200), lot("Zinc", 50, 10), lot("Iron", 50, -3)])
+
+    alerts = client.get("/api/medicines/alerts", headers=headers).get_json()
+    assert [m["name"] for m in alerts["low_stock"]] == ["ORS"]
+    assert [m["name"] for m in alerts["near_expiry"]] == ["Zinc"]
+    assert [m["name"] for m in alerts["expired"]] == ["Iron"]
+
+    stock([lot("ORS", 500, 200)])
+    alerts = client.get("/api/medicines/alerts", headers=headers).get_json()
+    assert not alerts["low_stock"]
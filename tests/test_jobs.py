@@ -0,0 +1,97 @@
+from datetime import date, datetime, timedelta
+import json
+
+import pytest
+
+from jobs import JobQueue
+
+
+@pytest.fixture
+def appointments(app, db, patients, doctor):
+    """{label: id} of appointments around today, in various states."""
+    from models import Appointment
+
+    patient_id, _ = patients[0]
+    doctor_id, hospital_id, _ = doctor
+    rows = {
+        "tomorrow": (1, "confirmed"),
+        "tomorrow_cancelled": (1, "cancelled"),
+        "next_week": (7, "confirmed"),
+        "yesterday": (-1, "confirmed"),
+        "yesterday_completed": (-1, "completed"),
+    }
+    with app.app_context():
+        appts = {
+            label: Appointment(
+                patient_id=patient_id,
+                doctor_id=doctor_id,
+                hospital_id=hospital_id,
+                appointment_date=date.today() + timedelta(days),
+                appointment_time=f"{9 + i:02d}:00",
+                reason="Fever",
+                status=status,
+            )
+            for i, (label, (days, status)) in enumerate(rows.items())
+        }
+        db.session.add_all(appts.values())
+        db.session.commit()
+        return {label: a.id for label, a in appts.items()}
+
+
+def run_once(app):
+    result = app.test_cli_runner().invoke(args=["run-jobs", "--once", "--workers", "2"])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def statuses(app, db, appointments):
+    from models import Appointment
+
+    with app.app_context():
+        return {
+            label: db.session.get(Appointment, apt_id).status
+            for label, apt_id in appointments.items()
+        }
+
+
+def test_run_once_reminds_and_marks_no_shows(app, db, appointments, tmp_path):
+    sink = tmp_path / "sms.jsonl"
+    app.config["NOTIFY_SINK"] = f"file:{sink}"
+
+    output = run_once(app)
+    # one reminder batch, a no-show sweep per past day
+    assert output.startswith(f"ran {1 + app.config['NO_SHOW_LOOKBACK_DAYS']} jobs")
+    assert "0 failed" in output
+    sent = [json.loads(line) for line in sink.read_text().splitlines()]
+    assert [m["appointment_id"] for m in sent] == [appointments["tomorrow"]]
+    assert sent[0]["to"] == "9000000001"
+    assert statuses(app, db, appointments) == {
+        "tomorrow": "confirmed",
+        "tomorrow_cancelled": "cancelled",
+        "next_week": "confirmed",
+        "yesterday": "no_show",
+        "yesterday_completed": "completed",
+    }
+
+    assert run_once(app).startswith("ran 0 jobs")
+    assert len(sink.read_text().splitlines()) == 1
+
+
+def test_failed_jobs_back_off_then_give_up(app, db):
+    from models import Job
+
+    with app.app_context():
+        queue = JobQueue(db, max_attempts=2)
+        queue.enqueue("remind", {"ids": []})
+        db.session.commit()
+
+        [job] = queue.claim(10)
+        queue.fail(job, RuntimeError("gateway down"))
+        assert (job.status, job.attempts) == ("queued", 1)
+        assert job.run_at > datetime.utcnow()
+        assert queue.claim(10) == []
+
+        db.session.execute(db.update(Job).values(run_at=datetime.utcnow()))
+        [job] = queue.claim(10)
+        queue.fail(job, RuntimeError("gateway down"))
+        assert (job.status, job.last_error) == ("failed", "gateway down")
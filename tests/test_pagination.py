@@ -0,0 +1,36 @@
+import pytest
+
+from pagination import NUMBER, decode_cursor, encode_cursor
+
+NEARBY = {"latitude": 10.79, "longitude": 78.70, "radius": 1000, "limit": 2}
+
+
+@pytest.mark.parametrize("key", [["7"], [], [True], [1, 2], {"id": 1}])
+def test_decode_cursor_rejects_wrong_key_types(key):
+    cursor = encode_cursor(key) if isinstance(key, list) else "eyJpZCI6MX0"
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_decode_cursor_round_trip():
+    assert decode_cursor(encode_cursor((3.5, 7)), (NUMBER, int)) == (3.5, 7)
+
+
+@pytest.mark.parametrize("path", ["/api/hospitals/nearby", "/api/doctors/nearby"])
+def test_nearby_pages_cover_every_result(client, path):
+    everything = client.post(path, json={**NEARBY, "limit": None}).get_json()
+    seen, cursor = [], None
+    while True:
+        body = client.post(path, json={**NEARBY, "cursor": cursor}).get_json()
+        seen += [item["id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [item["id"] for item in everything]
+
+
+@pytest.mark.parametrize("path", ["/api/hospitals/nearby", "/api/doctors/nearby"])
+def test_nearby_rejects_mismatched_cursor(client, path):
+    resp = client.post(path, json={**NEARBY, "cursor": encode_cursor(["x", 1])})
+    assert resp.status_code == 400
+    assert "Invalid cursor" in resp.get_json()["error"]
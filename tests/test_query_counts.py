@@ -0,0 +1,30 @@
+"""
+N+1 guard: each read endpoint issues as many SQL statements for a handful
+of rows as for hundreds (see benchmarks/query_counts.py)
+"""
+
+import pytest
+
+from benchmarks.query_counts import measure
+
+
+@pytest.fixture(scope="module")
+def counts():
+    return measure(hospitals=5, history=5), measure(hospitals=200, history=200)
+
+
+def test_statement_counts_do_not_grow_with_result_size(counts):
+    small, large = counts
+    grown = {
+        name: f"{small[name][0]} -> {large[name][0]} statements"
+        for name in small
+        if small[name][0] != large[name][0]
+    }
+    assert not grown
+
+
+def test_large_seed_returns_more_rows(counts):
+    # otherwise the comparison above proves nothing
+    small, large = counts
+    for name in ("hospitals_nearby", "doctors_nearby", "my_appointments"):
+        assert large[name][1] > small[name][1], name
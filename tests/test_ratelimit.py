@@ -0,0 +1,57 @@
+import logging
+
+import pytest
+
+from benchmarks.common import make_app
+
+NEARBY = {"latitude": 10.79, "longitude": 78.70, "radius": 100}
+
+
+@pytest.fixture
+def limited_app(monkeypatch):
+    """An app allowing a burst of two searches, refilling very slowly."""
+    monkeypatch.setenv("RATE_LIMIT_ENABLED", "1")
+    monkeypatch.setenv("RATE_LIMIT_BURST", "2")
+    monkeypatch.setenv("RATE_LIMIT_PER_SECOND", "0.01")
+    return make_app()
+
+
+def nearby(client, address="10.0.0.1", **headers):
+    return client.post(
+        "/api/hospitals/nearby",
+        json=NEARBY,
+        headers=headers,
+        environ_base={"REMOTE_ADDR": address},
+    )
+
+
+def test_empty_bucket_answers_429(limited_app):
+    client = limited_app.test_client()
+    assert [nearby(client).status_code for _ in range(2)] == [200, 200]
+
+    resp = nearby(client)
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) > 0
+    assert nearby(client, address="10.0.0.2").status_code == 200
+
+
+def test_failing_store_lets_requests_through(limited_app, monkeypatch):
+    from ratelimit import MemoryBucketStore
+
+    def broken(*args, **kwargs):
+        raise OSError("store unavailable")
+
+    monkeypatch.setattr(MemoryBucketStore, "take", broken)
+    client = limited_app.test_client()
+    assert {nearby(client).status_code for _ in range(3)} == {200}
+    stats = client.get("/api/cache/stats").get_json()["throttle"]
+    assert stats["store_errors"] == 3
+
+
+def test_forwarded_requests_without_proxy_hops_warn_once(limited_app, caplog):
+    client = limited_app.test_client()
+    with caplog.at_level(logging.WARNING):
+        for _ in range(2):
+            nearby(client, **{"X-Forwarded-For": "203.0.113.9"})
+    warnings = [r for r in caplog.records if "RATE_LIMIT_PROXY_HOPS" in r.message]
+    assert len(warnings) == 1
@@ -0,0 +1,24 @@
+def add_article(db):
+    from models import AwarenessContent
+
+    db.session.add(AwarenessContent(title="t", content="c", category="x"))
+    db.session.flush()
+
+
+def test_rollback_clears_the_write_flag(app, db):
+    with app.app_context():
+        add_article(db)
+        assert db.session.info.get("wrote")
+        db.session.rollback()
+        assert "wrote" not in db.session.info
+
+
+def test_savepoint_rollback_keeps_the_outer_write(app, db):
+    with app.app_context():
+        add_article(db)
+        savepoint = db.session.begin_nested()
+        add_article(db)
+        savepoint.rollback()
+        assert db.session.info.get("wrote")
+        db.session.commit()
+        assert "wrote" not in db.session.info
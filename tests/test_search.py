@@ -0,0 +1,72 @@
+import pytest
+
+
+@pytest.fixture
+def catalog(app, db):
+    from models import AwarenessContent, HealthScheme
+
+    with app.app_context():
+        db.session.add_all(
+            [
+                AwarenessContent(
+                    title="Vaccination schedule",
+                    content="Children need measles vaccination at nine months.",
+                    category="Vaccination",
+                ),
+                AwarenessContent(
+                    title="Boil drinking water",
+                    content="Boiling water prevents cholera.",
+                    category="Hygiene",
+                    language="TA",
+                ),
+                HealthScheme(
+                    name="Free vaccination drive",
+                    description="Vaccines at every primary health centre.",
+                ),
+            ]
+        )
+        db.session.commit()
+
+
+def search(client, **args):
+    return client.get("/api/search", query_string=args)
+
+
+def test_prefix_matches_rank_title_hits_first(client, catalog):
+    results = search(client, q="vaccin").get_json()["results"]
+    assert [r["type"] for r in results] == ["awareness", "scheme"]
+    assert results[0]["title"] == "Vaccination schedule"
+    assert "vaccination" in results[0]["snippet"].lower()
+
+
+def test_type_and_language_filters(client, catalog):
+    schemes = search(client, q="vaccination", type="scheme").get_json()["results"]
+    assert [r["type"] for r in schemes] == ["scheme"]
+    assert not search(client, q="cholera", language="EN").get_json()["results"]
+    assert len(search(client, q="cholera", language="TA").get_json()["results"]) == 1
+
+
+def test_committed_article_is_searchable(app, db, client, catalog):
+    from models import AwarenessContent
+
+    assert not search(client, q="malaria").get_json()["results"]
+    with app.app_context():
+        db.session.add(
+            AwarenessContent(title="Malaria", content="Use nets.", category="Fever")
+        )
+        db.session.commit()
+    assert len(search(client, q="malaria").get_json()["results"]) == 1
+
+
+@pytest.mark.parametrize(
+    "args, error",
+    [
+        ({"q": "water", "limit": 0}, "limit must be a positive integer"),
+        ({"q": "water", "type": "doctor"}, "type must be awareness and/or scheme"),
+        ({}, "q required"),
+    ],
+)
+def test_invalid_arguments(client, args, error):
+    resp = search(client, **args)
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == error
@@ -0,0 +1,86 @@
+from datetime import date, datetime, timedelta
+
+from slots import SlotAvailability, SlotGrid
+
+DAY = date.today() + timedelta(3)
+
+
+def test_grid_bits_and_free_times():
+    grid = SlotGrid("09:00", "11:00", 30)
+    assert grid.times == ["09:00", "09:30", "10:00", "10:30"]
+    assert grid.full == 0b1111
+    assert grid.bit("18:00") == 0
+    assert grid.free_times(grid.bit("09:30") | grid.bit("10:30")) == ["09:00", "10:00"]
+
+
+def test_bitmaps_load_once_and_patch_in_place():
+    grid = SlotGrid("09:00", "11:00", 30)
+    availability = SlotAvailability(grid, ttl=60)
+    calls = []
+
+    def load(doctor_ids, first, last):
+        calls.append((doctor_ids, first, last))
+        return [(1, DAY, "09:00"), (2, DAY, "10:00")]
+
+    booked = availability.booked([1, 2], [DAY], load)
+    assert booked == {(1, DAY): grid.bit("09:00"), (2, DAY): grid.bit("10:00")}
+
+    availability.mark_booked(1, DAY, "10:30")
+    availability.mark_free(2, DAY, "10:00")
+    booked = availability.booked([1, 2], [DAY], load)
+    assert booked[(1, DAY)] == grid.bit("09:00") | grid.bit("10:30")
+    assert booked[(2, DAY)] == 0
+    assert len(calls) == 1
+
+
+def free_slots(client, doctor_id, headers=None):
+    resp = client.get(
+        "/api/slots/available",
+        headers=headers,
+        query_string={"doctor_id": doctor_id, "date_from": DAY.isoformat()},
+    )
+    return resp.get_json()["doctors"][0]["free_slots"][DAY.isoformat()]
+
+
+def test_booking_and_cancelling_update_free_slots(client, patients, booking, doctor):
+    doctor_id, _, _ = doctor
+    _, headers = patients[0]
+    assert "10:00" in free_slots(client, doctor_id)
+
+    apt_id = booking(client, headers).get_json()["appointment"]["id"]
+    assert "10:00" not in free_slots(client, doctor_id)
+
+    client.put(f"/api/appointments/{apt_id}/cancel", headers=headers)
+    assert "10:00" in free_slots(client, doctor_id)
+
+
+def test_slots_held_by_other_patients_are_not_free(
+    app, db, client, patients, doctor
+):
+    from models import SlotHold
+
+    doctor_id, _, _ = doctor
+    (holder, holder_headers), (_, other_headers) = patients
+    now = datetime.utcnow()
+    with app.app_context():
+        db.session.add_all(
+            [
+                SlotHold(
+                    patient_id=holder,
+                    doctor_id=doctor_id,
+                    appointment_date=DAY,
+                    appointment_time=time_str,
+                    expires_at=expires_at,
+                )
+                for time_str, expires_at in (
+                    ("10:00", now + timedelta(minutes=2)),
+                    ("11:00", now - timedelta(minutes=1)),
+                )
+            ]
+        )
+        db.session.commit()
+
+    assert "10:00" not in free_slots(client, doctor_id)
+    assert "10:00" not in free_slots(client, doctor_id, other_headers)
+    assert "10:00" in free_slots(client, doctor_id, holder_headers)
+    assert "11:00" in free_slots(client, doctor_id)  # expired hold
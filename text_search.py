@@ -0,0 +1,244 @@
+"""
+Rural Healthcare System - Catalog search
+In-memory inverted index over awareness articles and health schemes, with
+English/Tamil tokenization, BM25 ranking and snippets
+"""
+
+from bisect import bisect_left
+import functools
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+
+# \w misses the vowel signs and virama of Indic scripts (Tamil is
+# U+0B80-U+0BFF), which would split every Tamil word into letters
+_WORD = re.compile(r"[\w\u0900-\u0DFF]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or the to was"
+    " were will with you your".split()
+)
+# light English stemming: first matching suffix, keeping a 3+ letter stem
+_SUFFIXES = (
+    ("ations", ""),
+    ("ation", ""),
+    ("ings", ""),
+    ("ing", ""),
+    ("ies", "y"),
+    ("es", ""),
+    ("ed", ""),
+    ("ly", ""),
+    ("s", ""),
+    ("e", ""),
+)
+
+# terms a query word may expand to by prefix, and what such a match counts
+MAX_EXPANSIONS = 50
+PREFIX_WEIGHT = 0.7
+SNIPPET_CHARS = 160
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+@functools.lru_cache(maxsize=65536)
+def _stem(word):
+    if not word.isascii():
+        # Tamil words carry their case endings; prefix matching covers them
+        return word
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)] + replacement
+    return word
+
+
+def tokenize(text):
+    """Index terms of `text`, in order."""
+    text = unicodedata.normalize("NFC", str(text or "")).lower()
+    return [_stem(word) for word in _WORD.findall(text) if word not in _STOPWORDS]
+
+
+def snippet(text, words, width=SNIPPET_CHARS):
+    """
+    About `width` characters of `text` around the first word starting with
+    one of `words` (lowercase), or its beginning when none occurs.
+    """
+    text = " ".join(str(text or "").split())
+    if len(text) <= width:
+        return text
+    lowered = text.lower()
+    hits = [
+        m.start()
+        for m in _WORD.finditer(lowered)
+        if any(m.group().startswith(w) for w in words)
+    ]
+    start = max(0, hits[0] - width // 4) if hits else 0
+    if start:
+        # begin on a word boundary
+        space = text.find(" ", start)
+        start = space + 1 if 0 <= space < start + 20 else start
+    end = min(len(text), start + width)
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        end = space if space > start + width // 2 else end
+    return ("…" if start else "") + text[start:end] + ("…" if end < len(text) else "")
+
+
+class CatalogIndex:
+    """
+    Documents are (kind, id) keys with weighted fields, e.g. an article's
+    title counts three times its body. Postings hold the weighted term
+    frequency per document; search() ranks with BM25 over them, matching
+    each query word exactly or, at a discount, as a prefix of indexed terms
+    ("vaccin" -> vaccination, Tamil words -> their inflected forms).
+
+    Same refresh scheme as DoctorIndex: load() from the database, dirty
+    keys re-read by the caller after local commits, and a full reload once
+    stale() after `ttl` seconds.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._dirty = set()
+        self._reset()
+
+    def _reset(self):
+        # key -> (metadata dict, {field: text}, weighted length, term counts)
+        self._docs = {}
+        # key -> BM25 length normalization, recomputed after documents change
+        self._norms = None
+        self._postings = {}
+        self._sorted_terms = []
+        self._total_length = 0.0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def stale(self):
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            self._loaded_at = None
+
+    def mark_dirty(self, keys):
+        with self._lock:
+            self._dirty.update(keys)
+
+    def take_dirty(self):
+        with self._lock:
+            keys, self._dirty = self._dirty, set()
+        return keys
+
+    def load(self, documents):
+        """Rebuild from (key, metadata, {field: (text, weight)}) tuples."""
+        with self._lock:
+            self._reset()
+            for key, meta, fields in documents:
+                self._add(key, meta, fields)
+            self._sorted_terms = sorted(self._postings)
+            self._loaded_at = time.monotonic()
+
+    def upsert(self, key, meta, fields):
+        with self._lock:
+            self._remove(key)
+            self._add(key, meta, fields, keep_sorted=True)
+
+    def remove(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def search(self, query, limit=20, accept=None):
+        """
+        [(score, key, metadata, texts, matched words)] best first, at most
+        `limit`. accept(key, metadata) narrows the documents considered.
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return []
+        with self._lock:
+            n = len(self._docs)
+            norms = self._length_norms()
+            scores = {}
+            for word in words:
+                for term, weight in self._expand(word):
+                    postings = self._postings[term]
+                    df = len(postings)
+                    boost = weight * math.log(1 + (n - df + 0.5) / (df + 0.5))
+                    boost *= BM25_K1 + 1
+                    for key, tf in postings.items():
+                        gain = boost * tf / (tf + norms[key])
+                        scores[key] = scores.get(key, 0.0) + gain
+            if accept is not None:
+                scores = {
+                    key: score
+                    for key, score in scores.items()
+                    if accept(key, self._docs[key][0])
+                }
+            best = heapq.nlargest(limit, scores.items(), key=lambda kv: kv[1])
+            return [
+                (score, key, self._docs[key][0], self._docs[key][1], words)
+                for key, score in best
+            ]
+
+    def _length_norms(self):
+        if self._norms is None:
+            avg = self._total_length / len(self._docs) if self._docs else 0.0
+            self._norms = {
+                key: BM25_K1 * (1 - BM25_B + BM25_B * doc[2] / avg) if avg else BM25_K1
+                for key, doc in self._docs.items()
+            }
+        return self._norms
+
+    def _expand(self, word):
+        """(indexed term, weight) pairs a query word matches."""
+        matches = []
+        if word in self._postings:
+            matches.append((word, 1.0))
+        start = bisect_left(self._sorted_terms, word)
+        for term in self._sorted_terms[start : start + MAX_EXPANSIONS + 1]:
+            if not term.startswith(word):
+                break
+            if term != word:
+                matches.append((term, PREFIX_WEIGHT))
+        return matches
+
+    def _add(self, key, meta, fields, keep_sorted=False):
+        counts = {}
+        length = 0.0
+        for text, weight in fields.values():
+            for term in tokenize(text):
+                counts[term] = counts.get(term, 0.0) + weight
+                length += weight
+        for term, tf in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if keep_sorted:
+                    self._sorted_terms.insert(
+                        bisect_left(self._sorted_terms, term), term
+                    )
+            postings[key] = tf
+        texts = {name: text for name, (text, _) in fields.items()}
+        self._docs[key] = (meta, texts, length, counts)
+        self._total_length += length
+        self._norms = None
+
+    def _remove(self, key):
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        self._total_length -= doc[2]
+        self._norms = None
+        for term in doc[3]:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+                i = bisect_left(self._sorted_terms, term)
+                del self._sorted_terms[i]